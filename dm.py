@@ -14,12 +14,88 @@ def load_settings() -> Settings:
     parser.add_argument("--deployment-target", required=True)
     parser.add_argument("--relative-modules-path", type=Path, required=True)
     parser.add_argument("--config-file-name", type=str, required=True)
+    # The options added after the first release are optional, so the Makefiles
+    # generated by earlier installations keep working with the default values.
+    defaults = Settings()
+    parser.add_argument(
+        "--discovery-ignored-directories",
+        default="|".join(defaults.discovery_ignored_directory_names),
+    )
+    parser.add_argument(
+        "--discovery-use-ignore-files",
+        type=int,
+        default=int(defaults.discovery_use_ignore_files),
+    )
+    parser.add_argument(
+        "--discovery-stop-at-module-roots",
+        type=int,
+        default=int(defaults.discovery_stop_at_module_roots),
+    )
+    parser.add_argument(
+        "--discovery-worker-count", type=int, default=defaults.discovery_worker_count
+    )
+    parser.add_argument(
+        "--discovery-force-rescan",
+        type=int,
+        default=int(defaults.discovery_force_rescan),
+    )
+    parser.add_argument(
+        "--loading-worker-count",
+        type=int,
+        default=defaults.module_loading_worker_count,
+    )
+    parser.add_argument("--toml-backend", default=defaults.toml_backend)
+    parser.add_argument(
+        "--link-probe-worker-count", type=int, default=defaults.link_probe_worker_count
+    )
+    parser.add_argument(
+        "--link-deploy-worker-count",
+        type=int,
+        default=defaults.link_deploy_worker_count,
+    )
+    parser.add_argument(
+        "--link-engine", choices=["native", "shell"], default=defaults.link_engine
+    )
+    parser.add_argument(
+        "--variable-status-executor",
+        choices=["thread", "worker"],
+        default=defaults.variable_status_executor,
+    )
+    parser.add_argument(
+        "--variable-status-worker-count",
+        type=int,
+        default=defaults.variable_status_worker_count,
+    )
+    parser.add_argument(
+        "--variable-status-cache-ttl",
+        type=int,
+        default=defaults.variable_status_cache_ttl,
+    )
+    parser.add_argument(
+        "--variable-status-prepare-cache-ttl",
+        type=int,
+        default=defaults.variable_status_prepare_cache_ttl,
+    )
+    parser.add_argument(
+        "--hook-parallelism", type=int, default=defaults.hook_parallelism
+    )
+    parser.add_argument(
+        "--hook-output-mode",
+        choices=["prefixed", "grouped"],
+        default=defaults.hook_output_mode,
+    )
+    parser.add_argument(
+        "--hook-scheduling",
+        choices=["priority", "dependencies"],
+        default=defaults.hook_scheduling,
+    )
     parser.add_argument("--text-wrap-limit", type=int, required=True)
     parser.add_argument("--indent", type=int, required=True)
     parser.add_argument("--column-padding", type=int, required=True)
     parser.add_argument("--prompt-template", required=True)
     parser.add_argument("--hotkey-exit", required=True)
     parser.add_argument("--hotkey-help", required=True)
+    parser.add_argument("--hotkey-deploy", default=defaults.hotkey_deploy)
     parser.add_argument("--hotkey-hooks", required=True)
     parser.add_argument("--hotkey-modules", required=True)
     parser.add_argument("--hotkey-variables", required=True)
@@ -32,12 +108,36 @@ def load_settings() -> Settings:
     settings.deployment_target = parsed_args.deployment_target
     settings.raw_relative_modules_path = parsed_args.relative_modules_path
     settings.config_file_name = parsed_args.config_file_name
+    settings.discovery_ignored_directory_names = tuple(
+        name for name in parsed_args.discovery_ignored_directories.split("|") if name
+    )
+    settings.discovery_use_ignore_files = bool(parsed_args.discovery_use_ignore_files)
+    settings.discovery_stop_at_module_roots = bool(
+        parsed_args.discovery_stop_at_module_roots
+    )
+    settings.discovery_worker_count = parsed_args.discovery_worker_count
+    settings.discovery_force_rescan = bool(parsed_args.discovery_force_rescan)
+    settings.module_loading_worker_count = parsed_args.loading_worker_count
+    settings.toml_backend = parsed_args.toml_backend
+    settings.link_probe_worker_count = parsed_args.link_probe_worker_count
+    settings.link_deploy_worker_count = parsed_args.link_deploy_worker_count
+    settings.link_engine = parsed_args.link_engine
+    settings.variable_status_executor = parsed_args.variable_status_executor
+    settings.variable_status_worker_count = parsed_args.variable_status_worker_count
+    settings.variable_status_cache_ttl = parsed_args.variable_status_cache_ttl
+    settings.variable_status_prepare_cache_ttl = (
+        parsed_args.variable_status_prepare_cache_ttl
+    )
+    settings.hook_parallelism = parsed_args.hook_parallelism
+    settings.hook_output_mode = parsed_args.hook_output_mode
+    settings.hook_scheduling = parsed_args.hook_scheduling
     settings.text_wrap_limit = parsed_args.text_wrap_limit
     settings.indent = parsed_args.indent
     settings.column_padding = parsed_args.column_padding
     settings.prompt_template = parsed_args.prompt_template
     settings.hotkey_exit = parsed_args.hotkey_exit
     settings.hotkey_help = parsed_args.hotkey_help
+    settings.hotkey_deploy = parsed_args.hotkey_deploy
     settings.hotkey_hooks = parsed_args.hotkey_hooks
     settings.hotkey_modules = parsed_args.hotkey_modules
     settings.hotkey_variables = parsed_args.hotkey_variables
@@ -57,10 +157,27 @@ def main() -> None:
         renderer.wrap.render(f"<<RED>>{e}<<RESET>>")
         return
 
+    if settings.debug:
+        discovery_result = modules.discovery_result
+        renderer.wrap.render(
+            f"<<DIM>>Module discovery visited {discovery_result.visited_directories} "
+            f"directories ({discovery_result.reused_directories} served from the "
+            f"index) and {discovery_result.visited_entries} entries, pruned "
+            f"{len(discovery_result.pruned_directories)} directories.<<RESET>>"
+        )
+        renderer.wrap.render(
+            f"<<DIM>>Configuration files were decoded with the "
+            f"'{modules.loader_backend}' TOML backend.<<RESET>>"
+        )
+
     interpreter = CommandLineInterpreter(
         settings=settings, renderer=renderer, modules=modules
     )
-    interpreter.run()
+    try:
+        interpreter.run()
+    finally:
+        # The pending variable status refreshes are useless after the exit.
+        modules.variable_statuses.shutdown()
 
 
 if __name__ == "__main__":
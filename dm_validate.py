@@ -0,0 +1,53 @@
+import argparse
+import sys
+from pathlib import Path
+
+from dotmodules.modules.validation import ModulesValidator
+from dotmodules.settings import Settings
+
+
+def load_settings() -> Settings:
+    parser = argparse.ArgumentParser(description="Dotmodules validator")
+
+    parser.add_argument("--deployment-target", required=True)
+    parser.add_argument("--relative-modules-path", type=Path, required=True)
+    parser.add_argument("--config-file-name", type=str, required=True)
+    parser.add_argument("--discovery-ignored-directories", required=True)
+    parser.add_argument("--discovery-use-ignore-files", type=int, required=True)
+    parser.add_argument("--discovery-stop-at-module-roots", type=int, required=True)
+    parser.add_argument("--discovery-worker-count", type=int, required=True)
+    parser.add_argument("--loading-worker-count", type=int, required=True)
+    parser.add_argument("--toml-backend", required=True)
+
+    parsed_args = parser.parse_args()
+
+    settings = Settings()
+    settings.deployment_target = parsed_args.deployment_target
+    settings.raw_relative_modules_path = parsed_args.relative_modules_path
+    settings.config_file_name = parsed_args.config_file_name
+    settings.discovery_ignored_directory_names = tuple(
+        name for name in parsed_args.discovery_ignored_directories.split("|") if name
+    )
+    settings.discovery_use_ignore_files = bool(parsed_args.discovery_use_ignore_files)
+    settings.discovery_stop_at_module_roots = bool(
+        parsed_args.discovery_stop_at_module_roots
+    )
+    settings.discovery_worker_count = parsed_args.discovery_worker_count
+    settings.module_loading_worker_count = parsed_args.loading_worker_count
+    # Every module should be validated in parallel regardless of the module
+    # count.
+    settings.module_loading_parallel_threshold = 0
+    settings.toml_backend = parsed_args.toml_backend
+
+    return settings
+
+
+def main() -> None:
+    settings = load_settings()
+    report = ModulesValidator(settings=settings).validate()
+    report.write_ndjson(stream=sys.stdout)
+    sys.exit(0 if report.valid else 1)
+
+
+if __name__ == "__main__":
+    main()
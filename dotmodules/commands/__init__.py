@@ -1,4 +1,5 @@
 from .commands import Command, Commands
+from .deploy import DeployCommand
 from .exit import ExitCommand
 from .help import HelpCommand
 from .hooks import HooksCommand
@@ -8,6 +9,7 @@ from .variables import VariablesCommand
 __all__ = [
     "Command",
     "Commands",
+    "DeployCommand",
     "ExitCommand",
     "HelpCommand",
     "HooksCommand",
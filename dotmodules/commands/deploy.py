@@ -0,0 +1,137 @@
+import time
+from typing import Callable, List, Optional, Sequence
+
+from dotmodules.commands import Command
+from dotmodules.modules import Modules
+from dotmodules.modules.deployment import LinkApplyResult, LinkApplyStatus, LinkPlan
+from dotmodules.renderer import Renderer
+from dotmodules.settings import Settings
+
+
+class DeployCommand(Command):
+    APPLY_PARAMETER = "apply"
+
+    @property
+    def match_pattern(self) -> str:
+        return self._settings.hotkey_deploy
+
+    @property
+    def summary(self) -> List[str]:
+        return [
+            f"<<BOLD>>[<<YELLOW>>{self._settings.hotkey_deploy}<<RESET>><<BOLD>>]<<RESET>>",
+            "Deploys the links of every enabled module at once.",
+        ]
+
+    def execute(
+        self,
+        settings: Settings,
+        modules: Modules,
+        abort_interpreter: Callable[[], None],
+        renderer: Renderer,
+        commands: List[Command],
+        parameters: Optional[List[str]] = None,
+    ) -> None:
+        renderer.empty_line()
+
+        if len(modules) == 0:
+            renderer.wrap.render("<<DIM>>You have no modules registered.<<RESET>>")
+            renderer.empty_line()
+            return
+
+        # The link states could have been changed outside of dotmodules, so
+        # they are probed again for the plan.
+        modules.invalidate(link_states=True)
+        plan = LinkPlan.build(modules=modules, link_states=modules.link_states)
+
+        if not parameters or parameters[0] != self.APPLY_PARAMETER:
+            self._render_plan(plan=plan, settings=settings, renderer=renderer)
+        else:
+            start = time.perf_counter()
+            results = plan.apply(worker_count=settings.link_deploy_worker_count)
+            elapsed = time.perf_counter() - start
+            modules.invalidate(link_states=True)
+            self._render_results(
+                plan=plan, results=results, elapsed=elapsed, renderer=renderer
+            )
+
+        renderer.empty_line()
+
+    def _render_plan(
+        self, plan: LinkPlan, settings: Settings, renderer: Renderer
+    ) -> None:
+        creatable = plan.creatable
+        for entry in creatable:
+            renderer.table.add_row(
+                "<<BOLD>><<GREEN>>create<<RESET>>",
+                f"<<BOLD>>{entry.module_name}<<RESET>>",
+                f"<<DIM>>{entry.path_to_symlink}<<RESET>>",
+            )
+        self._render_blocked_rows(plan=plan, renderer=renderer)
+        if creatable or plan.blocked or plan.conflicts:
+            renderer.table.render()
+            renderer.empty_line()
+
+        renderer.wrap.render(
+            f"<<BOLD>>{len(creatable)}<<RESET>> links to create in "
+            f"<<BOLD>>{len(plan.groups)}<<RESET>> directories, "
+            f"<<BOLD>>{len(plan.unchanged)}<<RESET>> already deployed, "
+            f"<<BOLD>>{len(plan.blocked)}<<RESET>> blocked, "
+            f"<<BOLD>>{len(plan.conflicts)}<<RESET>> conflicting."
+        )
+        if creatable:
+            hotkey = settings.hotkey_deploy.split("|")[0]
+            renderer.wrap.render(
+                "<<DIM>><<CYAN>>You can create the links by appending 'apply' to "
+                f"the deploy command like {hotkey} {self.APPLY_PARAMETER}.<<RESET>>"
+            )
+
+    @staticmethod
+    def _render_blocked_rows(plan: LinkPlan, renderer: Renderer) -> None:
+        for entry in plan.blocked:
+            renderer.table.add_row(
+                "<<BOLD>><<YELLOW>>blocked<<RESET>>",
+                f"<<BOLD>>{entry.module_name}<<RESET>>",
+                f"<<DIM>>{entry.path_to_symlink}<<RESET>>",
+            )
+        for conflict in plan.conflicts:
+            module_names = ", ".join(entry.module_name for entry in conflict.entries)
+            renderer.table.add_row(
+                "<<BOLD>><<RED>>conflict<<RESET>>",
+                f"<<BOLD>>{module_names}<<RESET>>",
+                f"<<DIM>>{conflict.path_to_symlink}<<RESET>>",
+            )
+
+    def _render_results(
+        self,
+        plan: LinkPlan,
+        results: Sequence[LinkApplyResult],
+        elapsed: float,
+        renderer: Renderer,
+    ) -> None:
+        for result in results:
+            if result.status == LinkApplyStatus.FAILED:
+                renderer.table.add_row(
+                    "<<BOLD>><<RED>>failed<<RESET>>",
+                    f"<<BOLD>>{result.entry.module_name}<<RESET>>",
+                    f"<<DIM>>{result.entry.path_to_symlink}: {result.error}<<RESET>>",
+                )
+        self._render_blocked_rows(plan=plan, renderer=renderer)
+        failed_count = len(
+            [result for result in results if result.status == LinkApplyStatus.FAILED]
+        )
+        if failed_count or plan.blocked or plan.conflicts:
+            renderer.table.render()
+            renderer.empty_line()
+
+        color = "<<RED>>" if failed_count else "<<GREEN>>"
+        renderer.wrap.render(
+            f"{color}{len(results) - failed_count}/{len(results)} links created"
+            f"<<RESET>><<DIM>> in {elapsed:.2f}s, {len(plan.unchanged)} already "
+            f"deployed, {len(plan.blocked)} blocked, {len(plan.conflicts)} "
+            "conflicting.<<RESET>>"
+        )
+        if plan.blocked or plan.conflicts:
+            renderer.wrap.render(
+                "<<DIM>><<CYAN>>The blocked links can be resolved interactively "
+                "by the DEPLOY_LINKS hook.<<RESET>>"
+            )
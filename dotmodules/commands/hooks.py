@@ -1,7 +1,16 @@
-from typing import Callable, List, Optional
+import time
+from typing import Callable, List, Optional, Sequence
 
 from dotmodules.commands import Command
 from dotmodules.modules import Modules
+from dotmodules.modules.hooks import LinkCleanUpHook, LinkDeploymentHook
+from dotmodules.modules.hooks.engine import (
+    HookExecutionEngine,
+    HookOutputMode,
+    HookRunResult,
+    HookScheduling,
+)
+from dotmodules.modules.hooks.graph import HookDependencyGraph
 from dotmodules.renderer import Renderer
 from dotmodules.settings import Settings
 
@@ -61,7 +70,75 @@ class HooksCommand(Command):
             hook_index = int(parameters[0]) - 1
             hook_name = list(modules.aggregated_hooks.keys())[hook_index]
             hooks = modules.aggregated_hooks[hook_name]
-            for hook in hooks:
-                hook.execute()
+            engine = HookExecutionEngine(
+                parallelism=settings.hook_parallelism,
+                output_mode=HookOutputMode(settings.hook_output_mode),
+            )
+            graph: Optional[HookDependencyGraph] = None
+            start = time.perf_counter()
+            if HookScheduling(settings.hook_scheduling) == HookScheduling.DEPENDENCIES:
+                graph = modules.aggregated_hook_graphs[hook_name]
+                results = engine.run_graph(graph=graph)
+            else:
+                results = engine.run(hooks=hooks)
+            elapsed = time.perf_counter() - start
+            renderer.empty_line()
+            self._render_summary(renderer=renderer, results=results, elapsed=elapsed)
+            if graph is not None:
+                self._render_critical_path(
+                    renderer=renderer, graph=graph, results=results
+                )
+            modules.invalidate(
+                link_states=hook_name in (LinkDeploymentHook.NAME, LinkCleanUpHook.NAME)
+            )
+            modules.variable_statuses.invalidate_prepare_cache()
 
         renderer.empty_line()
+
+    @staticmethod
+    def _render_summary(
+        renderer: Renderer, results: Sequence[HookRunResult], elapsed: float
+    ) -> None:
+        for result in results:
+            if result.skipped:
+                status = "<<YELLOW>>skipped<<RESET>>"
+            elif result.succeeded:
+                status = "<<GREEN>>done<<RESET>>"
+            else:
+                status = f"<<RED>>failed ({result.status_code})<<RESET>>"
+            renderer.table.add_row(
+                f"<<BOLD>>{status}<<RESET>>",
+                f"<<DIM>>{result.duration:.2f}s<<RESET>>",
+                f"<<BOLD>>{result.hook.execution_context.module_name}<<RESET>>",
+                f"<<DIM>>{result.hook.hook_name}<<RESET>>",
+            )
+        renderer.table.render()
+
+        failed_count = len([result for result in results if not result.succeeded])
+        color = "<<RED>>" if failed_count else "<<GREEN>>"
+        renderer.wrap.render(
+            f"{color}{len(results) - failed_count}/{len(results)} hooks succeeded"
+            f"<<RESET>><<DIM>> in {elapsed:.2f}s.<<RESET>>"
+        )
+
+    @staticmethod
+    def _render_critical_path(
+        renderer: Renderer,
+        graph: HookDependencyGraph,
+        results: Sequence[HookRunResult],
+    ) -> None:
+        """
+        Renders the chain of dependent hooks that took the longest, i.e. the
+        hooks that should be optimized to speed up the whole execution.
+        """
+        durations = [result.duration for result in results]
+        path = graph.get_critical_path(durations=durations)
+        if not path:
+            return
+        steps = " -> ".join(
+            f"{graph.hooks[index].execution_context.module_name} "
+            f"({durations[index]:.2f}s)"
+            for index in path
+        )
+        total = sum(durations[index] for index in path)
+        renderer.wrap.render(f"<<DIM>>Critical path: {steps} = {total:.2f}s<<RESET>>")
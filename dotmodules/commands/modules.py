@@ -3,7 +3,8 @@ from typing import Callable, List, Optional
 
 from dotmodules.commands import Command
 from dotmodules.modules import Module, Modules, ModuleStatus
-from dotmodules.modules.path import PathManager
+from dotmodules.modules.hooks import LinkCleanUpHook, LinkDeploymentHook
+from dotmodules.modules.links import LinkState
 from dotmodules.modules.variable_status import VariableStatusValue
 from dotmodules.renderer import Renderer
 from dotmodules.settings import Settings
@@ -36,6 +37,11 @@ class ModulesCommand(Command):
             renderer.empty_line()
             return
 
+        # Collecting the finished variable status results once, so every module
+        # status in the list will be calculated only once for the current
+        # modules generation.
+        modules.variable_statuses.poll()
+
         current_root = ""
         for index, module in enumerate(modules, start=1):
             root = os.path.relpath(
@@ -57,20 +63,24 @@ class ModulesCommand(Command):
             #     case _:
             #         raise ValueError(f"Invalid module status value: '{module.status}'")
 
-            if module.status == ModuleStatus.DISABLED:
+            module_status = module.status
+            is_disabled = module_status == ModuleStatus.DISABLED
+            is_incomplete = module_status == ModuleStatus.INCOMPLETE
+
+            if module_status == ModuleStatus.DISABLED:
                 color = "<<DIM>>"
-            elif module.status == ModuleStatus.INCOMPLETE:
+            elif module_status == ModuleStatus.INCOMPLETE:
                 color = "<<BOLD>><<YELLOW>>"
-            elif module.status == ModuleStatus.DEPLOYED:
+            elif module_status == ModuleStatus.DEPLOYED:
                 color = "<<BOLD>><<GREEN>>"
-            elif module.status == ModuleStatus.ERROR:
+            elif module_status == ModuleStatus.ERROR:
                 color = "<<BOLD>><<RED>>"
-            elif module.status == ModuleStatus.LOADING:
+            elif module_status == ModuleStatus.LOADING:
                 color = "<<BOLD>><<MAGENTA>>"
             else:
-                raise ValueError(f"Invalid module status value: '{module.status}'")
+                raise ValueError(f"Invalid module status value: '{module_status}'")
 
-            status = f"{color}{module.status.value}<<RESET>>"
+            status = f"{color}{module_status.value}<<RESET>>"
 
             if not current_root:
                 current_root = base_root
@@ -80,24 +90,24 @@ class ModulesCommand(Command):
 
             index_column = (
                 f"<<BOLD>><<BLUE>>[{str(index)}]<<RESET>>"
-                if not module.is_disabled
+                if not is_disabled
                 else f"<<DIM>>[{str(index)}]<<RESET>>"
             )
-            if module.is_disabled:
+            if is_disabled:
                 name_column = f"<<DIM>>{module.name}<<RESET>>"
-            elif module.is_incomplete:
+            elif is_incomplete:
                 name_column = f"<<BOLD>><<YELLOW>>{module.name}<<RESET>>"
             else:
                 name_column = f"<<BOLD>>{module.name}<<RESET>>"
 
             version_column = (
                 f"{str(module.version)}"
-                if not module.is_disabled
+                if not is_disabled
                 else f"<<DIM>>{str(module.version)}<<RESET>>"
             )
             root_column = (
                 f"<<UNDERLINE>>{str(root)}<<RESET>>"
-                if not module.is_disabled
+                if not is_disabled
                 else f"<<UNDERLINE>><<DIM>>{str(root)}<<RESET>>"
             )
 
@@ -135,6 +145,9 @@ class ModulesCommand(Command):
             index = int(parameters[0])
             module = modules[index - 1]
 
+            # The statuses of the displayed variables should arrive first.
+            modules.variable_statuses.prioritize(variable_names=module.variables.keys())
+
             self._render_module_name(
                 renderer=renderer, module=module, settings=settings
             )
@@ -171,6 +184,10 @@ class ModulesCommand(Command):
             hook = module.hooks[hook_index]
 
             hook_status_code = hook.execute()
+            modules.invalidate(
+                link_states=isinstance(hook, (LinkDeploymentHook, LinkCleanUpHook))
+            )
+            modules.variable_statuses.invalidate_prepare_cache()
 
             if hook_status_code != 0:
                 renderer.empty_line()
@@ -232,20 +249,21 @@ class ModulesCommand(Command):
         #     case _:
         #         raise ValueError(f"Invalid module status value: '{module.status}'")
 
-        if module.status == ModuleStatus.DISABLED:
+        module_status = module.status
+        if module_status == ModuleStatus.DISABLED:
             color = "<<DIM>>"
-        elif module.status == ModuleStatus.INCOMPLETE:
+        elif module_status == ModuleStatus.INCOMPLETE:
             color = "<<BOLD>><<YELLOW>>"
-        elif module.status == ModuleStatus.DEPLOYED:
+        elif module_status == ModuleStatus.DEPLOYED:
             color = "<<BOLD>><<GREEN>>"
-        elif module.status == ModuleStatus.ERROR:
+        elif module_status == ModuleStatus.ERROR:
             color = "<<BOLD>><<RED>>"
-        elif module.status == ModuleStatus.LOADING:
+        elif module_status == ModuleStatus.LOADING:
             color = "<<BOLD>><<MAGENTA>>"
         else:
-            raise ValueError(f"Invalid module status value: '{module.status}'")
+            raise ValueError(f"Invalid module status value: '{module_status}'")
 
-        status = f"{color}{module.status.value}<<RESET>>"
+        status = f"{color}{module_status.value}<<RESET>>"
 
         text = renderer.wrap.render(
             string=status,
@@ -263,10 +281,11 @@ class ModulesCommand(Command):
     def _render_module_errors(
         self, renderer: Renderer, module: Module, settings: Settings
     ) -> None:
-        if module.errors:
+        errors = module.errors
+        if errors:
             renderer.empty_line()
             text = []
-            for error in module.errors:
+            for error in errors:
                 text += renderer.wrap.render(
                     string=f"<<BOLD>><<RED>>{error}<<RESET>>",
                     wrap_limit=settings.body_width,
@@ -321,29 +340,23 @@ class ModulesCommand(Command):
             return
 
         renderer.empty_line()
-        path_manager = PathManager(root_path=module.root)
-
-        for link in module.links:
-            link_exists = link.check_if_link_exists(path_manager=path_manager)
-            target_matched = link.check_if_target_matched(path_manager=path_manager)
 
-            if link_exists and target_matched:
+        for link, link_state in module.link_states:
+            if link_state == LinkState.MATCHED:
                 path_to_symlink_color = "<<BOLD>><<GREEN>>"
                 link_status = "<<DIM>>==><<RESET>>"
                 path_to_target_color = "<<BOLD>><<GREEN>>"
-                target_status = "<<DIM>>[matched]<<RESET>>"
-
-            elif link_exists and not target_matched:
+            elif link_state in (LinkState.MISMATCH, LinkState.DANGLING):
                 path_to_symlink_color = "<<BOLD>><<GREEN>>"
                 link_status = "<<DIM>>=X=<<RESET>>"
                 path_to_target_color = "<<BOLD>><<RED>>"
-                target_status = "<<DIM>>[mismatch]<<RESET>>"
-
-            elif not link_exists:
+            elif link_state == LinkState.MISSING:
                 path_to_symlink_color = "<<BOLD>><<RED>>"
                 link_status = ""
                 path_to_target_color = "<<BOLD>><<RED>>"
-                target_status = "<<DIM>>[missing]<<RESET>>"
+            else:
+                raise ValueError(f"Invalid link state value: '{link_state}'")
+            target_status = f"<<DIM>>[{link_state.value}]<<RESET>>"
 
             renderer.table.add_row(
                 f"<<BOLD>>{link.name}<<RESET>>",
@@ -382,17 +395,27 @@ class ModulesCommand(Command):
                     color = "<<MAGENTA>>"
                 elif variable_status.status == VariableStatusValue.NOT_AVAIBLE:
                     color = "<<DIM>>"
+                elif variable_status.status == VariableStatusValue.FAILED:
+                    color = "<<YELLOW>>"
                 else:
                     raise ValueError(
                         f"Invalid variable status value: '{variable_status.status}'"
                     )
 
+                # Cached statuses are marked until the refreshed ones arrive.
+                stale_marker = " (stale)" if variable_status.is_stale else ""
                 prepared_values.append(
-                    f"<<BOLD>>{color}[{value}]<<RESET>><<DIM>>-{variable_status.status_string}<<RESET>>"
+                    f"<<BOLD>>{color}[{value}]<<RESET>><<DIM>>-{variable_status.status_string}{stale_marker}<<RESET>>"
                 )
             renderer.table.add_row(
                 f"<<BOLD>>{name}<<RESET>> " + " ".join(prepared_values),
             )
+
+        progress = modules.variable_statuses.get_progress(
+            variable_names=module.variables.keys()
+        )
+        if not progress.finished:
+            renderer.table.add_row(f"<<DIM>>{progress}<<RESET>>")
         text = renderer.table.render(print_lines=False, indent=False)
 
         renderer.header.render(
@@ -35,6 +35,11 @@ class VariablesCommand(Command):
             renderer.empty_line()
             return
 
+        progress = modules.variable_statuses.get_progress()
+        if not progress.finished:
+            renderer.wrap.render(f"<<DIM>>Variable statuses: {progress}<<RESET>>")
+            renderer.empty_line()
+
         header_width = max(
             [len(name) for name in modules.aggregated_variables.keys()]
         ) + len(settings.rendered_column_padding)
@@ -59,13 +64,17 @@ class VariablesCommand(Command):
                     color = "<<MAGENTA>>"
                 elif variable_status.status == VariableStatusValue.NOT_AVAIBLE:
                     color = "<<DIM>>"
+                elif variable_status.status == VariableStatusValue.FAILED:
+                    color = "<<YELLOW>>"
                 else:
                     raise ValueError(
                         f"Invalid variable status value: '{variable_status.status}'"
                     )
 
+                # Cached statuses are marked until the refreshed ones arrive.
+                stale_marker = " (stale)" if variable_status.is_stale else ""
                 prepared_values.append(
-                    f"<<BOLD>>{color}[{value}]<<RESET>><<DIM>>-{variable_status.status_string}<<RESET>>"
+                    f"<<BOLD>>{color}[{value}]<<RESET>><<DIM>>-{variable_status.status_string}{stale_marker}<<RESET>>"
                 )
 
             text = renderer.wrap.render(
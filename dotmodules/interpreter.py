@@ -52,6 +52,10 @@ class CommandLineInterpreter:
 
         while True:
             raw_input = input(prompt)
+
+            # Merging the variable status results that arrived in the meantime.
+            self._modules.variable_statuses.poll()
+
             try:
                 self._commands.process_input(
                     raw_input=raw_input,
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Set, cast
+
+from dotmodules.modules.parser import (
+    LINK_ITEM_SCHEMA,
+    SHELL_SCRIPT_HOOK_ITEM_SCHEMA,
+    VARIABLE_STATUS_HOOK_ITEM_SCHEMA,
+    ModuleSpec,
+    ParsedConfigDict,
+)
+
+
+def hash_content(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class ParsedConfigCache:
+    """
+    Persistent cache for the validated configuration parse results. An entry is
+    keyed by the config file path, the hash of the config file content, the
+    deployment target and the name of the loader backend that decoded the file.
+    A cache entry is only served if all keys match exactly, any other case
+    (including a corrupt entry) is treated as a cache miss that results a normal
+    parse. The entries of the removed config files are dropped by the pruning.
+    """
+
+    # Has to be increased on every change that affects the parse result
+    # structure or the parsing logic itself.
+    VERSION = 6
+
+    def __init__(self, cache_path: Path) -> None:
+        self._cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        self._used_entry_paths: Set[Path] = set()
+
+    def _get_entry_path(
+        self, config_file_path: Path, deployment_target: str, loader_backend: str
+    ) -> Path:
+        key = f"{config_file_path.resolve()}\0{deployment_target}\0{loader_backend}"
+        return self._cache_path / f"{hash_content(key.encode())}.json"
+
+    def get(
+        self,
+        config_file_path: Path,
+        content_hash: str,
+        deployment_target: str,
+        loader_backend: str = "",
+    ) -> Optional[ModuleSpec]:
+        entry_path = self._get_entry_path(
+            config_file_path=config_file_path,
+            deployment_target=deployment_target,
+            loader_backend=loader_backend,
+        )
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+            if (
+                entry["version"] == self.VERSION
+                and entry["config_file_path"] == str(config_file_path.resolve())
+                and entry["content_hash"] == content_hash
+                and entry["deployment_target"] == deployment_target
+                and entry["loader_backend"] == loader_backend
+                and self._is_valid_parsed_config(entry["parsed_config"])
+            ):
+                self.hits += 1
+                self._used_entry_paths.add(entry_path)
+                return ModuleSpec.from_dict(
+                    cast(ParsedConfigDict, entry["parsed_config"])
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        config_file_path: Path,
+        content_hash: str,
+        deployment_target: str,
+        module_spec: ModuleSpec,
+        loader_backend: str = "",
+    ) -> None:
+        entry_path = self._get_entry_path(
+            config_file_path=config_file_path,
+            deployment_target=deployment_target,
+            loader_backend=loader_backend,
+        )
+        entry = {
+            "version": self.VERSION,
+            "config_file_path": str(config_file_path.resolve()),
+            "content_hash": content_hash,
+            "deployment_target": deployment_target,
+            "loader_backend": loader_backend,
+            "parsed_config": module_spec.to_dict(),
+        }
+        try:
+            self._cache_path.mkdir(parents=True, exist_ok=True)
+            temporary_path = entry_path.with_name(
+                f"{entry_path.name}.{os.getpid()}.tmp"
+            )
+            with open(temporary_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(temporary_path, entry_path)
+            self._used_entry_paths.add(entry_path)
+        except OSError:
+            # The cache is only an optimization, failing to write it should not
+            # prevent the module loading.
+            pass
+
+    def prune(self) -> None:
+        """
+        Removes the entries of the config files that no longer exist, and the
+        entries that cannot be served anymore. Only the entries that weren't
+        used since the cache object was created are checked, so the pruning
+        costs nothing in the usual case.
+        """
+        try:
+            entry_paths = list(self._cache_path.glob("*.json"))
+        except OSError:
+            return
+
+        for entry_path in entry_paths:
+            if entry_path in self._used_entry_paths:
+                continue
+            try:
+                with open(entry_path) as f:
+                    entry = json.load(f)
+                stale = entry["version"] != self.VERSION or not os.path.isfile(
+                    entry["config_file_path"]
+                )
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError, TypeError):
+                stale = True
+
+            if stale:
+                try:
+                    entry_path.unlink()
+                    self.pruned += 1
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _is_valid_parsed_config(parsed_config: Any) -> bool:
+        """
+        Structure check to detect corrupted but otherwise valid JSON cache
+        entries.
+        """
+        expected_types = {
+            "name": str,
+            "version": str,
+            "enabled": bool,
+            "documentation": list,
+            "variables": dict,
+            "links": list,
+            "shell_script_hooks": list,
+            "variable_status_hooks": list,
+            "depends_on": list,
+        }
+        if not isinstance(parsed_config, dict):
+            return False
+        if set(parsed_config.keys()) != set(expected_types.keys()):
+            return False
+        if not all(
+            isinstance(parsed_config[key], expected_type)
+            for key, expected_type in expected_types.items()
+        ):
+            return False
+
+        for key in ("documentation", "depends_on"):
+            if not all(isinstance(line, str) for line in parsed_config[key]):
+                return False
+
+        for values in parsed_config["variables"].values():
+            if not isinstance(values, list) or not all(
+                isinstance(value, str) for value in values
+            ):
+                return False
+
+        item_schemas = {
+            "links": LINK_ITEM_SCHEMA,
+            "shell_script_hooks": SHELL_SCRIPT_HOOK_ITEM_SCHEMA,
+            "variable_status_hooks": VARIABLE_STATUS_HOOK_ITEM_SCHEMA,
+        }
+        for key, item_schema in item_schemas.items():
+            if not all(item_schema.is_valid_item(item) for item in parsed_config[key]):
+                return False
+
+        return True
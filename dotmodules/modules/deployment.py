@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
+
+from dotmodules.modules.links import LinkState, LinkStateIndex
+from dotmodules.modules.modules import Module
+from dotmodules.modules.path import PathManager
+
+
+class LinkApplyStatus(str, Enum):
+    CREATED = "created"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class LinkPlanEntry:
+    module_name: str
+    link_name: str
+    path_to_target: str
+    path_to_symlink: str
+
+
+@dataclass(frozen=True)
+class LinkConflict:
+    """
+    Links of different modules with the same symlink path but different
+    targets. None of them is deployed.
+    """
+
+    path_to_symlink: str
+    entries: Tuple[LinkPlanEntry, ...]
+
+
+@dataclass(frozen=True)
+class LinkApplyResult:
+    entry: LinkPlanEntry
+    status: LinkApplyStatus
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class LinkPlan:
+    """
+    Deployment plan of every link of the enabled modules. The creatable links
+    are grouped by their parent directories, so every directory is prepared
+    only once, and the groups can be applied at the same time. The links whose
+    symlink path is taken by something else are blocked: the deploy operation
+    doesn't overwrite anything, these have to be resolved by the interactive
+    link deployment hook.
+    """
+
+    groups: Dict[str, Tuple[LinkPlanEntry, ...]]
+    unchanged: Tuple[LinkPlanEntry, ...]
+    blocked: Tuple[LinkPlanEntry, ...]
+    conflicts: Tuple[LinkConflict, ...]
+
+    @classmethod
+    def build(
+        cls, modules: Iterable[Module], link_states: LinkStateIndex
+    ) -> "LinkPlan":
+        """
+        Collects the links of the given modules. The same link defined in
+        multiple modules is planned only once.
+        """
+        entries_by_symlink: Dict[str, List[LinkPlanEntry]] = {}
+        for module in modules:
+            if not module.enabled:
+                continue
+            path_manager = PathManager(root_path=module.root)
+            for link in module.links:
+                path_to_symlink, path_to_target = link.get_key(
+                    path_manager=path_manager
+                )
+                entries_by_symlink.setdefault(path_to_symlink, []).append(
+                    LinkPlanEntry(
+                        module_name=module.name,
+                        link_name=link.name,
+                        path_to_target=path_to_target,
+                        path_to_symlink=path_to_symlink,
+                    )
+                )
+
+        groups: Dict[str, List[LinkPlanEntry]] = {}
+        unchanged: List[LinkPlanEntry] = []
+        blocked: List[LinkPlanEntry] = []
+        conflicts: List[LinkConflict] = []
+        for path_to_symlink in sorted(entries_by_symlink):
+            entries = entries_by_symlink[path_to_symlink]
+            targets = {os.path.normpath(entry.path_to_target) for entry in entries}
+            if len(targets) > 1:
+                conflicts.append(
+                    LinkConflict(
+                        path_to_symlink=path_to_symlink, entries=tuple(entries)
+                    )
+                )
+                continue
+
+            entry = entries[0]
+            state = link_states.get((entry.path_to_symlink, entry.path_to_target))
+            if state == LinkState.MATCHED:
+                unchanged.append(entry)
+            elif state == LinkState.MISSING and not os.path.lexists(
+                entry.path_to_symlink
+            ):
+                parent = os.path.dirname(entry.path_to_symlink)
+                groups.setdefault(parent, []).append(entry)
+            else:
+                blocked.append(entry)
+
+        return cls(
+            groups={parent: tuple(entries) for parent, entries in groups.items()},
+            unchanged=tuple(unchanged),
+            blocked=tuple(blocked),
+            conflicts=tuple(conflicts),
+        )
+
+    @property
+    def creatable(self) -> List[LinkPlanEntry]:
+        return [entry for entries in self.groups.values() for entry in entries]
+
+    def apply(self, worker_count: int) -> List[LinkApplyResult]:
+        """
+        Creates the planned symlinks. The parent directory groups are applied
+        at the same time by at most 'worker_count' threads. Nothing existing is
+        overwritten: a path that appeared since the plan was built makes the
+        link fail. The results are returned in the order of the groups.
+        """
+        groups = sorted(self.groups.items())
+        if worker_count > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                group_results = list(executor.map(_apply_group, groups))
+        else:
+            group_results = [_apply_group(group) for group in groups]
+        return [result for results in group_results for result in results]
+
+
+def _apply_group(group: Tuple[str, Tuple[LinkPlanEntry, ...]]) -> List[LinkApplyResult]:
+    parent, entries = group
+    try:
+        os.makedirs(parent, exist_ok=True)
+    except OSError as e:
+        return [
+            LinkApplyResult(
+                entry=entry,
+                status=LinkApplyStatus.FAILED,
+                error=f"cannot create directory: {e.strerror}",
+            )
+            for entry in entries
+        ]
+
+    results = []
+    for entry in entries:
+        try:
+            os.symlink(entry.path_to_target, entry.path_to_symlink)
+        except OSError as e:
+            results.append(
+                LinkApplyResult(
+                    entry=entry, status=LinkApplyStatus.FAILED, error=str(e.strerror)
+                )
+            )
+            continue
+        results.append(LinkApplyResult(entry=entry, status=LinkApplyStatus.CREATED))
+    return results
@@ -0,0 +1,401 @@
+import fnmatch
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Name of the optional ignore file that can be placed into any directory inside
+# the modules root. It contains glob patterns line by line that will be matched
+# against the subdirectories relative to the directory the file is in.
+IGNORE_FILE_NAME = ".dmignore"
+
+# Ignore pattern with the directory it should be resolved from.
+IgnorePatternType = Tuple[str, str]
+
+
+class DirectoryEntryKind(str, Enum):
+    """
+    Directory entries that are relevant for the module discovery.
+    """
+
+    DIRECTORY = "directory"
+    CONFIG_FILE = "config_file"
+    IGNORE_FILE = "ignore_file"
+
+
+@dataclass
+class DirectoryListing:
+    """
+    Raw content of a scanned directory that is relevant for the module
+    discovery. It is independent from the ignore settings, so it can be
+    persisted and reused as long as the directory is not modified.
+    """
+
+    mtime_ns: int
+    config_file_found: bool
+    directory_names: List[str]
+    entry_count: int
+    ignore_file_mtime_ns: Optional[int] = None
+    ignore_file_patterns: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DiscoveryResult:
+    """
+    Result of a module discovery run. Besides the found configuration file paths
+    it contains the traversal statistics that can be used to verify that the
+    pruning works as expected.
+    """
+
+    config_file_paths: List[Path] = field(default_factory=list)
+    visited_directories: int = 0
+    visited_entries: int = 0
+    reused_directories: int = 0
+    pruned_directories: List[Path] = field(default_factory=list)
+    directory_listings: Dict[str, DirectoryListing] = field(default_factory=dict)
+
+
+@dataclass
+class DirectoryScanResult:
+    """
+    Result of processing a single directory.
+    """
+
+    path: str
+    listing: DirectoryListing
+    reused: bool
+    subdirectories: List[str]
+    pruned_subdirectories: List[str]
+    ignore_patterns: List[IgnorePatternType]
+
+
+class DiscoveryIndex:
+    """
+    Persistent index of the directory listings collected during a previous
+    discovery run keyed by the absolute directory paths. A listing can only be
+    reused if the modification time of the directory (and its ignore file) did
+    not change since then.
+
+    Directories modified right before the index was created cannot be trusted,
+    as a modification in the same timestamp granularity window would go
+    unnoticed. These directories will always be rescanned.
+    """
+
+    VERSION = 1
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(
+        self,
+        config_file_name: str,
+        listings: Optional[Dict[str, DirectoryListing]] = None,
+        created_ns: int = 0,
+    ) -> None:
+        self._config_file_name = config_file_name
+        self._listings = listings or {}
+        self._created_ns = created_ns
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    @classmethod
+    def load(cls, path: Path, config_file_name: str) -> "DiscoveryIndex":
+        """
+        Loads the index from the given path. A missing, corrupt or incompatible
+        index file results an empty index, i.e. a full rescan.
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if (
+                data["version"] != cls.VERSION
+                or data["config_file_name"] != config_file_name
+            ):
+                return cls(config_file_name=config_file_name)
+            listings = {
+                directory: DirectoryListing(**listing)
+                for directory, listing in data["directories"].items()
+            }
+            return cls(
+                config_file_name=config_file_name,
+                listings=listings,
+                created_ns=int(data["created_ns"]),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(config_file_name=config_file_name)
+
+    @classmethod
+    def from_discovery_result(
+        cls, config_file_name: str, discovery_result: DiscoveryResult
+    ) -> "DiscoveryIndex":
+        return cls(
+            config_file_name=config_file_name,
+            listings=discovery_result.directory_listings,
+            created_ns=time.time_ns(),
+        )
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": self.VERSION,
+            "config_file_name": self._config_file_name,
+            "created_ns": self._created_ns,
+            "directories": {
+                directory: asdict(listing)
+                for directory, listing in self._listings.items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temporary_path, path)
+
+    def get(self, path: str, mtime_ns: int) -> Optional[DirectoryListing]:
+        listing = self._listings.get(path)
+        if listing is None or listing.mtime_ns != mtime_ns:
+            return None
+
+        if mtime_ns >= self._created_ns - self.RACY_WINDOW_NS:
+            return None
+
+        if listing.ignore_file_mtime_ns is not None:
+            try:
+                ignore_file_stat = os.stat(os.path.join(path, IGNORE_FILE_NAME))
+            except OSError:
+                return None
+            if ignore_file_stat.st_mtime_ns != listing.ignore_file_mtime_ns:
+                return None
+
+        return listing
+
+
+@dataclass
+class ModuleDiscovery:
+    """
+    Module discovery engine that walks the modules root directory with
+    'os.scandir' in a breadth first order. The directories of a level are
+    scanned in parallel on a thread pool. Directories matching the ignore set or
+    the patterns in the '.dmignore' files won't be visited. Optionally the
+    traversal can be stopped at the module roots, i.e. a directory that
+    contains a config file won't be descended into.
+
+    If a discovery index is passed, only the directories that were modified
+    since the index was created will be scanned, the other directory listings
+    will be served from the index.
+    """
+
+    config_file_name: str
+    ignored_directory_names: Sequence[str] = (".git", "node_modules")
+    use_ignore_files: bool = True
+    stop_at_module_roots: bool = False
+    worker_count: int = 4
+
+    def discover(
+        self, modules_root_path: Path, index: Optional[DiscoveryIndex] = None
+    ) -> DiscoveryResult:
+        result = DiscoveryResult()
+        level: List[Tuple[str, List[IgnorePatternType]]] = [
+            (str(modules_root_path), [])
+        ]
+
+        def process(item: Tuple[str, List[IgnorePatternType]]) -> DirectoryScanResult:
+            path, ignore_patterns = item
+            return self._process_directory(
+                path=path, ignore_patterns=ignore_patterns, index=index
+            )
+
+        with ThreadPoolExecutor(max_workers=max(self.worker_count, 1)) as executor:
+            while level:
+                if self.worker_count > 1 and len(level) > 1:
+                    scan_results: Iterable[DirectoryScanResult] = executor.map(
+                        process, level
+                    )
+                else:
+                    scan_results = map(process, level)
+
+                next_level = []
+                for scan_result in scan_results:
+                    listing = scan_result.listing
+                    result.visited_directories += 1
+                    result.directory_listings[scan_result.path] = listing
+                    if scan_result.reused:
+                        result.reused_directories += 1
+                    else:
+                        result.visited_entries += listing.entry_count
+                    result.pruned_directories += [
+                        Path(scan_result.path, name)
+                        for name in scan_result.pruned_subdirectories
+                    ]
+
+                    if listing.config_file_found:
+                        result.config_file_paths.append(
+                            Path(scan_result.path, self.config_file_name)
+                        )
+                        if self.stop_at_module_roots:
+                            continue
+
+                    for name in scan_result.subdirectories:
+                        next_level.append(
+                            (
+                                os.path.join(scan_result.path, name),
+                                scan_result.ignore_patterns,
+                            )
+                        )
+                level = next_level
+
+        result.config_file_paths.sort()
+        result.pruned_directories.sort()
+        return result
+
+    def _process_directory(
+        self,
+        path: str,
+        ignore_patterns: List[IgnorePatternType],
+        index: Optional[DiscoveryIndex],
+    ) -> DirectoryScanResult:
+        listing = None
+        if index is not None:
+            try:
+                listing = index.get(path=path, mtime_ns=os.stat(path).st_mtime_ns)
+            except OSError:
+                listing = None
+
+        reused = listing is not None
+        if listing is None:
+            listing = self._scan_directory(path=path)
+
+        if self.use_ignore_files and listing.ignore_file_patterns:
+            ignore_patterns = ignore_patterns + [
+                (path, pattern) for pattern in listing.ignore_file_patterns
+            ]
+
+        subdirectories = []
+        pruned_subdirectories = []
+        for name in listing.directory_names:
+            if self._is_ignored(
+                path=os.path.join(path, name),
+                name=name,
+                ignore_patterns=ignore_patterns,
+            ):
+                pruned_subdirectories.append(name)
+            else:
+                subdirectories.append(name)
+
+        return DirectoryScanResult(
+            path=path,
+            listing=listing,
+            reused=reused,
+            subdirectories=subdirectories,
+            pruned_subdirectories=pruned_subdirectories,
+            ignore_patterns=ignore_patterns,
+        )
+
+    def _scan_directory(self, path: str) -> DirectoryListing:
+        config_file_found = False
+        ignore_file_found = False
+        directory_names = []
+        entry_count = 0
+
+        # The modification time is queried before the scan, so a modification
+        # that happens during the scan will invalidate the listing next time.
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    entry_count += 1
+                    kind = self._classify_entry(entry=entry)
+                    if kind == DirectoryEntryKind.DIRECTORY:
+                        directory_names.append(entry.name)
+                    elif kind == DirectoryEntryKind.CONFIG_FILE:
+                        config_file_found = True
+                    elif kind == DirectoryEntryKind.IGNORE_FILE:
+                        ignore_file_found = True
+        except OSError:
+            # Unreadable directories are skipped silently like 'Path.rglob' does.
+            pass
+
+        ignore_file_mtime_ns = None
+        ignore_file_patterns: List[str] = []
+        if ignore_file_found:
+            ignore_file_mtime_ns, ignore_file_patterns = self._read_ignore_file(
+                path=path
+            )
+
+        return DirectoryListing(
+            mtime_ns=mtime_ns,
+            config_file_found=config_file_found,
+            directory_names=sorted(directory_names),
+            entry_count=entry_count,
+            ignore_file_mtime_ns=ignore_file_mtime_ns,
+            ignore_file_patterns=ignore_file_patterns,
+        )
+
+    def _classify_entry(
+        self, entry: "os.DirEntry[str]"
+    ) -> Optional[DirectoryEntryKind]:
+        name = entry.name
+        try:
+            # Symlinked directories won't be followed in the same way as
+            # 'Path.rglob' doesn't follow them.
+            if entry.is_dir(follow_symlinks=False):
+                return DirectoryEntryKind.DIRECTORY
+            if name == self.config_file_name and entry.is_file():
+                return DirectoryEntryKind.CONFIG_FILE
+        except OSError:
+            return None
+        if name == IGNORE_FILE_NAME:
+            return DirectoryEntryKind.IGNORE_FILE
+        return None
+
+    def _read_ignore_file(self, path: str) -> Tuple[Optional[int], List[str]]:
+        """
+        Returns the modification time and the patterns of the ignore file in the
+        given directory.
+        """
+        ignore_file_path = Path(path, IGNORE_FILE_NAME)
+        try:
+            ignore_file_mtime_ns: Optional[int] = ignore_file_path.stat().st_mtime_ns
+        except OSError:
+            ignore_file_mtime_ns = None
+        return ignore_file_mtime_ns, self.load_ignore_file(ignore_file_path)
+
+    def _is_ignored(
+        self, path: str, name: str, ignore_patterns: List[IgnorePatternType]
+    ) -> bool:
+        if name in self.ignored_directory_names:
+            return True
+        for base_path, pattern in ignore_patterns:
+            relative_path = os.path.relpath(path, base_path)
+            if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(
+                relative_path, pattern
+            ):
+                return True
+        return False
+
+    @staticmethod
+    def load_ignore_file(path: Path) -> List[str]:
+        """
+        Loads the glob patterns from the given ignore file. Empty lines and
+        lines starting with a hashmark are skipped. Trailing slashes are
+        tolerated as only directories can be ignored.
+        """
+        try:
+            with open(path) as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+
+        patterns = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            patterns.append(line.rstrip("/"))
+        return patterns
@@ -1,9 +1,20 @@
 import os
+import tempfile
 from abc import abstractmethod, abstractproperty
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypedDict,
+)
 
 if TYPE_CHECKING:
     from dotmodules.modules.modules import Module
@@ -11,7 +22,11 @@ if TYPE_CHECKING:
 from dotmodules.modules.errors import ErrorListProvider
 from dotmodules.modules.path import PathManager
 from dotmodules.settings import Settings
-from dotmodules.shell_adapter import ShellAdapter, ShellResult
+from dotmodules.shell_adapter import (
+    ProcessStartedCallbackType,
+    ShellAdapter,
+    ShellResult,
+)
 
 
 class HookError(Exception):
@@ -51,6 +66,7 @@ class HookExecutionContext:
     dm_cache_variables: str
     indent: str
     text_wrap_limit: str
+    link_engine: str
 
 
 class SerializedHookExecutionContextDict(TypedDict):
@@ -60,6 +76,7 @@ class SerializedHookExecutionContextDict(TypedDict):
     dm_cache_variables: str
     indent: str
     text_wrap_limit: str
+    link_engine: str
 
 
 @dataclass
@@ -81,6 +98,7 @@ class HookExecutionContextMixin:
             dm_cache_variables=str(settings.dm_cache_variables),
             indent=str(settings.rendered_indent),
             text_wrap_limit=str(settings.text_wrap_limit),
+            link_engine=str(settings.link_engine),
         )
 
 
@@ -133,43 +151,114 @@ class Hook(ErrorListProvider, HookExecutionContextMixin):
         calling process. The implementation should accomodate to this.
         """
 
+    def get_hook_argument_items(self, path_manager: PathManager) -> Optional[List[str]]:
+        """
+        Hooks whose arguments grow with the input size should return them here
+        instead of the additional arguments, so the command line cannot exceed
+        the system limit. The items are passed to the adapter script in a NUL
+        delimited temporary file, and its path will be the first hook specific
+        argument. The adapter scripts read the items line by line, so the items
+        cannot contain newlines.
+        """
+        return None
+
     def execute(
         self,
         extra_arguments: Optional[Dict[str, str]] = None,
+        stdin: Optional[bytes] = None,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
     ) -> HookExecutionResult:
         """
-        Executes the given external hook command.
+        Executes the given external hook command. The optional standard input
+        content and process start callback are only used by the captured hooks.
         """
 
         if not self.execution_context:
             raise HookError("Execution context was not set up for hook!")
 
-        command = self._assemble_command(
-            extra_arguments=extra_arguments,
-        )
-
         adapter = ShellAdapter()
 
-        if self.hook_execution_type == HookExecutionType.INTERACTIVE:
-            status_code = adapter.execute_interactively(
-                command=command, cwd=Path(self.execution_context.module_root)
-            )
-            result = HookExecutionResult(status_code=status_code)
+        with self._prepare_command(extra_arguments=extra_arguments) as command:
+            if self.hook_execution_type == HookExecutionType.INTERACTIVE:
+                status_code = adapter.execute_interactively(
+                    command=command, cwd=Path(self.execution_context.module_root)
+                )
+                result = HookExecutionResult(status_code=status_code)
+
+            elif self.hook_execution_type == HookExecutionType.CAPTURE:
+                shell_result = adapter.execute_and_capture(
+                    command=command,
+                    cwd=Path(self.execution_context.module_root),
+                    stdin=stdin,
+                    on_start=on_process_started,
+                )
+                result = HookExecutionResult(
+                    status_code=shell_result.status_code,
+                    execution_result=shell_result,
+                )
 
-        elif self.hook_execution_type == HookExecutionType.CAPTURE:
-            shell_result = adapter.execute_and_capture(
-                command=command, cwd=Path(self.execution_context.module_root)
-            )
-            result = HookExecutionResult(
-                status_code=shell_result.status_code,
-                execution_result=shell_result,
+        return result
+
+    def execute_streamed(
+        self,
+        on_output_line: Callable[[str], None],
+        extra_arguments: Optional[Dict[str, str]] = None,
+    ) -> HookExecutionResult:
+        """
+        Executes the given external hook command without a terminal, and passes
+        its merged output to the given callback line by line. It makes possible
+        to execute multiple hooks at the same time.
+        """
+
+        if not self.execution_context:
+            raise HookError("Execution context was not set up for hook!")
+
+        with self._prepare_command(extra_arguments=extra_arguments) as command:
+            status_code = ShellAdapter().execute_and_stream(
+                command=command,
+                on_line=on_output_line,
+                cwd=Path(self.execution_context.module_root),
             )
+        return HookExecutionResult(status_code=status_code)
 
-        return result
+    @contextmanager
+    def _prepare_command(
+        self,
+        extra_arguments: Optional[Dict[str, str]] = None,
+    ) -> Iterator[List[str]]:
+        """
+        Assembles the command, and writes the argument items file if the hook
+        provides argument items. The file is removed after the execution.
+        """
+        path_manager = PathManager(root_path=Path(self.execution_context.module_root))
+        items = self.get_hook_argument_items(path_manager=path_manager)
+        if items is None:
+            yield self._assemble_command(extra_arguments=extra_arguments)
+            return
+
+        items_file_path = self._write_argument_items(items=items)
+        try:
+            yield self._assemble_command(
+                extra_arguments=extra_arguments, items_file_path=items_file_path
+            )
+        finally:
+            os.unlink(items_file_path)
+
+    def _write_argument_items(self, items: Sequence[str]) -> str:
+        for item in items:
+            if "\n" in item:
+                raise HookError(f"Hook argument item cannot contain newlines: {item!r}")
+        file_descriptor, items_file_path = tempfile.mkstemp(
+            prefix="hook_argument_items_", dir=self.execution_context.dm_cache_root
+        )
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(b"".join(os.fsencode(item) + b"\0" for item in items))
+        return items_file_path
 
     def _assemble_command(
         self,
         extra_arguments: Optional[Dict[str, str]] = None,
+        items_file_path: Optional[str] = None,
     ) -> List[str]:
 
         path_manager = PathManager(root_path=Path(self.execution_context.module_root))
@@ -218,6 +307,11 @@ class Hook(ErrorListProvider, HookExecutionContextMixin):
             str(self.execution_context.text_wrap_limit),
         ]
 
+        # 9 - path of the argument items file if the sub-class provides argument
+        # items, the additional arguments come after it.
+        if items_file_path is not None:
+            command.append(items_file_path)
+
         # Appending the additional arguments provided by the sub-class.
         command += self.get_additional_hook_arguments(
             path_manager=path_manager, extra_arguments=extra_arguments
@@ -0,0 +1,211 @@
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from dotmodules.modules.hooks.base import Hook
+from dotmodules.modules.hooks.graph import HookDependencyGraph
+
+
+class HookOutputMode(str, Enum):
+    """
+    Way of displaying the output of the hooks executed at the same time:
+
+    - prefixed: every output line is displayed as soon as it arrives, prefixed
+      with the name of the module the hook belongs to.
+    - grouped: the whole output of a hook is displayed at once when the hook
+      finishes, so the outputs of the hooks are not interleaved.
+    """
+
+    PREFIXED = "prefixed"
+    GROUPED = "grouped"
+
+
+class HookScheduling(str, Enum):
+    """
+    Way of ordering the executed hooks:
+
+    - priority: the hooks are executed level by level in priority order.
+    - dependencies: the hooks are executed by the dependency graph built from
+      the module dependencies.
+    """
+
+    PRIORITY = "priority"
+    DEPENDENCIES = "dependencies"
+
+
+@dataclass(frozen=True)
+class HookRunResult:
+    hook: Hook
+    status_code: int
+    duration: float
+    # The hook is skipped if one of its dependencies has failed.
+    skipped: bool = False
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.skipped and self.status_code == 0
+
+
+@dataclass
+class HookExecutionEngine:
+    """
+    Executes the given hooks in priority order. Every priority level is a
+    barrier: a level is started only after every hook of the previous level
+    has finished. The hooks within a level are independent, so they are
+    executed at the same time by at most 'parallelism' threads with their
+    output captured. With a parallelism of one, or for a single hook in a
+    level, the hooks are executed interactively one after another.
+
+    Alternatively the hooks can be scheduled by a dependency graph, where a
+    hook is only waiting for the hooks it depends on.
+    """
+
+    parallelism: int = 1
+    output_mode: HookOutputMode = HookOutputMode.PREFIXED
+    write_output: Callable[[str], None] = print
+    _output_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def run(self, hooks: Sequence[Hook]) -> List[HookRunResult]:
+        """
+        Executes the hooks and returns their results in execution order.
+        """
+        results: List[HookRunResult] = []
+        ordered_hooks = sorted(hooks, key=lambda hook: hook.hook_priority)
+        for _priority, level in itertools.groupby(
+            ordered_hooks, key=lambda hook: hook.hook_priority
+        ):
+            results += self._run_level(hooks=list(level))
+        return results
+
+    def run_graph(self, graph: HookDependencyGraph) -> List[HookRunResult]:
+        """
+        Executes the hooks of the given dependency graph. A hook is started as
+        soon as every hook it depends on has finished, so there are no priority
+        barriers. The hooks depending on a failed hook are skipped. The results
+        are returned in the order of the hooks in the graph.
+        """
+        scheduler = _HookGraphScheduler(graph=graph)
+
+        if self.parallelism <= 1:
+            index = scheduler.next_runnable()
+            while index is not None:
+                scheduler.finish(
+                    index, self._run_interactively(hook=graph.hooks[index])
+                )
+                index = scheduler.next_runnable()
+            return scheduler.results
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            running: Dict["Future[HookRunResult]", int] = {}
+            while True:
+                index = scheduler.next_runnable()
+                while index is not None:
+                    future = executor.submit(self._run_captured, graph.hooks[index])
+                    running[future] = index
+                    index = scheduler.next_runnable()
+                if not running:
+                    break
+                done, _pending = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scheduler.finish(running.pop(future), future.result())
+        return scheduler.results
+
+    def _run_level(self, hooks: List[Hook]) -> List[HookRunResult]:
+        if self.parallelism <= 1 or len(hooks) == 1:
+            return [self._run_interactively(hook=hook) for hook in hooks]
+
+        worker_count = min(self.parallelism, len(hooks))
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            return list(executor.map(self._run_captured, hooks))
+
+    def _run_interactively(self, hook: Hook) -> HookRunResult:
+        start = time.perf_counter()
+        hook_execution_result = hook.execute()
+        return HookRunResult(
+            hook=hook,
+            status_code=hook_execution_result.status_code,
+            duration=time.perf_counter() - start,
+        )
+
+    def _run_captured(self, hook: Hook) -> HookRunResult:
+        prefix = f"[{hook.execution_context.module_name}] "
+        buffered_lines: List[str] = []
+
+        def on_output_line(line: str) -> None:
+            if self.output_mode == HookOutputMode.GROUPED:
+                buffered_lines.append(line)
+                return
+            with self._output_lock:
+                self.write_output(prefix + line)
+
+        start = time.perf_counter()
+        hook_execution_result = hook.execute_streamed(on_output_line=on_output_line)
+        duration = time.perf_counter() - start
+
+        if buffered_lines:
+            with self._output_lock:
+                for line in buffered_lines:
+                    self.write_output(prefix + line)
+
+        return HookRunResult(
+            hook=hook,
+            status_code=hook_execution_result.status_code,
+            duration=duration,
+        )
+
+
+class _HookGraphScheduler:
+    """
+    Bookkeeping of a dependency graph execution. It is only used from the
+    thread that schedules the hooks.
+    """
+
+    def __init__(self, graph: HookDependencyGraph) -> None:
+        self._graph = graph
+        self._results: List[Optional[HookRunResult]] = [None] * len(graph.hooks)
+        self._dependents = graph.get_dependents()
+        self._remaining = [len(dependencies) for dependencies in graph.dependencies]
+        self._failed: Set[int] = set()
+        self._ready = [
+            index for index, count in enumerate(self._remaining) if count == 0
+        ]
+
+    @property
+    def results(self) -> List[HookRunResult]:
+        return [result for result in self._results if result is not None]
+
+    def finish(self, index: int, result: HookRunResult) -> None:
+        self._results[index] = result
+        if not result.succeeded:
+            self._failed.add(index)
+        for dependent in sorted(self._dependents[index]):
+            self._remaining[dependent] -= 1
+            if self._remaining[dependent] == 0:
+                self._ready.append(dependent)
+
+    def next_runnable(self) -> Optional[int]:
+        """
+        Returns the index of the next hook that can be started. The hooks
+        depending on a failed hook are finished right away as skipped, so
+        their dependents are skipped too.
+        """
+        while self._ready:
+            index = self._ready.pop(0)
+            if not self._graph.dependencies[index] & self._failed:
+                return index
+            self.finish(
+                index,
+                HookRunResult(
+                    hook=self._graph.hooks[index],
+                    status_code=0,
+                    duration=0.0,
+                    skipped=True,
+                ),
+            )
+        return None
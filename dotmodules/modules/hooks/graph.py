@@ -0,0 +1,217 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    AbstractSet,
+    Deque,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from dotmodules.modules.hooks.base import Hook
+
+# Module names mapped to the names of the modules they depend on.
+ModuleDependenciesType = Mapping[str, Sequence[str]]
+
+NodeType = TypeVar("NodeType", bound=Hashable)
+
+
+def find_dependency_cycle(dependencies: ModuleDependenciesType) -> Optional[List[str]]:
+    """
+    Returns the module names of a dependency cycle with the first name repeated
+    at the end, or None if the dependencies form a directed acyclic graph.
+    """
+    visited: Set[str] = set()
+    for root in sorted(dependencies):
+        if root in visited:
+            continue
+        # Iterative depth first search, the path holds the modules that are
+        # currently being visited.
+        path: List[str] = [root]
+        path_set = {root}
+        iterators = [iter(sorted(dependencies.get(root, ())))]
+        while iterators:
+            name = next(iterators[-1], None)
+            if name is None:
+                iterators.pop()
+                finished = path.pop()
+                path_set.discard(finished)
+                visited.add(finished)
+                continue
+            if name in path_set:
+                return path[path.index(name) :] + [name]
+            if name in visited:
+                continue
+            path.append(name)
+            path_set.add(name)
+            iterators.append(iter(sorted(dependencies.get(name, ()))))
+    return None
+
+
+def collect_module_dependencies(
+    enabled_module_dependencies: ModuleDependenciesType,
+    module_names: AbstractSet[str],
+) -> Tuple[ModuleDependenciesType, List[str]]:
+    """
+    Collects the dependencies between the enabled modules from the declared
+    dependencies of the enabled modules. Dependencies on disabled modules are
+    ignored. The dependencies on unknown modules and the dependency cycles are
+    returned as error messages.
+    """
+    errors = []
+    dependencies: Dict[str, List[str]] = {
+        module_name: [] for module_name in enabled_module_dependencies
+    }
+    for module_name, depends_on in enabled_module_dependencies.items():
+        for name in depends_on:
+            if name not in module_names:
+                errors.append(
+                    f"Module '{module_name}' depends on unknown module '{name}'!"
+                )
+            elif name in dependencies:
+                dependencies[module_name].append(name)
+
+    cycle = find_dependency_cycle(dependencies=dependencies)
+    if cycle:
+        errors.append(f"Module dependency cycle detected: {' -> '.join(cycle)}!")
+    return dependencies, errors
+
+
+def _get_topological_order(
+    dependencies: Mapping[NodeType, Iterable[NodeType]],
+) -> List[NodeType]:
+    """
+    Returns the nodes in an order where every node comes after the nodes it
+    depends on. The nodes of a dependency cycle are left out. Dependencies on
+    nodes that are not in the mapping are ignored.
+    """
+    remaining_counts: Dict[NodeType, int] = {}
+    dependents: Dict[NodeType, List[NodeType]] = {}
+    for node, node_dependencies in dependencies.items():
+        known_dependencies = {
+            dependency for dependency in node_dependencies if dependency in dependencies
+        }
+        remaining_counts[node] = len(known_dependencies)
+        for dependency in known_dependencies:
+            dependents.setdefault(dependency, []).append(node)
+
+    ready: Deque[NodeType] = deque(
+        node for node, count in remaining_counts.items() if not count
+    )
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependent in dependents.get(node, ()):
+            remaining_counts[dependent] -= 1
+            if not remaining_counts[dependent]:
+                ready.append(dependent)
+    return order
+
+
+def _get_transitive_dependencies(
+    dependencies: ModuleDependenciesType,
+) -> Dict[str, FrozenSet[str]]:
+    """
+    Calculates every module a module depends on directly or indirectly. The
+    dependencies should not contain cycles. The modules are processed in
+    topological order, so the closures of the dependencies are already known.
+    """
+    closures: Dict[str, FrozenSet[str]] = {}
+    for name in _get_topological_order(dependencies=dependencies):
+        closure: Set[str] = set()
+        for dependency in dependencies[name]:
+            closure.add(dependency)
+            closure |= closures.get(dependency, frozenset())
+        closures[name] = frozenset(closure)
+    return closures
+
+
+@dataclass(frozen=True)
+class HookDependencyGraph:
+    """
+    Directed acyclic graph of the hooks with the same name. A hook depends on
+    the hooks of every module its module depends on directly or indirectly,
+    and on the hooks of its own module with a lower priority. The hooks are
+    referenced by their index in the hooks tuple.
+    """
+
+    hooks: Tuple[Hook, ...]
+    dependencies: Tuple[FrozenSet[int], ...]
+
+    @classmethod
+    def build(
+        cls, hooks: Sequence[Hook], module_dependencies: ModuleDependenciesType
+    ) -> "HookDependencyGraph":
+        closures = _get_transitive_dependencies(dependencies=module_dependencies)
+        indices_by_module: Dict[str, List[int]] = {}
+        for index, hook in enumerate(hooks):
+            indices_by_module.setdefault(hook.execution_context.module_name, []).append(
+                index
+            )
+
+        dependencies: List[FrozenSet[int]] = []
+        for index, hook in enumerate(hooks):
+            module_name = hook.execution_context.module_name
+            hook_dependencies = {
+                other_index
+                for other_index in indices_by_module[module_name]
+                if hooks[other_index].hook_priority < hook.hook_priority
+            }
+            for dependency in closures.get(module_name, frozenset()):
+                hook_dependencies.update(indices_by_module.get(dependency, []))
+            dependencies.append(frozenset(hook_dependencies))
+
+        return cls(hooks=tuple(hooks), dependencies=tuple(dependencies))
+
+    def get_dependents(self) -> Tuple[FrozenSet[int], ...]:
+        """
+        Returns the indices of the hooks that depend on each hook.
+        """
+        dependents: List[Set[int]] = [set() for _hook in self.hooks]
+        for index, hook_dependencies in enumerate(self.dependencies):
+            for dependency in hook_dependencies:
+                dependents[dependency].add(index)
+        return tuple(frozenset(indices) for indices in dependents)
+
+    def get_critical_path(self, durations: Sequence[float]) -> List[int]:
+        """
+        Returns the indices of the chain of dependent hooks with the longest
+        total duration, i.e. the chain that determined the total execution time
+        with an unlimited parallelism. The durations are indexed by the hooks.
+        """
+        if not self.hooks:
+            return []
+
+        # The hooks are processed in topological order, so the finish times of
+        # the dependencies are already known.
+        finish_times: Dict[int, float] = {}
+        predecessors: Dict[int, Optional[int]] = {}
+        for index in _get_topological_order(
+            dependencies=dict(enumerate(self.dependencies))
+        ):
+            predecessor = max(
+                sorted(self.dependencies[index]),
+                key=finish_times.__getitem__,
+                default=None,
+            )
+            start = finish_times[predecessor] if predecessor is not None else 0.0
+            predecessors[index] = predecessor
+            finish_times[index] = start + durations[index]
+
+        current: Optional[int] = max(
+            range(len(self.hooks)), key=finish_times.__getitem__
+        )
+        path = []
+        while current is not None:
+            path.append(current)
+            current = predecessors[current]
+        return list(reversed(path))
@@ -0,0 +1,316 @@
+import errno
+import os
+import shutil
+import stat
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Absolute target and symlink paths of a deployable link.
+DeployableLinkType = Tuple[str, str]
+
+
+class LinkEngineName(str, Enum):
+    """
+    Implementation of the link deployment and clean up hooks:
+
+    - native: the links are handled in-process, only the links that cannot be
+      handled due to missing privileges are passed to the shell adapters.
+    - shell: every link is handled by the shell adapter scripts.
+    """
+
+    NATIVE = "native"
+    SHELL = "shell"
+
+
+class LinkEngineInputError(Exception):
+    """
+    Error raised when a user decision is needed but there is no input available,
+    i.e. the hook is executed without a terminal.
+    """
+
+
+@dataclass
+class HookLogger:
+    """
+    Python implementation of the hook adapter logger interface that produces
+    the same output as the 'logger.sh' shell library. The messages can contain
+    the usual color tags, the given colorize function is responsible for
+    resolving or removing them.
+    """
+
+    hook_name: str
+    hook_priority: int
+    module_name: str
+    indent: str
+    text_wrap_limit: int
+    colorize: Callable[[str], str]
+    write_output: Callable[[str], None] = print
+    read_input: Callable[[str], str] = input
+
+    @property
+    def _header_length(self) -> int:
+        return self.text_wrap_limit - len(self.indent)
+
+    def _write(self, line: str) -> None:
+        self.write_output(self.colorize(f"{self.indent}{line}"))
+
+    def _write_marked(self, marker: str, message: str) -> None:
+        self._write(f"<<DIM>>│<<RESET>>{marker}<<DIM>>│<<RESET>> {message}")
+
+    def header(self) -> None:
+        header = (
+            f"HOOK <<BOLD>>{self.hook_name}<<RESET>> ({self.hook_priority}) - "
+            f"{self.module_name}"
+        )
+        self._write(f"<<DIM>>╒{'═' * (self._header_length - 1)}<<RESET>>")
+        self._write(f"<<DIM>>│<<RESET>> {header}")
+        self._write(f"<<DIM>>╞════╤{'═' * (self._header_length - 6)}<<RESET>>")
+
+    def task(self, message: str) -> None:
+        self._write_marked("<<BOLD>><<GREEN>> >> <<RESET>>", message)
+
+    def log(self, message: str) -> None:
+        self._write_marked("    ", message)
+
+    def info(self, message: str) -> None:
+        self._write_marked("<<BOLD>><<CYAN>> .. <<RESET>>", message)
+
+    def success(self, message: str) -> None:
+        self._write_marked("<<BOLD>><<GREEN>> ok <<RESET>>", message)
+
+    def warning(self, message: str) -> None:
+        self._write_marked("<<BOLD>><<YELLOW>> !! <<RESET>>", message)
+
+    def error(self, message: str) -> None:
+        self._write_marked("<<BOLD>><<RED>> !! <<RESET>>", message)
+
+    def user_input(self, prompt: str) -> str:
+        try:
+            return self.read_input(
+                self.colorize(
+                    f"{self.indent}<<DIM>>│<<RESET>><<BOLD>><<MAGENTA>> ?? "
+                    f"<<RESET>><<DIM>>│<<RESET>> {prompt} "
+                )
+            ).strip()
+        except EOFError as e:
+            raise LinkEngineInputError("no user input available") from e
+
+    def separator(self) -> None:
+        self._write(f"<<DIM>>├────┼{'─' * (self._header_length - 6)}<<RESET>>")
+
+    def double_separator(self) -> None:
+        self._write(f"<<DIM>>╞════╪{'═' * (self._header_length - 6)}<<RESET>>")
+
+    def footer(self) -> None:
+        self._write(f"<<DIM>>╘════╧{'═' * (self._header_length - 6)}<<RESET>>")
+
+
+@dataclass
+class NativeLinkEngine:
+    """
+    In-process implementation of the decisions made by the 'linking.sh' shell
+    library. Every link is handled with a few system calls instead of multiple
+    external commands. The links that cannot be handled due to insufficient
+    privileges are collected, so they can be passed to the shell adapters that
+    can ask for elevated privileges.
+    """
+
+    logger: HookLogger
+    privileged_links: List[DeployableLinkType] = field(default_factory=list)
+    privileged_symlinks: List[str] = field(default_factory=list)
+    failed: bool = False
+
+    def deploy(self, links: Sequence[DeployableLinkType]) -> int:
+        self.logger.header()
+        for index, (path_to_target, path_to_symlink) in enumerate(links):
+            if index:
+                self.logger.double_separator()
+            try:
+                self._create_symlink(
+                    path_to_target=path_to_target, path_to_symlink=path_to_symlink
+                )
+            except PermissionError:
+                self._report_missing_privileges()
+                self.privileged_links.append((path_to_target, path_to_symlink))
+            except (OSError, LinkEngineInputError) as e:
+                self._report_error(error=e)
+        self.logger.footer()
+        return 1 if self.failed else 0
+
+    def clean_up(self, symlinks: Sequence[str]) -> int:
+        self.logger.header()
+        for index, path_to_symlink in enumerate(symlinks):
+            if index:
+                self.logger.double_separator()
+            try:
+                self._remove_symlink(path_to_symlink=path_to_symlink)
+            except PermissionError:
+                self._report_missing_privileges()
+                self.privileged_symlinks.append(path_to_symlink)
+            except (OSError, LinkEngineInputError) as e:
+                self._report_error(error=e)
+        self.logger.footer()
+        return 1 if self.failed else 0
+
+    def _report_missing_privileges(self) -> None:
+        self.logger.warning(
+            "You don't have sufficient enough privileges, the link will be "
+            "handled by the shell adapter.."
+        )
+
+    def _report_error(self, error: Exception) -> None:
+        self.failed = True
+        self.logger.error(f"<<BOLD>><<RED>>Link handling failed: {error}<<RESET>>")
+
+    def _create_symlink(self, path_to_target: str, path_to_symlink: str) -> None:
+        logger = self.logger
+        logger.task("<<BOLD>>Linking symlink..<<RESET>>")
+        logger.log(f"Path to target:  <<UNDERLINE>>{path_to_target}<<RESET>>")
+        logger.log(f"Path to symlink: <<UNDERLINE>>{path_to_symlink}<<RESET>>")
+
+        try:
+            mode: Optional[int] = os.lstat(path_to_symlink).st_mode
+        except FileNotFoundError:
+            mode = None
+
+        if mode is None:
+            self._check_parent_is_writeable(path=path_to_symlink)
+            self._create_parent_directory(path_to_symlink=path_to_symlink)
+            self._replace_with_symlink(
+                path_to_target=path_to_target, path_to_symlink=path_to_symlink
+            )
+            logger.success("<<BOLD>>Symlink created<<RESET>>")
+            return
+
+        logger.separator()
+        existing_target = os.path.realpath(path_to_symlink)
+        if stat.S_ISLNK(mode):
+            if existing_target == os.path.realpath(path_to_target):
+                logger.success(
+                    "<<BOLD>>Required symlink already exists. Nothing to do.<<RESET>>"
+                )
+                return
+            logger.warning(
+                "<<BOLD>><<YELLOW>>Symlink already exists with a different "
+                "target!<<RESET>>"
+            )
+        elif stat.S_ISDIR(mode):
+            logger.warning(
+                "<<BOLD>><<YELLOW>>A direcotry already exists in the same "
+                "path!<<RESET>>"
+            )
+        else:
+            logger.warning(
+                "<<BOLD>><<YELLOW>>A file already exists in the same path!<<RESET>>"
+            )
+
+        # The decision of the user would be lost if the link was passed to the
+        # shell adapters after the prompt.
+        self._check_parent_is_writeable(path=path_to_symlink)
+        logger.log(
+            f"<<YELLOW>>Existing target: <<UNDERLINE>>{existing_target}<<RESET>>"
+        )
+        logger.log(
+            "<<YELLOW>>You have several options to resolve the situation:<<RESET>>"
+        )
+        logger.log(" <<YELLOW>>- <<BOLD>>[o]<<RESET>> <<YELLOW>>override<<RESET>>")
+        logger.log(" <<YELLOW>>- <<BOLD>>[b]<<RESET>> <<YELLOW>>backup<<RESET>>")
+        logger.log(" <<YELLOW>>- <<BOLD>>[s]<<RESET>> <<YELLOW>>skip<<RESET>>")
+
+        while True:
+            response = logger.user_input(
+                "<<YELLOW>>What do you want to do? <<BOLD>>[o|b|s]<<RESET>>"
+            )
+            if response == "o":
+                # Directories cannot be replaced by a symlink atomically.
+                if stat.S_ISDIR(mode):
+                    logger.info("<<YELLOW>>Removing the existing target..<<RESET>>")
+                    shutil.rmtree(path_to_symlink)
+                logger.log("<<YELLOW>>Existing symlink removed<<RESET>>")
+                logger.separator()
+                break
+            if response == "b":
+                self._backup_target(path=path_to_symlink)
+                logger.separator()
+                break
+            if response == "s":
+                logger.separator()
+                logger.success(
+                    "<<BOLD>>Skipped linking for the current target link<<RESET>>"
+                )
+                return
+
+        self._replace_with_symlink(
+            path_to_target=path_to_target, path_to_symlink=path_to_symlink
+        )
+        logger.success("<<BOLD>>Symlink created<<RESET>>")
+
+    @staticmethod
+    def _check_parent_is_writeable(path: str) -> None:
+        """
+        Checks the write access of the nearest existing parent directory of the
+        given path before anything is changed, as the 'linking.sh' library does.
+        """
+        parent = os.path.dirname(path) or os.curdir
+        while not os.path.isdir(parent):
+            parent = os.path.dirname(parent) or os.curdir
+        if not os.access(parent, os.W_OK):
+            raise PermissionError(errno.EACCES, "Permission denied", parent)
+
+    def _create_parent_directory(self, path_to_symlink: str) -> None:
+        parent = os.path.dirname(path_to_symlink)
+        self.logger.info("Creating the parent directory of the symlink..")
+        if os.path.isdir(parent):
+            self.logger.log("Directory already exists")
+            return
+        os.makedirs(parent, exist_ok=True)
+        self.logger.log("Symlink parent directory created")
+
+    def _backup_target(self, path: str) -> None:
+        backup_path = f"{path}.backup_{int(time.time())}"
+        self.logger.info("<<YELLOW>>Backing up the existing file..<<RESET>>")
+        os.replace(path, backup_path)
+        self.logger.log(
+            f" <<YELLOW>>Existing file backed up: <<UNDERLINE>>{backup_path}<<RESET>>"
+        )
+
+    def _replace_with_symlink(self, path_to_target: str, path_to_symlink: str) -> None:
+        """
+        The symlink is created with a temporary name next to its final path,
+        then it is renamed over the final path, so an existing file or symlink
+        is replaced atomically.
+        """
+        self.logger.info("Creating the symlink for the given target file..")
+        temporary_path = f"{path_to_symlink}.dm_{os.getpid()}.tmp"
+        os.symlink(path_to_target, temporary_path)
+        try:
+            os.replace(temporary_path, path_to_symlink)
+        except OSError:
+            os.unlink(temporary_path)
+            raise
+
+    def _remove_symlink(self, path_to_symlink: str) -> None:
+        logger = self.logger
+        logger.task("<<BOLD>>Removing symlink..<<RESET>>")
+        logger.log(f"Path to symlink: <<UNDERLINE>>{path_to_symlink}<<RESET>>")
+
+        if not os.path.islink(path_to_symlink):
+            logger.success("<<BOLD>>Link was already removed<<RESET>>")
+            return
+
+        self._check_parent_is_writeable(path=path_to_symlink)
+        existing_target = os.path.realpath(path_to_symlink)
+        logger.log(
+            f"<<YELLOW>>Existing target: <<UNDERLINE>>{existing_target}<<RESET>>"
+        )
+        response = logger.user_input(
+            "<<YELLOW>>Are you sure you want to remove the link? <<BOLD>>[y|N]<<RESET>>"
+        )
+        if response == "y":
+            logger.info("<<YELLOW>>Removing the existing target..<<RESET>>")
+            os.unlink(path_to_symlink)
+            logger.success("<<BOLD>>Symlink removed<<RESET>>")
+        else:
+            logger.success("<<BOLD>>Aborted by user<<RESET>>")
@@ -1,13 +1,133 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from abc import abstractmethod
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
-from dotmodules.modules.hooks.base import Hook, HookAdapterScript, HookExecutionType
+from dotmodules.modules.hooks.base import (
+    Hook,
+    HookAdapterScript,
+    HookExecutionResult,
+    HookExecutionType,
+)
+from dotmodules.modules.hooks.link_engine import (
+    HookLogger,
+    LinkEngineName,
+    NativeLinkEngine,
+)
 from dotmodules.modules.links import LinkItem
 from dotmodules.modules.path import PathManager
+from dotmodules.renderer import Colors
+from dotmodules.shell_adapter import ProcessStartedCallbackType
+
+
+def _read_no_input(prompt: str) -> str:
+    raise EOFError
+
+
+class LinkHandlingHook(Hook):
+    """
+    Common base of the link hooks. Depending on the configured link engine the
+    links are handled by the native link engine, or by the shell adapter
+    scripts. The native engine passes the links that need elevated privileges
+    to the shell adapter scripts.
+    """
+
+    links: List[LinkItem]
+
+    def execute(
+        self,
+        extra_arguments: Optional[Dict[str, str]] = None,
+        stdin: Optional[bytes] = None,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
+    ) -> HookExecutionResult:
+        if self.execution_context.link_engine != LinkEngineName.NATIVE:
+            return super().execute(
+                extra_arguments=extra_arguments,
+                stdin=stdin,
+                on_process_started=on_process_started,
+            )
+        colors = Colors()
+        return self._execute_natively(
+            colorize=lambda line: colors.colorize(string=line).colorized_string,
+            write_output=print,
+            read_input=input,
+            execute_fallback=lambda hook: hook.execute(),
+        )
+
+    def execute_streamed(
+        self,
+        on_output_line: Callable[[str], None],
+        extra_arguments: Optional[Dict[str, str]] = None,
+    ) -> HookExecutionResult:
+        if self.execution_context.link_engine != LinkEngineName.NATIVE:
+            return super().execute_streamed(
+                on_output_line=on_output_line, extra_arguments=extra_arguments
+            )
+        # There is no terminal for the streamed hooks, so the situations that
+        # need user decisions will fail.
+        return self._execute_natively(
+            colorize=Colors().decolor_string,
+            write_output=on_output_line,
+            read_input=_read_no_input,
+            execute_fallback=lambda hook: hook.execute_streamed(
+                on_output_line=on_output_line
+            ),
+        )
+
+    def _execute_natively(
+        self,
+        colorize: Callable[[str], str],
+        write_output: Callable[[str], None],
+        read_input: Callable[[str], str],
+        execute_fallback: Callable[[Hook], HookExecutionResult],
+    ) -> HookExecutionResult:
+        context = self.execution_context
+        engine = NativeLinkEngine(
+            logger=HookLogger(
+                hook_name=self.hook_name,
+                hook_priority=self.hook_priority,
+                module_name=context.module_name,
+                indent=context.indent,
+                text_wrap_limit=int(context.text_wrap_limit),
+                colorize=colorize,
+                write_output=write_output,
+                read_input=read_input,
+            )
+        )
+        status_code, privileged_links = self._run_link_engine(
+            engine=engine, path_manager=PathManager(root_path=Path(context.module_root))
+        )
+
+        if privileged_links:
+            # The fallback hook has to be executed by the shell adapter,
+            # otherwise it would be passed to the native engine again.
+            fallback_hook = self.with_links(links=privileged_links)
+            fallback_hook.execution_context = replace(
+                context, link_engine=LinkEngineName.SHELL.value
+            )
+            fallback_result = execute_fallback(fallback_hook)
+            status_code = status_code or fallback_result.status_code
+
+        return HookExecutionResult(status_code=status_code)
+
+    @abstractmethod
+    def with_links(self, links: List[LinkItem]) -> "LinkHandlingHook":
+        """
+        Returns a new hook of the same kind that handles only the given links.
+        """
+
+    @abstractmethod
+    def _run_link_engine(
+        self, engine: NativeLinkEngine, path_manager: PathManager
+    ) -> Tuple[int, List[LinkItem]]:
+        """
+        Handles the links with the given engine, and returns the status code
+        and the links that need elevated privileges.
+        """
 
 
 @dataclass
-class LinkDeploymentHook(Hook):
+class LinkDeploymentHook(LinkHandlingHook):
     """
     Hook that can deploy the given symlinks. This class is only responsible for
     starting the external shell script that will do the actual deployment.
@@ -16,7 +136,7 @@ class LinkDeploymentHook(Hook):
     # Constant values for this class.
     NAME = "DEPLOY_LINKS"
 
-    links: List["LinkItem"]
+    links: List[LinkItem]
 
     # Abstract Hook base class implementations.
     @property
@@ -51,15 +171,34 @@ class LinkDeploymentHook(Hook):
         path_manager: PathManager,
         extra_arguments: Optional[Dict[str, str]] = None,
     ) -> List[str]:
-        # Extra arguments won't be used here as all arguments will be generated
-        # from the hook itself.
-        args = []
+        # The links are passed in the argument items file.
+        return []
+
+    def get_hook_argument_items(self, path_manager: PathManager) -> Optional[List[str]]:
+        items = []
         for link in self.links:
-            # 9..11.. - path_to_target
-            args.append(str(path_manager.resolve_local_path(link.path_to_target)))
-            # 10..12.. - path_to_symlink
-            args.append(str(path_manager.resolve_absolute_path(link.path_to_symlink)))
-        return args
+            # 1..3.. - path_to_target
+            items.append(str(path_manager.resolve_local_path(link.path_to_target)))
+            # 2..4.. - path_to_symlink
+            items.append(str(path_manager.resolve_absolute_path(link.path_to_symlink)))
+        return items
+
+    # Abstract LinkHandlingHook base class implementations.
+    def with_links(self, links: List[LinkItem]) -> "LinkDeploymentHook":
+        return LinkDeploymentHook(links=links)
+
+    def _run_link_engine(
+        self, engine: NativeLinkEngine, path_manager: PathManager
+    ) -> Tuple[int, List[LinkItem]]:
+        links_by_paths = {
+            (
+                str(path_manager.resolve_local_path(link.path_to_target)),
+                str(path_manager.resolve_absolute_path(link.path_to_symlink)),
+            ): link
+            for link in self.links
+        }
+        status_code = engine.deploy(links=list(links_by_paths))
+        return status_code, [links_by_paths[key] for key in engine.privileged_links]
 
     # Abstract ErrorListProvider base class implementations.
     def report_errors(self, path_manager: PathManager) -> List[str]:
@@ -70,7 +209,7 @@ class LinkDeploymentHook(Hook):
 
 
 @dataclass
-class LinkCleanUpHook(Hook):
+class LinkCleanUpHook(LinkHandlingHook):
     """
     Hook that can clean up the given symlinks. This class is only responsible
     for starting the external shell script that will do the actual clean up.
@@ -113,13 +252,29 @@ class LinkCleanUpHook(Hook):
         path_manager: PathManager,
         extra_arguments: Optional[Dict[str, str]] = None,
     ) -> List[str]:
-        # Extra arguments won't be used here as all arguments will be generated
-        # from the hook itself.
-        args = []
+        # The links are passed in the argument items file.
+        return []
+
+    def get_hook_argument_items(self, path_manager: PathManager) -> Optional[List[str]]:
+        items = []
         for link in self.links:
-            # 9..10..11.. - path_to_symlink
-            args.append(str(path_manager.resolve_absolute_path(link.path_to_symlink)))
-        return args
+            # 1..2..3.. - path_to_symlink
+            items.append(str(path_manager.resolve_absolute_path(link.path_to_symlink)))
+        return items
+
+    # Abstract LinkHandlingHook base class implementations.
+    def with_links(self, links: List[LinkItem]) -> "LinkCleanUpHook":
+        return LinkCleanUpHook(links=links)
+
+    def _run_link_engine(
+        self, engine: NativeLinkEngine, path_manager: PathManager
+    ) -> Tuple[int, List[LinkItem]]:
+        links_by_path = {
+            str(path_manager.resolve_absolute_path(link.path_to_symlink)): link
+            for link in self.links
+        }
+        status_code = engine.clean_up(symlinks=list(links_by_path))
+        return status_code, [links_by_path[path] for path in engine.privileged_symlinks]
 
     # Abstract ErrorListProvider base class implementations.
     def report_errors(self, path_manager: PathManager) -> List[str]:
@@ -0,0 +1,203 @@
+import os
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple
+
+from dotmodules.modules.path import PathManager
+
+# Result of a checker for a single variable value: the processed flag and the
+# status string.
+CheckerResultType = Tuple[bool, str]
+AggregatedCheckerResultType = Dict[str, CheckerResultType]
+
+
+class VariableStatusCheckerName(str, Enum):
+    """
+    Built-in variable status checkers that can be selected in the configuration
+    instead of a variable status hook script:
+
+    - executable: the values are executable names that should be available on
+      the PATH.
+    - file_line: the values are lines that should be present in the file
+      passed as the checker argument.
+    - directory: the values are paths of directories that should exist.
+    - symlink: the values are paths of symbolic links that should exist.
+
+    The paths can contain the '$HOME' literal, the relative paths are resolved
+    from the module root. The directory and symlink checkers resolve the
+    relative value paths from the optional checker argument directory instead.
+    """
+
+    EXECUTABLE = "executable"
+    FILE_LINE = "file_line"
+    DIRECTORY = "directory"
+    SYMLINK = "symlink"
+
+
+@dataclass(frozen=True)
+class VariableStatusChecker:
+    """
+    In-process variable status checker. The check function gets every value at
+    once, so it can collect the necessary system state only once for all of
+    them.
+    """
+
+    name: VariableStatusCheckerName
+    argument_required: bool
+    check: Callable[[List[str], str, PathManager], AggregatedCheckerResultType]
+
+
+def _resolve_path(path: str, path_manager: PathManager) -> Path:
+    if os.path.isabs(path) or path.startswith(
+        (PathManager.HOME_LITERAL__STANDARD, PathManager.HOME_LITERAL__GUARDED)
+    ):
+        return path_manager.resolve_absolute_path(path)
+    return path_manager.resolve_local_path(path)
+
+
+def check_executables(
+    variable_values: List[str], argument: str, path_manager: PathManager
+) -> AggregatedCheckerResultType:
+    """
+    Every PATH directory is listed only once into an index of the first
+    matching path by name, the values are looked up in this index. Values
+    containing a path separator are checked directly.
+    """
+    requested_names = {value for value in variable_values if os.sep not in value}
+    index: Dict[str, str] = {}
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if not requested_names.difference(index):
+            break
+        try:
+            with os.scandir(directory or ".") as entries:
+                for entry in entries:
+                    if (
+                        entry.name in requested_names
+                        and entry.name not in index
+                        and entry.is_file()
+                        and os.access(entry.path, os.X_OK)
+                    ):
+                        index[entry.name] = entry.path
+        except OSError:
+            continue
+
+    result: AggregatedCheckerResultType = {}
+    for value in variable_values:
+        if os.sep in value:
+            path = str(_resolve_path(path=value, path_manager=path_manager))
+            executable = os.path.isfile(path) and os.access(path, os.X_OK)
+            result[value] = (executable, path if executable else "")
+        else:
+            result[value] = (value in index, index.get(value, ""))
+    return result
+
+
+def check_file_lines(
+    variable_values: List[str], argument: str, path_manager: PathManager
+) -> AggregatedCheckerResultType:
+    """
+    The file is read only once, the values are looked up in the set of its
+    lines. The leading and trailing whitespaces are ignored.
+    """
+    path = _resolve_path(path=argument, path_manager=path_manager)
+    try:
+        with open(path) as f:
+            lines: Set[str] = {line.strip() for line in f}
+    except (OSError, UnicodeDecodeError):
+        lines = set()
+    return {value: (value.strip() in lines, "") for value in variable_values}
+
+
+def _scan_parent_directories(
+    variable_values: List[str], argument: str, path_manager: PathManager
+) -> Dict[str, "os.DirEntry[str]"]:
+    """
+    Lists the parent directory of every value only once, and returns the found
+    directory entries by value.
+    """
+    if argument:
+        base_path_manager = PathManager(
+            root_path=_resolve_path(path=argument, path_manager=path_manager)
+        )
+    else:
+        base_path_manager = path_manager
+
+    values_by_parent: Dict[Path, Dict[str, str]] = {}
+    for value in variable_values:
+        path = _resolve_path(path=value, path_manager=base_path_manager)
+        values_by_parent.setdefault(path.parent, {})[path.name] = value
+
+    entries_by_value: Dict[str, "os.DirEntry[str]"] = {}
+    for parent, values_by_name in values_by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    if entry.name in values_by_name:
+                        entries_by_value[values_by_name[entry.name]] = entry
+        except OSError:
+            continue
+    return entries_by_value
+
+
+def check_directories(
+    variable_values: List[str], argument: str, path_manager: PathManager
+) -> AggregatedCheckerResultType:
+    entries = _scan_parent_directories(
+        variable_values=variable_values, argument=argument, path_manager=path_manager
+    )
+    result: AggregatedCheckerResultType = {}
+    for value in variable_values:
+        entry = entries.get(value)
+        result[value] = (entry is not None and entry.is_dir(), "")
+    return result
+
+
+def check_symlinks(
+    variable_values: List[str], argument: str, path_manager: PathManager
+) -> AggregatedCheckerResultType:
+    """
+    The status string of a present symlink is its target.
+    """
+    entries = _scan_parent_directories(
+        variable_values=variable_values, argument=argument, path_manager=path_manager
+    )
+    result: AggregatedCheckerResultType = {}
+    for value in variable_values:
+        entry = entries.get(value)
+        if entry is None or not entry.is_symlink():
+            result[value] = (False, "")
+            continue
+        try:
+            target = os.readlink(entry.path)
+        except OSError:
+            target = ""
+        result[value] = (True, target)
+    return result
+
+
+VARIABLE_STATUS_CHECKERS: Dict[str, VariableStatusChecker] = {
+    checker.name.value: checker
+    for checker in [
+        VariableStatusChecker(
+            name=VariableStatusCheckerName.EXECUTABLE,
+            argument_required=False,
+            check=check_executables,
+        ),
+        VariableStatusChecker(
+            name=VariableStatusCheckerName.FILE_LINE,
+            argument_required=True,
+            check=check_file_lines,
+        ),
+        VariableStatusChecker(
+            name=VariableStatusCheckerName.DIRECTORY,
+            argument_required=False,
+            check=check_directories,
+        ),
+        VariableStatusChecker(
+            name=VariableStatusCheckerName.SYMLINK,
+            argument_required=False,
+            check=check_symlinks,
+        ),
+    ]
+}
@@ -1,3 +1,4 @@
+import hashlib
 from dataclasses import asdict, dataclass
 from enum import Enum
 from pathlib import Path
@@ -11,18 +12,59 @@ from dotmodules.modules.hooks.base import (
     HookExecutionType,
     SerializedHookExecutionContextDict,
 )
+from dotmodules.modules.hooks.variable_status_checkers import (
+    VARIABLE_STATUS_CHECKERS,
+    AggregatedCheckerResultType,
+)
 from dotmodules.modules.path import PathManager
+from dotmodules.shell_adapter import ProcessStartedCallbackType
 
 
 class VariableStatusHookExecutionMode(str, Enum):
     PREPARE = "prepare"
     EXECUTE = "execute"
+    BATCH = "batch"
+    INVENTORY = "inventory"
+
+
+class VariableStatusHookMode(str, Enum):
+    """
+    Protocol of the variable status hook script selected in the configuration:
+
+    - single: the script is executed once for every variable value, the status
+      is reported by the exit code and the first line of the standard output.
+    - batch: the script is executed once with every variable value passed on
+      the standard input, the statuses are reported as JSON lines.
+    - inventory: the script is executed once and it lists every currently
+      present value, the statuses are calculated by set membership.
+    """
+
+    SINGLE = "single"
+    BATCH = "batch"
+    INVENTORY = "inventory"
+
+
+class VariableStatusHookDelimiter(str, Enum):
+    """
+    Delimiter of the variable values passed to a batch mode hook script.
+    """
+
+    NEWLINE = "newline"
+    NUL = "nul"
+
+    @property
+    def separator(self) -> bytes:
+        return b"\0" if self == VariableStatusHookDelimiter.NUL else b"\n"
 
 
 class SerializedVariableStatusHooksDict(TypedDict):
     path_to_script: str
     variable_name: str
     prepare_step_necessary: bool
+    mode: str
+    delimiter: str
+    checker: str
+    checker_argument: str
     execution_context: SerializedHookExecutionContextDict
 
 
@@ -30,12 +72,17 @@ class SerializedVariableStatusHooksDict(TypedDict):
 class VariableStatusHook(Hook):
     """
     Specialized hook that can provide the status about the consumed variables in
-    a variable consumer module.
+    a variable consumer module. The status is either provided by a hook script,
+    or by a built-in checker that is executed in-process.
     """
 
     path_to_script: str
     variable_name: str
     prepare_step_necessary: bool = False
+    mode: str = VariableStatusHookMode.SINGLE.value
+    delimiter: str = VariableStatusHookDelimiter.NEWLINE.value
+    checker: str = ""
+    checker_argument: str = ""
 
     # Abstract Hook base class implementations.
     @property
@@ -48,6 +95,8 @@ class VariableStatusHook(Hook):
 
     @property
     def hook_description(self) -> str:
+        if self.checker:
+            return f"Retrieves deployment statistics for variable '{self.variable_name}' through the built-in '{self.checker}' checker"
         return f"Retrieves deployment statistics for variable '{self.variable_name}' through script <<UNDERLINE>>{self.path_to_script}<<RESET>>"
 
     @property
@@ -96,8 +145,16 @@ class VariableStatusHook(Hook):
     # Abstract ErrorListProvider base class implementations.
     def report_errors(self, path_manager: PathManager) -> List[str]:
         """
-        The path to script should be relative to the module root directory.
+        The path to script should be relative to the module root directory. A
+        built-in checker cannot be combined with a script, and it should get its
+        mandatory argument.
         """
+        if self.checker:
+            return self._report_checker_errors()
+        if not self.path_to_script:
+            return [
+                f"VariableStatusHook[{self.variable_name}]: either path_to_script or checker should be defined!"
+            ]
         errors = []
         full_path = path_manager.resolve_local_path(self.path_to_script)
         if not full_path.is_file():
@@ -105,6 +162,49 @@ class VariableStatusHook(Hook):
             errors.append(message)
         return errors
 
+    def _report_checker_errors(self) -> List[str]:
+        errors = []
+        prefix = f"VariableStatusHook[{self.variable_name}]"
+        if self.path_to_script:
+            errors.append(
+                f"{prefix}: path_to_script and checker '{self.checker}' cannot be used together!"
+            )
+        checker = VARIABLE_STATUS_CHECKERS[self.checker]
+        if checker.argument_required and not self.checker_argument:
+            errors.append(
+                f"{prefix}: checker '{self.checker}' requires a checker_argument!"
+            )
+        return errors
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns a fingerprint that changes if the hook script or the hook
+        configuration was changed, i.e. the earlier reported statuses might be
+        outdated.
+        """
+        path_manager = PathManager(root_path=Path(self.execution_context.module_root))
+        script_path = path_manager.resolve_local_path(self.path_to_script)
+        script_content = b""
+        if not self.checker:
+            try:
+                script_content = script_path.read_bytes()
+            except OSError:
+                pass
+        fingerprint = hashlib.sha256()
+        for part in [
+            str(script_path).encode(),
+            self.variable_name.encode(),
+            str(self.prepare_step_necessary).encode(),
+            self.mode.encode(),
+            self.delimiter.encode(),
+            self.checker.encode(),
+            self.checker_argument.encode(),
+            script_content,
+        ]:
+            fingerprint.update(part)
+            fingerprint.update(b"\0")
+        return fingerprint.hexdigest()
+
     def serialize(self) -> SerializedVariableStatusHooksDict:
         serialized_data = asdict(self)
         return cast(SerializedVariableStatusHooksDict, serialized_data)
@@ -119,12 +219,19 @@ class VariableStatusHook(Hook):
             path_to_script=serialized_data["path_to_script"],
             variable_name=serialized_data["variable_name"],
             prepare_step_necessary=serialized_data["prepare_step_necessary"],
+            mode=serialized_data["mode"],
+            delimiter=serialized_data["delimiter"],
+            checker=serialized_data["checker"],
+            checker_argument=serialized_data["checker_argument"],
         )
         variable_status_hook.execution_context = execution_context
         return variable_status_hook
 
     def execute_prepare_step(
-        self, variable_name: str, cache_path: Path
+        self,
+        variable_name: str,
+        cache_path: Path,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
     ) -> HookExecutionResult:
         return self.execute(
             extra_arguments={
@@ -133,10 +240,15 @@ class VariableStatusHook(Hook):
                 "variable_value": "",
                 "cache_path": str(cache_path),
             },
+            on_process_started=on_process_started,
         )
 
     def execute_execute_step(
-        self, variable_name: str, variable_value: str, cache_path: Path
+        self,
+        variable_name: str,
+        variable_value: str,
+        cache_path: Path,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
     ) -> HookExecutionResult:
         return self.execute(
             extra_arguments={
@@ -145,4 +257,60 @@ class VariableStatusHook(Hook):
                 "variable_value": variable_value,
                 "cache_path": str(cache_path),
             },
+            on_process_started=on_process_started,
         )
+
+    def execute_batch_step(
+        self,
+        variable_name: str,
+        variable_values: List[str],
+        cache_path: Path,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
+    ) -> HookExecutionResult:
+        """
+        Executes the hook script once for all variable values. The values are
+        passed on the standard input, each value is closed by the configured
+        delimiter.
+        """
+        separator = VariableStatusHookDelimiter(self.delimiter).separator
+        stdin = b"".join(value.encode() + separator for value in variable_values)
+        return self.execute(
+            extra_arguments={
+                "execution_mode": VariableStatusHookExecutionMode.BATCH,
+                "variable_name": variable_name,
+                "variable_value": "",
+                "cache_path": str(cache_path),
+            },
+            stdin=stdin,
+            on_process_started=on_process_started,
+        )
+
+    def execute_inventory_step(
+        self,
+        variable_name: str,
+        cache_path: Path,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
+    ) -> HookExecutionResult:
+        """
+        Executes the hook script once to list every present value.
+        """
+        return self.execute(
+            extra_arguments={
+                "execution_mode": VariableStatusHookExecutionMode.INVENTORY,
+                "variable_name": variable_name,
+                "variable_value": "",
+                "cache_path": str(cache_path),
+            },
+            on_process_started=on_process_started,
+        )
+
+    def execute_checker(
+        self, variable_values: List[str]
+    ) -> AggregatedCheckerResultType:
+        """
+        Executes the configured built-in checker in-process for all variable
+        values at once.
+        """
+        path_manager = PathManager(root_path=Path(self.execution_context.module_root))
+        checker = VARIABLE_STATUS_CHECKERS[self.checker]
+        return checker.check(variable_values, self.checker_argument, path_manager)
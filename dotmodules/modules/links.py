@@ -1,10 +1,34 @@
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
 
 from dotmodules.modules.errors import ErrorListProvider
 from dotmodules.modules.path import PathManager
 
 
+class LinkState(str, Enum):
+    """
+    Deployment state of a link item:
+
+    - missing: there is no symlink at the symlink path,
+    - matched: the symlink points to the link target,
+    - mismatch: the symlink points to another existing file or directory,
+    - dangling: the symlink points to a non-existent path.
+    """
+
+    MISSING = "missing"
+    MATCHED = "matched"
+    MISMATCH = "mismatch"
+    DANGLING = "dangling"
+
+
+# A link is identified by its absolute symlink and target paths.
+LinkKeyType = Tuple[str, str]
+
+
 @dataclass
 class LinkItem(ErrorListProvider):
     path_to_target: str
@@ -26,6 +50,14 @@ class LinkItem(ErrorListProvider):
             and full_path_to_symlink.resolve() == full_path_to_target
         )
 
+    def get_key(self, path_manager: PathManager) -> LinkKeyType:
+        """
+        Returns the absolute symlink and target paths of the link.
+        """
+        full_path_to_symlink = path_manager.resolve_absolute_path(self.path_to_symlink)
+        full_path_to_target = path_manager.resolve_local_path(self.path_to_target)
+        return str(full_path_to_symlink), str(full_path_to_target)
+
     # Abstract ErrorListProvider base class implementations.
     def report_errors(self, path_manager: PathManager) -> List[str]:
         errors = []
@@ -37,3 +69,68 @@ class LinkItem(ErrorListProvider):
             errors.append(message)
 
         return errors
+
+
+def probe_link_state(link_key: LinkKeyType) -> LinkState:
+    """
+    Determines the state of a single link with an 'lstat' and a 'readlink'
+    call. The symlink is only resolved fully if its destination doesn't match
+    the target path literally.
+    """
+    path_to_symlink, path_to_target = link_key
+    try:
+        if not stat.S_ISLNK(os.lstat(path_to_symlink).st_mode):
+            return LinkState.MISSING
+        destination = os.readlink(path_to_symlink)
+    except OSError:
+        return LinkState.MISSING
+
+    destination = os.path.normpath(
+        os.path.join(os.path.dirname(path_to_symlink), destination)
+    )
+    if destination == os.path.normpath(path_to_target):
+        return LinkState.MATCHED
+
+    # The destination could be a relative path or it could contain other
+    # symlinks, so the fully resolved paths have to be compared too.
+    if os.path.realpath(path_to_symlink) == os.path.realpath(path_to_target):
+        return LinkState.MATCHED
+
+    if not os.path.exists(path_to_symlink):
+        return LinkState.DANGLING
+
+    return LinkState.MISMATCH
+
+
+class LinkStateIndex:
+    """
+    State table of every link across all modules. The links are probed in a
+    single pass on a thread pool, and the table stays valid until it is
+    explicitly dropped, i.e. after a link hook was executed.
+    """
+
+    # Below this number of links the thread pool overhead is not worth it.
+    PARALLEL_THRESHOLD = 32
+
+    def __init__(self, link_keys: Iterable[LinkKeyType], worker_count: int) -> None:
+        unique_link_keys = list(dict.fromkeys(link_keys))
+        if worker_count > 1 and len(unique_link_keys) >= self.PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                states = list(executor.map(probe_link_state, unique_link_keys))
+        else:
+            states = [probe_link_state(link_key) for link_key in unique_link_keys]
+        self._states: Dict[LinkKeyType, LinkState] = dict(zip(unique_link_keys, states))
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, link_key: LinkKeyType) -> LinkState:
+        """
+        Returns the state of the given link. Links that weren't part of the
+        initial probe will be probed on demand.
+        """
+        state = self._states.get(link_key)
+        if state is None:
+            state = probe_link_state(link_key)
+            self._states[link_key] = state
+        return state
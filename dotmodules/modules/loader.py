@@ -1,33 +1,159 @@
+import importlib
+import sys
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Type
-
-# TODO: After python 3.11 tomllib will be in the standard library and this
-# import should be changed to 'import tomllib'.
-# https://docs.python.org/3.11/library/tomllib.html
-import toml as tomllib
+from types import ModuleType
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 
 
 class LoaderError(Exception):
     pass
 
 
+# =============================================================================
+#  TOML BACKENDS
+# =============================================================================
+
+# The vendored toml library lives in a git submodule in the repository root.
+VENDORED_TOML_PATH = Path(__file__).resolve().parents[2] / "dependencies" / "tomllib"
+
+
+@dataclass(frozen=True)
+class TomlBackend:
+    """
+    TOML decoder backend that can decode a TOML document from a string.
+    """
+
+    name: str
+    loads: Callable[[str], Dict[str, Any]]
+
+
+def _import_stdlib_tomllib() -> ModuleType:
+    # The 'tomllib' module is part of the standard library since python 3.11.
+    # https://docs.python.org/3.11/library/tomllib.html
+    return importlib.import_module("tomllib")
+
+
+def _import_vendored_toml() -> ModuleType:
+    vendored_module_path = VENDORED_TOML_PATH / "toml"
+    if not (vendored_module_path / "__init__.py").is_file():
+        raise ImportError("vendored toml library is not checked out")
+
+    # The vendored library is imported with its own name, so it can only be
+    # used if no other 'toml' library was imported before.
+    if "toml" in sys.modules:
+        module = sys.modules["toml"]
+        module_file = getattr(module, "__file__", None) or ""
+        if Path(module_file).resolve().parent != vendored_module_path.resolve():
+            raise ImportError("a non-vendored toml library was already imported")
+        return module
+
+    sys.path.insert(0, str(VENDORED_TOML_PATH))
+    try:
+        return importlib.import_module("toml")
+    finally:
+        sys.path.remove(str(VENDORED_TOML_PATH))
+
+
+def _import_toml() -> ModuleType:
+    return importlib.import_module("toml")
+
+
+# Available backends in order of preference.
+TOML_BACKEND_IMPORTERS: List[Tuple[str, Callable[[], ModuleType]]] = [
+    ("tomllib", _import_stdlib_tomllib),
+    ("vendored-toml", _import_vendored_toml),
+    ("toml", _import_toml),
+]
+
+
+@lru_cache(maxsize=None)
+def get_toml_backend(name: str = "") -> TomlBackend:
+    """
+    Returns the TOML backend with the given name, or the fastest available
+    backend if no name was given.
+    """
+    importers = TOML_BACKEND_IMPORTERS
+    if name:
+        importers = [item for item in TOML_BACKEND_IMPORTERS if item[0] == name]
+        if not importers:
+            backend_names = ", ".join(item[0] for item in TOML_BACKEND_IMPORTERS)
+            raise LoaderError(
+                f"Unknown TOML backend '{name}', available backends: {backend_names}!"
+            )
+
+    for backend_name, importer in importers:
+        try:
+            module = importer()
+        except ImportError:
+            continue
+        return TomlBackend(name=backend_name, loads=module.loads)
+
+    if name:
+        raise LoaderError(f"TOML backend '{name}' is not available!")
+    raise LoaderError("There is no TOML backend available!")
+
+
+def get_available_toml_backends() -> List[str]:
+    """
+    Returns the names of the importable TOML backends in order of preference.
+    """
+    backend_names = []
+    for backend_name, _importer in TOML_BACKEND_IMPORTERS:
+        try:
+            get_toml_backend(name=backend_name)
+        except LoaderError:
+            continue
+        backend_names.append(backend_name)
+    return backend_names
+
+
+# =============================================================================
+#  CONFIG LOADERS
+# =============================================================================
+
+
 class ConfigLoader(ABC):
+    """
+    Base class for the config loaders. Loader subclasses register themselves
+    for the file suffixes listed in their 'SUFFIXES' class attribute, so the
+    loader selection is a single dictionary lookup.
+    """
+
+    SUFFIXES: ClassVar[Tuple[str, ...]] = ()
+
+    _registry: ClassVar[Dict[str, Type["ConfigLoader"]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for suffix in cls.SUFFIXES:
+            if suffix in ConfigLoader._registry:
+                registered_loader = ConfigLoader._registry[suffix]
+                raise LoaderError(
+                    f"Multiple loaders ({registered_loader.__name__}, {cls.__name__}) "
+                    f"were registered for suffix '{suffix}'!"
+                )
+            ConfigLoader._registry[suffix] = cls
+
     @abstractmethod
-    def __init__(self, config_file_path: Path) -> None:
+    def __init__(
+        self, config_file_path: Path, content: bytes, backend: str = ""
+    ) -> None:
         """
-        The config loader will be called with only the path to the
-        configurations file.
+        The config loader will be called with the path to the configuration
+        file and its already loaded raw content. The optional backend name can
+        be used to select a specific decoder implementation.
         """
 
-    @staticmethod
-    @abstractmethod
-    def can_load(config_file_path: Path) -> bool:
+    @classmethod
+    def can_load(cls, config_file_path: Path) -> bool:
         """
-        Should return a True value if the given loader can process the given
-        file. Based on this decision, the loader selection mechanism will
-        instantiate the appropriate loader.
+        Returns a True value if the given loader can process the given file
+        based on its suffix.
         """
+        return config_file_path.suffix in cls.SUFFIXES
 
     @abstractmethod
     def get(self, key: str) -> Any:
@@ -39,43 +165,55 @@ class ConfigLoader(ABC):
         structures: scalar values, lists or dictionaries.
         """
 
-    @classmethod
-    def get_loader_for_config_file(cls, config_file_path: Path) -> "ConfigLoader":
-        selected_loaders: List[Type["ConfigLoader"]] = []
-
-        if not config_file_path.is_file():
-            raise LoaderError(
-                f"Config file at path '{config_file_path}' does not exist!"
-            )
-
-        for loader_class in cls.__subclasses__():
-            if loader_class.can_load(config_file_path=config_file_path):
-                selected_loaders.append(loader_class)
+    @abstractmethod
+    def get_all(self) -> Dict[str, Any]:
+        """
+        Returns the whole loaded configuration as a dictionary keyed by the top
+        level keys. It makes possible to process the configuration in a single
+        pass without querying the missing keys one by one.
+        """
 
-        if len(selected_loaders) == 1:
-            loader_class = selected_loaders[0]
-            return loader_class(config_file_path=config_file_path)
-        else:
-            loaders = ", ".join([loader.__name__ for loader in selected_loaders])
-            raise LoaderError(
-                f"Multiple loaders ({loaders}) were selected for path '{config_file_path}'!"
-            )
+    @classmethod
+    def get_loader_for_config_file(
+        cls,
+        config_file_path: Path,
+        content: Optional[bytes] = None,
+        backend: str = "",
+    ) -> "ConfigLoader":
+        loader_class = cls._registry.get(config_file_path.suffix)
+        if loader_class is None:
+            raise LoaderError(f"No loader was found for path '{config_file_path}'!")
+
+        if content is None:
+            try:
+                content = config_file_path.read_bytes()
+            except OSError as e:
+                raise LoaderError(
+                    f"Config file at path '{config_file_path}' does not exist!"
+                ) from e
+
+        return loader_class(
+            config_file_path=config_file_path, content=content, backend=backend
+        )
 
 
 class TomlLoader(ConfigLoader):
-    def __init__(self, config_file_path: Path) -> None:
+    SUFFIXES = (".toml",)
+
+    def __init__(
+        self, config_file_path: Path, content: bytes, backend: str = ""
+    ) -> None:
+        toml_backend = get_toml_backend(name=backend)
         try:
-            with open(config_file_path) as f:
-                self.data: Dict[str, Any] = tomllib.load(f)
+            self.data: Dict[str, Any] = toml_backend.loads(content.decode("utf-8"))
         except Exception as e:
             raise LoaderError(f"Toml loading error: {e}") from e
 
-    @staticmethod
-    def can_load(config_file_path: Path) -> bool:
-        return str(config_file_path).endswith("toml")
-
     def get(self, key: str) -> Any:
         try:
             return self.data[key]
         except KeyError as e:
             raise LoaderError(f"Cannot retrieve key '{key}'!") from e
+
+    def get_all(self) -> Dict[str, Any]:
+        return self.data
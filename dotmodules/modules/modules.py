@@ -1,23 +1,50 @@
+import os
 import re
 import shutil
 from collections import OrderedDict, defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Iterator, List, Sequence, Union
-
-from dotmodules.modules.hooks import (Hook, LinkCleanUpHook,
-                                      LinkDeploymentHook, ShellScriptHook,
-                                      VariableStatusHook)
-from dotmodules.modules.links import LinkItem
-from dotmodules.modules.loader import ConfigLoader, LoaderError
-from dotmodules.modules.parser import (ConfigParser, LinkItemDict, ParserError,
-                                       ShellScriptHookItemDict,
-                                       VariableStatusHookItemDict)
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from dotmodules.modules.cache import ParsedConfigCache, hash_content
+from dotmodules.modules.discovery import (
+    DiscoveryIndex,
+    DiscoveryResult,
+    ModuleDiscovery,
+)
+from dotmodules.modules.errors import ErrorListProvider
+from dotmodules.modules.hooks import (
+    Hook,
+    LinkCleanUpHook,
+    LinkDeploymentHook,
+    ShellScriptHook,
+    VariableStatusHook,
+)
+from dotmodules.modules.hooks.graph import (
+    HookDependencyGraph,
+    ModuleDependenciesType,
+    collect_module_dependencies,
+)
+from dotmodules.modules.links import LinkItem, LinkState, LinkStateIndex
+from dotmodules.modules.loader import ConfigLoader, LoaderError, get_toml_backend
+from dotmodules.modules.parser import (
+    ConfigParser,
+    LinkItemDict,
+    ModuleSpec,
+    ParserError,
+    ShellScriptHookItemDict,
+    VariableStatusHookItemDict,
+)
 from dotmodules.modules.path import PathManager
-from dotmodules.modules.types import (AggregatedHooksType,
-                                      AggregatedVariableStatusHooksType,
-                                      AggregatedVariablesType)
+from dotmodules.modules.types import (
+    AggregatedHookGraphsType,
+    AggregatedHooksType,
+    AggregatedVariableStatusHooksType,
+    AggregatedVariablesType,
+)
 from dotmodules.modules.variable_status import VariableStatusManager
 from dotmodules.settings import Settings
 
@@ -52,50 +79,79 @@ class Module:
     # variable statuses.
     modules: "Modules"
 
+    # Names of the modules whose hooks should be executed before the hooks of
+    # this module.
+    depends_on: Sequence[str] = ()
+
+    # Memoized status and error values together with the modules generation
+    # they were calculated in.
+    _status_cache: Optional[Tuple[int, ModuleStatus]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _errors_cache: Optional[Tuple[int, List[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def from_path(
-        cls, path: Path, deployment_target: str, modules: "Modules"
+        cls,
+        path: Path,
+        deployment_target: str,
+        modules: "Modules",
+        config_cache: Optional[ParsedConfigCache] = None,
+        loader_backend: str = "",
     ) -> "Module":
-        module_root = path.parent.resolve()
-
-        try:
-            loader = ConfigLoader.get_loader_for_config_file(config_file_path=path)
-            parser = ConfigParser(loader=loader)
-
-            # Parse metadata
-            name = parser.parse_name()
-            version = parser.parse_version()
-            enabled = parser.parse_enabled(deployment_target=deployment_target)
-            documentation = parser.parse_documentation(
-                deployment_target=deployment_target
-            )
-
-            # Parse variables
-            variables = parser.parse_variables(deployment_target=deployment_target)
-
-            # Parse links
-            link_items = parser.parse_links(deployment_target=deployment_target)
-            links = cls._create_links(link_items=link_items)
+        module_spec = cls.parse_config_file(
+            path=path,
+            deployment_target=deployment_target,
+            config_cache=config_cache,
+            loader_backend=loader_backend,
+        )
+        return cls.from_module_spec(path=path, module_spec=module_spec, modules=modules)
 
-            # Parse shell script hooks
-            shell_script_hook_items = parser.parse_shell_script_hooks(
-                deployment_target=deployment_target
-            )
-            hooks = cls._create_shell_script_hooks(
-                shell_script_hook_items=shell_script_hook_items
+    @classmethod
+    def parse_config_file(
+        cls,
+        path: Path,
+        deployment_target: str,
+        config_cache: Optional[ParsedConfigCache] = None,
+        loader_backend: str = "",
+        content: Optional[bytes] = None,
+    ) -> ModuleSpec:
+        """
+        Loads and validates the given config file. If a config cache is passed,
+        the validated result will be served from it if the file content hasn't
+        changed since the last parse. The optional loader backend name selects
+        the decoder implementation used by the config loader. If the content of
+        the config file is passed, it will be parsed instead of reading the file.
+        """
+        content_hash = None
+        if config_cache is not None:
+            try:
+                if content is None:
+                    content = path.read_bytes()
+                content_hash = hash_content(content)
+            except OSError:
+                # The normal loading process will report the error.
+                pass
+
+        if config_cache is not None and content_hash is not None:
+            module_spec = config_cache.get(
+                config_file_path=path,
+                content_hash=content_hash,
+                deployment_target=deployment_target,
+                loader_backend=loader_backend,
             )
-            cls._validate_hooks(hooks=hooks)
-
-            if links:
-                hooks += cls._create_default_link_hooks(links=links)
+            if module_spec is not None:
+                return module_spec
 
-            # Parse variable status hooks
-            variable_status_hook_items = parser.parse_variable_status_hooks(
-                deployment_target=deployment_target
-            )
-            variable_status_hooks = cls._create_variable_status_hooks(
-                variable_status_hook_items=variable_status_hook_items
+        try:
+            loader = ConfigLoader.get_loader_for_config_file(
+                config_file_path=path, content=content, backend=loader_backend
             )
+            parser = ConfigParser(loader=loader)
+            module_spec = parser.parse_all(deployment_target=deployment_target)
+            cls._validate_hooks(shell_script_hook_items=module_spec.shell_script_hooks)
         except LoaderError as e:
             raise ModuleError(f"Configuration loading error: {e}") from e
         except ParserError as e:
@@ -105,30 +161,86 @@ class Module:
                 f"Unexpected error happened during module loading: {e}"
             ) from e
 
+        if config_cache is not None and content_hash is not None:
+            config_cache.set(
+                config_file_path=path,
+                content_hash=content_hash,
+                deployment_target=deployment_target,
+                module_spec=module_spec,
+                loader_backend=loader_backend,
+            )
+
+        return module_spec
+
+    @classmethod
+    def from_module_spec(
+        cls, path: Path, module_spec: ModuleSpec, modules: "Modules"
+    ) -> "Module":
+        module_root = path.parent.resolve()
+
+        links = cls._create_links(link_items=module_spec.links)
+        hooks = cls._create_shell_script_hooks(
+            shell_script_hook_items=module_spec.shell_script_hooks
+        )
+        if links:
+            hooks += cls._create_default_link_hooks(links=links)
+        variable_status_hooks = cls._create_variable_status_hooks(
+            variable_status_hook_items=module_spec.variable_status_hooks
+        )
+
         # Default the name to the directory name the module is in.
+        name = module_spec.name
         if not name:
             name = module_root.name
 
         # Set default value for the missing version.
+        version = module_spec.version
         if not version:
             version = "-"
 
         module = cls(
             name=name,
             version=version,
-            enabled=enabled,
-            documentation=documentation,
-            variables=variables,
+            enabled=module_spec.enabled,
+            documentation=list(module_spec.documentation),
+            variables={
+                key: list(values) for key, values in module_spec.variables.items()
+            },
             root=module_root,
             links=links,
             hooks=hooks,
             variable_status_hooks=variable_status_hooks,
             modules=modules,
+            depends_on=list(module_spec.depends_on),
         )
         return module
 
+    @classmethod
+    def report_module_spec_errors(
+        cls, path: Path, module_spec: ModuleSpec
+    ) -> List[str]:
+        """
+        Runs the error checks of every link, shell script hook and variable
+        status hook defined in the given module spec without assembling a
+        module object.
+        """
+        path_manager = PathManager(root_path=path.parent.resolve())
+        error_list_providers: List[ErrorListProvider] = [
+            *cls._create_links(link_items=module_spec.links),
+            *cls._create_shell_script_hooks(
+                shell_script_hook_items=module_spec.shell_script_hooks
+            ),
+            *cls._create_variable_status_hooks(
+                variable_status_hook_items=module_spec.variable_status_hooks
+            ),
+        ]
+        errors = []
+        for error_list_provider in error_list_providers:
+            errors += error_list_provider.report_errors(path_manager=path_manager)
+        return errors
+
     @staticmethod
-    def _create_links(link_items: List[LinkItemDict]) -> List[LinkItem]:
+    def _create_links(link_items: Sequence[LinkItemDict]) -> List[LinkItem]:
         links = []
         for link_item in link_items:
             link = LinkItem(
@@ -141,7 +253,7 @@ class Module:
 
     @staticmethod
     def _create_shell_script_hooks(
-        shell_script_hook_items: List[ShellScriptHookItemDict],
+        shell_script_hook_items: Sequence[ShellScriptHookItemDict],
     ) -> List[Union[ShellScriptHook, LinkDeploymentHook, LinkCleanUpHook]]:
         hooks: List[Union[ShellScriptHook, LinkDeploymentHook, LinkCleanUpHook]] = []
         for hook_item in shell_script_hook_items:
@@ -155,7 +267,7 @@ class Module:
 
     @staticmethod
     def _create_variable_status_hooks(
-        variable_status_hook_items: List[VariableStatusHookItemDict],
+        variable_status_hook_items: Sequence[VariableStatusHookItemDict],
     ) -> List[VariableStatusHook]:
         hooks: List[VariableStatusHook] = []
         for hook_item in variable_status_hook_items:
@@ -163,16 +275,20 @@ class Module:
                 path_to_script=hook_item["path_to_script"],
                 variable_name=hook_item["variable_name"],
                 prepare_step_necessary=hook_item["prepare_step_necessary"],
+                mode=hook_item["mode"],
+                delimiter=hook_item["delimiter"],
+                checker=hook_item["checker"],
+                checker_argument=hook_item["checker_argument"],
             )
             hooks.append(hook)
         return hooks
 
     @staticmethod
     def _validate_hooks(
-        hooks: List[Union[ShellScriptHook, LinkDeploymentHook, LinkCleanUpHook]],
+        shell_script_hook_items: Sequence[ShellScriptHookItemDict],
     ) -> None:
-        for index, _hook in enumerate(hooks, start=1):
-            hook_name = _hook.hook_name
+        for index, hook_item in enumerate(shell_script_hook_items, start=1):
+            hook_name = hook_item["name"]
             if hook_name in [LinkDeploymentHook.NAME, LinkCleanUpHook.NAME]:
                 raise ParserError(
                     f"Cannot use reserved hook name '{hook_name}' in section "
@@ -200,26 +316,60 @@ class Module:
     def is_incomplete(self) -> bool:
         return self.status == ModuleStatus.INCOMPLETE
 
+    @property
+    def link_states(self) -> List[Tuple[LinkItem, LinkState]]:
+        """
+        Returns the links of the module with their states looked up from the
+        shared link state index of the modules.
+        """
+        path_manager = PathManager(root_path=self.root)
+        link_state_index = self.modules.link_states
+        return [
+            (link, link_state_index.get(link.get_key(path_manager=path_manager)))
+            for link in self.links
+        ]
+
     @property
     def status(self) -> ModuleStatus:
+        """
+        The module status is calculated only once per modules generation. The
+        generation is read before the calculation, so a change that happens
+        during the calculation will trigger a recalculation on the next access.
+        """
+        generation = self.modules.generation
+        if self._status_cache is None or self._status_cache[0] != generation:
+            self._status_cache = (generation, self._calculate_status())
+        return self._status_cache[1]
+
+    def _calculate_status(self) -> ModuleStatus:
         if not self.enabled:
             return ModuleStatus.DISABLED
 
         if self.errors:
             return ModuleStatus.ERROR
 
-        links_state = []
-        path_manager = PathManager(root_path=self.root)
-        for link in self.links:
-            links_state.append(
-                link.check_if_link_exists(path_manager=path_manager)
-                and link.check_if_target_matched(path_manager=path_manager)
-            )
+        links_state = [
+            link_state == LinkState.MATCHED for _link, link_state in self.link_states
+        ]
 
+        variable_statuses = self.modules.variable_statuses
         variable_states = []
         for variable_name, variable_values in self.variables.items():
+            if not variable_values:
+                continue
+
+            # The module values are a subset of the aggregated values, so the
+            # aggregated status counts can decide for the uniform variables
+            # without looking up the values one by one.
+            counts = variable_statuses.get_counts(variable_name=variable_name)
+            if counts.total and counts.loading == counts.total:
+                return ModuleStatus.LOADING
+            if counts.total and counts.added == counts.total:
+                variable_states.append(True)
+                continue
+
             for variable_value in variable_values:
-                variable_status = self.modules.variable_statuses.get(
+                variable_status = variable_statuses.get(
                     variable_name=variable_name, variable_value=variable_value
                 )
 
@@ -237,6 +387,12 @@ class Module:
 
     @property
     def errors(self) -> List[str]:
+        generation = self.modules.generation
+        if self._errors_cache is None or self._errors_cache[0] != generation:
+            self._errors_cache = (generation, self._calculate_errors())
+        return list(self._errors_cache[1])
+
+    def _calculate_errors(self) -> List[str]:
         path_manager = PathManager(root_path=self.root)
         errors = []
         for link in self.links:
@@ -251,6 +407,33 @@ class Module:
         return []
 
 
+# Result of a config file parsing: either the parsed module spec or the error
+# message of the failure.
+ParseResultType = Tuple[Optional[ModuleSpec], Optional[str]]
+
+
+def parse_config_file_to_module_spec(
+    path: Path,
+    deployment_target: str,
+    loader_backend: str = "",
+    content: Optional[bytes] = None,
+) -> ParseResultType:
+    """
+    Parses the given config file into a picklable module spec. Errors are
+    returned as messages as this function could be executed in a worker process.
+    """
+    try:
+        module_spec = Module.parse_config_file(
+            path=path,
+            deployment_target=deployment_target,
+            loader_backend=loader_backend,
+            content=content,
+        )
+        return module_spec, None
+    except ModuleError as e:
+        return None, str(e)
+
+
 class Modules:
     """
     Aggregation class that contains the loaded modules. It provides an interface
@@ -260,21 +443,37 @@ class Modules:
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
+        self._generation = 0
+        self._link_state_index: Optional[LinkStateIndex] = None
         self._flush_cache()
 
         if not settings.relative_modules_path:
             # TODO: raise better errors
             raise ModuleError("missing relative modules path definition")
 
+        # Selecting the TOML backend up front, so the same backend will be used
+        # in every worker process and it can be part of the cache keys.
+        try:
+            self._loader_backend = get_toml_backend(name=settings.toml_backend).name
+        except LoaderError as e:
+            raise ModuleError(f"Configuration loading error: {e}") from e
+
         # Loading the modules from the config file paths.
-        config_file_path_list = self._collect_config_file_paths(
+        self._config_cache: Optional[ParsedConfigCache] = None
+        if settings.parsed_config_cache_enabled:
+            self._config_cache = ParsedConfigCache(
+                cache_path=settings.dm_cache_parsed_configs
+            )
+        self._discovery_result = self._collect_config_file_paths(
             modules_root_path=settings.relative_modules_path,
-            config_file_name=settings.config_file_name,
+            settings=settings,
         )
         self._module_objects = self._load_module_objects(
-            config_file_path_list=config_file_path_list,
+            config_file_path_list=self._discovery_result.config_file_paths,
             deployment_target=settings.deployment_target,
         )
+        if self._config_cache is not None:
+            self._config_cache.prune()
 
         # Aggregating the variables.
         self._aggregated_variables = self._aggregate_variables(
@@ -286,6 +485,12 @@ class Modules:
         self._aggregated_hooks = self._aggregate_hooks(
             module_objects=self._module_objects, settings=settings
         )
+        self._aggregated_hook_graphs = self._aggregate_hook_graphs(
+            aggregated_hooks=self._aggregated_hooks,
+            module_dependencies=self._collect_module_dependencies(
+                module_objects=self._module_objects
+            ),
+        )
 
         # Initializing the variable statuses subsystem.
         aggregated_variable_status_hooks = self._aggregate_variable_status_hooks(
@@ -295,12 +500,52 @@ class Modules:
             aggregated_variables=self._aggregated_variables,
             aggregated_variable_status_hooks=aggregated_variable_status_hooks,
             settings=self._settings,
+            on_change=self.invalidate,
         )
         self.variable_statuses.refresh_all()
 
     def __len__(self) -> int:
         return len(self._module_objects)
 
+    @property
+    def generation(self) -> int:
+        """
+        Counter that is increased every time the state of the modules might
+        have changed, i.e. the memoized module statuses and errors calculated
+        in an earlier generation are outdated.
+        """
+        return self._generation
+
+    def invalidate(self, link_states: bool = False) -> None:
+        """
+        Invalidates the memoized module statuses and errors. It should be
+        called after a variable status refresh task finished, a hook was
+        executed or the modules were reloaded. The link state index is only
+        dropped if requested, i.e. after a link hook was executed.
+        """
+        self._generation += 1
+        if link_states:
+            self._link_state_index = None
+
+    @property
+    def link_states(self) -> LinkStateIndex:
+        """
+        State index of every link defined in the modules. It is probed in a
+        single pass on the first access.
+        """
+        if self._link_state_index is None:
+            link_keys = []
+            for module in self._module_objects:
+                path_manager = PathManager(root_path=module.root)
+                link_keys += [
+                    link.get_key(path_manager=path_manager) for link in module.links
+                ]
+            self._link_state_index = LinkStateIndex(
+                link_keys=link_keys,
+                worker_count=self._settings.link_probe_worker_count,
+            )
+        return self._link_state_index
+
     def __getitem__(self, key: int) -> Module:
         return self._module_objects[key]
 
@@ -313,30 +558,198 @@ class Modules:
         """
         Loader method that loads all modules from the list of configuration file
         paths respecting the passed deployment target.
+
+        The configuration files are parsed first into module specs (in parallel
+        for larger module trees), then the module objects are assembled from
+        them. If there are loading errors, the error of the first failing path
+        in sorted order will be raised.
         """
-        module_objects: List[Module] = []
+        parse_results = self._parse_config_files(
+            config_file_path_list=config_file_path_list,
+            deployment_target=deployment_target,
+        )
 
-        for config_file_path in config_file_path_list:
-            try:
-                module = Module.from_path(
-                    path=config_file_path,
-                    deployment_target=deployment_target,
-                    modules=self,
-                )
-            except ModuleError as e:
+        module_objects: List[Module] = []
+        for config_file_path in sorted(parse_results.keys()):
+            module_spec, error_message = parse_results[config_file_path]
+            if module_spec is None:
                 raise ModuleError(
-                    f"Error while loading module at path '{config_file_path}': {e}"
-                ) from e
+                    f"Error while loading module at path '{config_file_path}': "
+                    f"{error_message}"
+                )
+            module = Module.from_module_spec(
+                path=config_file_path, module_spec=module_spec, modules=self
+            )
             module_objects.append(module)
 
         module_objects.sort(key=lambda m: str(m.root))
 
         return module_objects
 
+    def _parse_config_files(
+        self, config_file_path_list: List[Path], deployment_target: str
+    ) -> Dict[Path, ParseResultType]:
+        """
+        Parses the given config files. The cached results are served directly,
+        the remaining files are parsed in a process pool if there are enough of
+        them to worth the overhead, otherwise they are parsed serially.
+        """
+        results, contents, pending_paths = self._lookup_cached_configs(
+            config_file_path_list=config_file_path_list,
+            deployment_target=deployment_target,
+        )
+
+        worker_count = self._settings.module_loading_worker_count or os.cpu_count() or 1
+        parsed_in_parallel = False
+        if (
+            worker_count > 1
+            and len(pending_paths) > 1
+            and len(pending_paths) >= self._settings.module_loading_parallel_threshold
+        ):
+            try:
+                results.update(
+                    self._parse_config_files_in_process_pool(
+                        config_file_path_list=pending_paths,
+                        contents=contents,
+                        deployment_target=deployment_target,
+                        loader_backend=self._loader_backend,
+                        worker_count=worker_count,
+                    )
+                )
+                parsed_in_parallel = True
+            except (OSError, BrokenProcessPool):
+                # Process pools might not be available on every platform, the
+                # serial loading is always a valid fallback.
+                pass
+
+        if not parsed_in_parallel:
+            results.update(
+                self._parse_config_files_serially(
+                    config_file_path_list=pending_paths,
+                    contents=contents,
+                    deployment_target=deployment_target,
+                )
+            )
+
+        self._store_cached_configs(
+            results=results,
+            contents=contents,
+            deployment_target=deployment_target,
+        )
+        return results
+
+    def _lookup_cached_configs(
+        self, config_file_path_list: List[Path], deployment_target: str
+    ) -> Tuple[Dict[Path, ParseResultType], Dict[Path, bytes], List[Path]]:
+        """
+        Serves the cached parse results. Returns the served results, the
+        contents of the cache misses and the paths that have to be parsed. The
+        cache misses have to be parsed from the returned contents, so the cached
+        result will always belong to the hashed content even if the file changes
+        in the meantime.
+        """
+        results: Dict[Path, ParseResultType] = {}
+        contents: Dict[Path, bytes] = {}
+        pending_paths: List[Path] = []
+
+        for config_file_path in config_file_path_list:
+            if self._config_cache is not None:
+                try:
+                    content = config_file_path.read_bytes()
+                except OSError:
+                    pending_paths.append(config_file_path)
+                    continue
+                module_spec = self._config_cache.get(
+                    config_file_path=config_file_path,
+                    content_hash=hash_content(content),
+                    deployment_target=deployment_target,
+                    loader_backend=self._loader_backend,
+                )
+                if module_spec is not None:
+                    results[config_file_path] = (module_spec, None)
+                    continue
+                contents[config_file_path] = content
+            pending_paths.append(config_file_path)
+
+        return results, contents, pending_paths
+
+    def _parse_config_files_serially(
+        self,
+        config_file_path_list: List[Path],
+        contents: Dict[Path, bytes],
+        deployment_target: str,
+    ) -> Dict[Path, ParseResultType]:
+        results: Dict[Path, ParseResultType] = {}
+        for config_file_path in sorted(config_file_path_list):
+            result = parse_config_file_to_module_spec(
+                path=config_file_path,
+                deployment_target=deployment_target,
+                loader_backend=self._loader_backend,
+                content=contents.get(config_file_path),
+            )
+            results[config_file_path] = result
+            if result[0] is None:
+                # Serial loading can stop at the first failure, as it is the
+                # first failing path in sorted order.
+                break
+        return results
+
+    def _store_cached_configs(
+        self,
+        results: Dict[Path, ParseResultType],
+        contents: Dict[Path, bytes],
+        deployment_target: str,
+    ) -> None:
+        if self._config_cache is None:
+            return
+        for config_file_path, content in contents.items():
+            module_spec = results.get(config_file_path, (None, None))[0]
+            if module_spec is not None:
+                self._config_cache.set(
+                    config_file_path=config_file_path,
+                    content_hash=hash_content(content),
+                    deployment_target=deployment_target,
+                    module_spec=module_spec,
+                    loader_backend=self._loader_backend,
+                )
+
+    @staticmethod
+    def _parse_config_files_in_process_pool(
+        config_file_path_list: List[Path],
+        contents: Dict[Path, bytes],
+        deployment_target: str,
+        loader_backend: str,
+        worker_count: int,
+    ) -> Dict[Path, ParseResultType]:
+        worker_count = min(worker_count, len(config_file_path_list))
+        chunksize = max(1, len(config_file_path_list) // (worker_count * 4))
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            results = executor.map(
+                parse_config_file_to_module_spec,
+                config_file_path_list,
+                [deployment_target] * len(config_file_path_list),
+                [loader_backend] * len(config_file_path_list),
+                [contents.get(path) for path in config_file_path_list],
+                chunksize=chunksize,
+            )
+            return dict(zip(config_file_path_list, results))
+
     def _flush_cache(self) -> None:
+        """
+        Flushes the cache directory except the persistent cache directory that
+        should survive between the sessions.
+        """
         cache_directory = self._settings.dm_cache_root
-        shutil.rmtree(cache_directory, ignore_errors=True)
-        self._settings.dm_cache_root.mkdir(parents=True)
+        persistent_cache_directory = self._settings.dm_cache_persistent
+        if cache_directory.is_dir():
+            for path in cache_directory.iterdir():
+                if path == persistent_cache_directory:
+                    continue
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink()
+        persistent_cache_directory.mkdir(parents=True, exist_ok=True)
 
     def _populate_variables_cache(
         self, aggregated_variables: AggregatedVariablesType
@@ -401,6 +814,48 @@ class Modules:
 
         return hooks
 
+    @staticmethod
+    def _collect_module_dependencies(
+        module_objects: List[Module],
+    ) -> ModuleDependenciesType:
+        """
+        Function to collect the dependencies of the enabled modules by module
+        name. Dependencies on disabled modules are ignored, but depending on an
+        unknown module or having a dependency cycle is considered a
+        configuration error.
+        """
+        enabled_module_dependencies: Dict[str, List[str]] = {}
+        for module in module_objects:
+            if module.enabled:
+                enabled_module_dependencies.setdefault(module.name, []).extend(
+                    module.depends_on
+                )
+
+        dependencies, errors = collect_module_dependencies(
+            enabled_module_dependencies=enabled_module_dependencies,
+            module_names={module.name for module in module_objects},
+        )
+        if errors:
+            raise ModuleError(errors[0])
+        return dependencies
+
+    @staticmethod
+    def _aggregate_hook_graphs(
+        aggregated_hooks: AggregatedHooksType,
+        module_dependencies: ModuleDependenciesType,
+    ) -> AggregatedHookGraphsType:
+        """
+        Function to build a dependency graph for every aggregated hook name, so
+        the hooks can be scheduled by the module dependencies instead of the
+        global priority order.
+        """
+        return {
+            hook_name: HookDependencyGraph.build(
+                hooks=hooks, module_dependencies=module_dependencies
+            )
+            for hook_name, hooks in aggregated_hooks.items()
+        }
+
     @staticmethod
     def _aggregate_variable_status_hooks(
         module_objects: List[Module],
@@ -429,15 +884,52 @@ class Modules:
 
     @staticmethod
     def _collect_config_file_paths(
-        modules_root_path: Path, config_file_name: str
-    ) -> List[Path]:
-        config_file_paths = list(modules_root_path.rglob(config_file_name))
+        modules_root_path: Path, settings: Settings
+    ) -> DiscoveryResult:
+        config_file_name = settings.config_file_name
+        discovery = ModuleDiscovery(
+            config_file_name=config_file_name,
+            ignored_directory_names=settings.discovery_ignored_directory_names,
+            use_ignore_files=settings.discovery_use_ignore_files,
+            stop_at_module_roots=settings.discovery_stop_at_module_roots,
+            worker_count=settings.discovery_worker_count,
+        )
+
+        # The discovery index makes it possible to skip the unchanged
+        # directories. It can be bypassed by forcing a full rescan.
+        index_path = settings.dm_cache_discovery_index
+        index = None
+        if not settings.discovery_force_rescan:
+            index = DiscoveryIndex.load(
+                path=index_path, config_file_name=config_file_name
+            )
+
+        discovery_result = discovery.discover(
+            modules_root_path=modules_root_path, index=index
+        )
+        DiscoveryIndex.from_discovery_result(
+            config_file_name=config_file_name, discovery_result=discovery_result
+        ).save(path=index_path)
+
+        config_file_paths = discovery_result.config_file_paths
         if config_file_paths:
             if modules_root_path / config_file_name in config_file_paths:
                 raise ModuleError(
                     "You cannot have a config file directly in the main modules directory!"
                 )
-        return config_file_paths
+        return discovery_result
+
+    @property
+    def discovery_result(self) -> DiscoveryResult:
+        return self._discovery_result
+
+    @property
+    def config_cache(self) -> Optional[ParsedConfigCache]:
+        return self._config_cache
+
+    @property
+    def loader_backend(self) -> str:
+        return self._loader_backend
 
     @property
     def aggregated_variables(self) -> AggregatedVariablesType:
@@ -446,3 +938,7 @@ class Modules:
     @property
     def aggregated_hooks(self) -> AggregatedHooksType:
         return self._aggregated_hooks
+
+    @property
+    def aggregated_hook_graphs(self) -> AggregatedHookGraphsType:
+        return self._aggregated_hook_graphs
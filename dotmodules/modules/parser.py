@@ -1,7 +1,13 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, TypedDict, TypeVar, Union
+from typing import Any, Dict, List, Mapping, Tuple, TypedDict
 
+from dotmodules.modules.hooks.variable_status_checkers import VARIABLE_STATUS_CHECKERS
+from dotmodules.modules.hooks.variable_status_hook import (
+    VariableStatusHookDelimiter,
+    VariableStatusHookMode,
+)
 from dotmodules.modules.loader import ConfigLoader, LoaderError
+from dotmodules.modules.schema import ItemSchema, SchemaError, compile_item_schema
 
 
 class LinkItemDict(TypedDict):
@@ -20,12 +26,76 @@ class VariableStatusHookItemDict(TypedDict):
     path_to_script: str
     variable_name: str
     prepare_step_necessary: bool
+    mode: str
+    delimiter: str
+    checker: str
+    checker_argument: str
 
 
-T = TypeVar(
-    "T",
-    bound=Union[LinkItemDict, ShellScriptHookItemDict, VariableStatusHookItemDict],
-)
+class ParsedConfigDict(TypedDict):
+    name: str
+    version: str
+    enabled: bool
+    documentation: List[str]
+    variables: Dict[str, List[str]]
+    links: List[LinkItemDict]
+    shell_script_hooks: List[ShellScriptHookItemDict]
+    variable_status_hooks: List[VariableStatusHookItemDict]
+    depends_on: List[str]
+
+
+@dataclass(frozen=True)
+class ModuleSpec:
+    """
+    Immutable, fully validated representation of a module configuration file
+    for a given deployment target. The deployment target specific sections are
+    already merged into the global ones.
+    """
+
+    name: str
+    version: str
+    enabled: bool
+    documentation: Tuple[str, ...]
+    variables: Mapping[str, Tuple[str, ...]]
+    links: Tuple[LinkItemDict, ...]
+    shell_script_hooks: Tuple[ShellScriptHookItemDict, ...]
+    variable_status_hooks: Tuple[VariableStatusHookItemDict, ...]
+    depends_on: Tuple[str, ...] = ()
+
+    def to_dict(self) -> ParsedConfigDict:
+        """
+        Returns the JSON serializable representation of the module spec.
+        """
+        return ParsedConfigDict(
+            name=self.name,
+            version=self.version,
+            enabled=self.enabled,
+            documentation=list(self.documentation),
+            variables={key: list(values) for key, values in self.variables.items()},
+            links=[LinkItemDict(**item) for item in self.links],
+            shell_script_hooks=[
+                ShellScriptHookItemDict(**item) for item in self.shell_script_hooks
+            ],
+            variable_status_hooks=[
+                VariableStatusHookItemDict(**item)
+                for item in self.variable_status_hooks
+            ],
+            depends_on=list(self.depends_on),
+        )
+
+    @classmethod
+    def from_dict(cls, data: ParsedConfigDict) -> "ModuleSpec":
+        return cls(
+            name=data["name"],
+            version=data["version"],
+            enabled=data["enabled"],
+            documentation=tuple(data["documentation"]),
+            variables={key: tuple(values) for key, values in data["variables"].items()},
+            links=tuple(data["links"]),
+            shell_script_hooks=tuple(data["shell_script_hooks"]),
+            variable_status_hooks=tuple(data["variable_status_hooks"]),
+            depends_on=tuple(data["depends_on"]),
+        )
 
 
 class ParserError(Exception):
@@ -42,6 +112,7 @@ KEY__VARIABLES = "variables"
 KEY__LINKS = "link"
 KEY__SHELL_SCRIPT_HOOKS = "shell_script_hook"
 KEY__VARIABLE_STATUS_HOOKS = "variable_status_hook"
+KEY__DEPENDS_ON = "depends_on"
 
 TEMPLATE__DOCUMENTATION = f"{KEY__DOCUMENTATION}__{{deployment_target}}"
 TEMPLATE__VARIABLES = f"{KEY__VARIABLES}__{{deployment_target}}"
@@ -49,6 +120,42 @@ TEMPLATE__LINKS = f"{KEY__LINKS}__{{deployment_target}}"
 TEMPLATE__SHELL_SCRIPT_HOOKS = f"{KEY__SHELL_SCRIPT_HOOKS}__{{deployment_target}}"
 TEMPLATE__VARIABLE_STATUS_HOOKS = f"{KEY__VARIABLE_STATUS_HOOKS}__{{deployment_target}}"
 
+# Separator between a section name and the deployment target in the deployment
+# target specific section names.
+DEPLOYMENT_TARGET_SEPARATOR = "__"
+
+GLOBAL_SECTION_KEYS = (
+    KEY__NAME,
+    KEY__VERSION,
+    KEY__ENABLED,
+    KEY__DOCUMENTATION,
+    KEY__VARIABLES,
+    KEY__LINKS,
+    KEY__SHELL_SCRIPT_HOOKS,
+    KEY__VARIABLE_STATUS_HOOKS,
+    KEY__DEPENDS_ON,
+)
+
+DEPLOYMENT_TARGET_SECTION_KEYS = (
+    KEY__DOCUMENTATION,
+    KEY__VARIABLES,
+    KEY__LINKS,
+    KEY__SHELL_SCRIPT_HOOKS,
+    KEY__VARIABLE_STATUS_HOOKS,
+)
+
+
+class _Missing:
+    """
+    Marker for a section that is not present in the loaded configuration.
+    """
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
 # NOTE: In the following definitions the type of the values will
 # determine the expected value type.
 EXPECTED_LINK_ITEM: LinkItemDict = {
@@ -63,12 +170,36 @@ EXPECTED_SHELL_SCRIPT_HOOK_ITEM: ShellScriptHookItemDict = {
     "priority": 0,
 }
 
-EXPECTED_VARIABLE_STATUS_HOOK_ITEM: VariableStatusHookItemDict = {
-    "path_to_script": "string",
+EXPECTED_VARIABLE_STATUS_HOOK_ITEM: Dict[str, Any] = {
     "variable_name": "string",
     "prepare_step_necessary": False,
 }
 
+# Optional fields with their default values.
+OPTIONAL_VARIABLE_STATUS_HOOK_FIELDS: Dict[str, Any] = {
+    # Either a hook script or a built-in checker should be selected.
+    "path_to_script": "",
+    "checker": "",
+    "checker_argument": "",
+    "mode": VariableStatusHookMode.SINGLE.value,
+    "delimiter": VariableStatusHookDelimiter.NEWLINE.value,
+}
+
+# The item validators are compiled once at import time.
+LINK_ITEM_SCHEMA = compile_item_schema(EXPECTED_LINK_ITEM)
+SHELL_SCRIPT_HOOK_ITEM_SCHEMA = compile_item_schema(EXPECTED_SHELL_SCRIPT_HOOK_ITEM)
+VARIABLE_STATUS_HOOK_ITEM_SCHEMA = compile_item_schema(
+    EXPECTED_VARIABLE_STATUS_HOOK_ITEM,
+    optional_fields=OPTIONAL_VARIABLE_STATUS_HOOK_FIELDS,
+    choices={
+        "mode": tuple(mode.value for mode in VariableStatusHookMode),
+        "delimiter": tuple(
+            delimiter.value for delimiter in VariableStatusHookDelimiter
+        ),
+        "checker": ("", *VARIABLE_STATUS_CHECKERS),
+    },
+)
+
 
 @dataclass
 class ConfigParser:
@@ -79,6 +210,104 @@ class ConfigParser:
 
     loader: ConfigLoader
 
+    def parse_all(self, deployment_target: str) -> ModuleSpec:
+        """
+        Parses and validates every section in a single pass over the loaded
+        document. Each top level key is routed to its section once, so missing
+        sections don't have to be signaled by loader errors. The sections are
+        validated in the same order as the individual parse methods would do,
+        so the first reported error is the same.
+        """
+        sections = self._route_sections(deployment_target=deployment_target)
+        global_sections, deployment_target_sections = sections
+
+        def section(key: str) -> Any:
+            return global_sections.get(key, MISSING)
+
+        def targeted_section(key: str) -> Any:
+            return deployment_target_sections.get(key, MISSING)
+
+        name = self._validate_string(key=KEY__NAME, value=section(KEY__NAME))
+        version = self._validate_string(key=KEY__VERSION, value=section(KEY__VERSION))
+        enabled = self._validate_enabled(
+            value=section(KEY__ENABLED), deployment_target=deployment_target
+        )
+        documentation = self._merge_documentation(
+            value=section(KEY__DOCUMENTATION),
+            deployment_target_value=targeted_section(KEY__DOCUMENTATION),
+            deployment_target=deployment_target,
+        )
+        variables = self._merge_variables(
+            value=section(KEY__VARIABLES),
+            deployment_target_value=targeted_section(KEY__VARIABLES),
+            deployment_target=deployment_target,
+        )
+        links = self._merge_links(
+            value=section(KEY__LINKS),
+            deployment_target_value=targeted_section(KEY__LINKS),
+            deployment_target=deployment_target,
+        )
+        shell_script_hooks = self._merge_hooks(
+            value=section(KEY__SHELL_SCRIPT_HOOKS),
+            deployment_target_value=targeted_section(KEY__SHELL_SCRIPT_HOOKS),
+            deployment_target=deployment_target,
+            key=KEY__SHELL_SCRIPT_HOOKS,
+            template=TEMPLATE__SHELL_SCRIPT_HOOKS,
+            schema=SHELL_SCRIPT_HOOK_ITEM_SCHEMA,
+        )
+        variable_status_hooks = self._merge_hooks(
+            value=section(KEY__VARIABLE_STATUS_HOOKS),
+            deployment_target_value=targeted_section(KEY__VARIABLE_STATUS_HOOKS),
+            deployment_target=deployment_target,
+            key=KEY__VARIABLE_STATUS_HOOKS,
+            template=TEMPLATE__VARIABLE_STATUS_HOOKS,
+            schema=VARIABLE_STATUS_HOOK_ITEM_SCHEMA,
+        )
+        depends_on = self._validate_depends_on(value=section(KEY__DEPENDS_ON))
+
+        return ModuleSpec(
+            name=name,
+            version=version,
+            enabled=enabled,
+            documentation=tuple(documentation),
+            variables={key: tuple(values) for key, values in variables.items()},
+            links=tuple(links),
+            shell_script_hooks=tuple(shell_script_hooks),
+            variable_status_hooks=tuple(variable_status_hooks),
+            depends_on=tuple(depends_on),
+        )
+
+    def _route_sections(
+        self, deployment_target: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Sorts the top level keys of the loaded document into the global and
+        the current deployment target specific sections. Sections of other
+        deployment targets and unknown keys are ignored.
+        """
+        global_sections: Dict[str, Any] = {}
+        deployment_target_sections: Dict[str, Any] = {}
+        for key, value in self.loader.get_all().items():
+            if key in GLOBAL_SECTION_KEYS:
+                global_sections[key] = value
+                continue
+            if not deployment_target:
+                continue
+            section_key, separator, target = key.partition(DEPLOYMENT_TARGET_SEPARATOR)
+            if (
+                separator
+                and target == deployment_target
+                and section_key in DEPLOYMENT_TARGET_SECTION_KEYS
+            ):
+                deployment_target_sections[section_key] = value
+        return global_sections, deployment_target_sections
+
+    def _get_section(self, key: str) -> Any:
+        try:
+            return self.loader.get(key=key)
+        except LoaderError:
+            return MISSING
+
     def parse_name(self) -> str:
         return self._parse_string(key=KEY__NAME, mandatory=False)
 
@@ -86,6 +315,12 @@ class ConfigParser:
         return self._parse_string(key=KEY__VERSION, mandatory=False)
 
     def parse_enabled(self, deployment_target: str) -> bool:
+        return self._validate_enabled(
+            value=self._get_section(key=KEY__ENABLED),
+            deployment_target=deployment_target,
+        )
+
+    def _validate_enabled(self, value: Any, deployment_target: str) -> bool:
         # TODO: update description.
         """
         A module can be enabled globally or for different deployment targets
@@ -101,9 +336,7 @@ class ConfigParser:
         considered as a syntax error.
         """
         key = KEY__ENABLED
-        try:
-            value = self.loader.get(key=key)
-        except LoaderError as e:
+        if value is MISSING:
             # raise ParserError(f"Mandatory section '{key}' is missing!") from e
             # TODO: this is a shortcut that needs to be resolved later on.
             return True
@@ -136,11 +369,26 @@ class ConfigParser:
         return value
 
     def parse_documentation(self, deployment_target: str) -> List[str]:
-        docs = self._parse_string(key=KEY__DOCUMENTATION, mandatory=False).splitlines()
+        deployment_target_value = MISSING
+        if deployment_target:
+            key = TEMPLATE__DOCUMENTATION.format(deployment_target=deployment_target)
+            deployment_target_value = self._get_section(key=key)
+        return self._merge_documentation(
+            value=self._get_section(key=KEY__DOCUMENTATION),
+            deployment_target_value=deployment_target_value,
+            deployment_target=deployment_target,
+        )
+
+    def _merge_documentation(
+        self, value: Any, deployment_target_value: Any, deployment_target: str
+    ) -> List[str]:
+        docs = self._validate_string(key=KEY__DOCUMENTATION, value=value).splitlines()
 
         if deployment_target:
             key = TEMPLATE__DOCUMENTATION.format(deployment_target=deployment_target)
-            targeted_docs = self._parse_string(key=key, mandatory=False).splitlines()
+            targeted_docs = self._validate_string(
+                key=key, value=deployment_target_value
+            ).splitlines()
             if targeted_docs:
                 # Adding an extra empty line if there are already documentation lines.
                 if docs:
@@ -150,12 +398,28 @@ class ConfigParser:
         return docs
 
     def parse_variables(self, deployment_target: str) -> Dict[str, List[str]]:
-        raw_variables = self._load_global_variables()
+        deployment_target_value = MISSING
+        if deployment_target:
+            deployment_target_value = self._load_deployment_target_variables(
+                deployment_target=deployment_target
+            )
+        return self._merge_variables(
+            value=self._load_global_variables(),
+            deployment_target_value=deployment_target_value,
+            deployment_target=deployment_target,
+        )
+
+    def _merge_variables(
+        self, value: Any, deployment_target_value: Any, deployment_target: str
+    ) -> Dict[str, List[str]]:
+        # Variables are optional, a missing key would result an empty
+        # dictionary.
+        raw_variables = {} if value is MISSING else value
         variables = self._validate_variables(variables=raw_variables)
 
         if deployment_target:
-            raw_variables = self._load_deployment_target_variables(
-                deployment_target=deployment_target
+            raw_variables = (
+                {} if deployment_target_value is MISSING else deployment_target_value
             )
             deployment_target_variables = self._validate_variables(
                 variables=raw_variables
@@ -207,46 +471,53 @@ class ConfigParser:
         for key, value in variables.items():
             if isinstance(value, str):
                 validated_variables[key] = [value]
-            elif isinstance(value, list):
-                if all(
-                    [
-                        isinstance(item, str)
-                        for item_list in variables.values()
-                        for item in item_list
-                    ]
-                ):
-                    validated_variables[key] = value
-                else:
-                    raise ParserError(error_message)
+            elif isinstance(value, list) and all(
+                isinstance(item, str) for item in value
+            ):
+                validated_variables[key] = value
             else:
                 raise ParserError(error_message)
 
         return validated_variables
 
     def parse_links(self, deployment_target: str) -> List[LinkItemDict]:
-        links = self._parse_item_list(
+        deployment_target_value = MISSING
+        if deployment_target:
+            key = TEMPLATE__LINKS.format(deployment_target=deployment_target)
+            deployment_target_value = self._get_section(key=key)
+        return self._merge_links(
+            value=self._get_section(key=KEY__LINKS),
+            deployment_target_value=deployment_target_value,
+            deployment_target=deployment_target,
+        )
+
+    def _merge_links(
+        self, value: Any, deployment_target_value: Any, deployment_target: str
+    ) -> List[LinkItemDict]:
+        links = self._validate_item_list(
             key=KEY__LINKS,
-            expected_item=EXPECTED_LINK_ITEM,
+            raw_items=value,
+            schema=LINK_ITEM_SCHEMA,
         )
 
         if deployment_target:
             key = TEMPLATE__LINKS.format(deployment_target=deployment_target)
-            deployment_target_links = self._parse_item_list(
+            deployment_target_links = self._validate_item_list(
                 key=key,
-                expected_item=EXPECTED_LINK_ITEM,
+                raw_items=deployment_target_value,
+                schema=LINK_ITEM_SCHEMA,
             )
 
-            for deployment_target_link in deployment_target_links:
-                if deployment_target_link in links:
-                    deployment_target_link_section = TEMPLATE__LINKS.format(
-                        deployment_target=deployment_target
-                    )
-                    raise ParserError(
-                        "Deployment target specific link section "
-                        f"'{deployment_target_link_section}' contains an already "
-                        "defined link item!"
-                    )
-
+            self._assert_no_duplicated_items(
+                schema=LINK_ITEM_SCHEMA,
+                items=links,
+                deployment_target_items=deployment_target_links,
+                error_message=(
+                    "Deployment target specific link section "
+                    f"'{key}' contains an already "
+                    "defined link item!"
+                ),
+            )
             links += deployment_target_links
 
         return links
@@ -254,80 +525,113 @@ class ConfigParser:
     def parse_shell_script_hooks(
         self, deployment_target: str
     ) -> List[ShellScriptHookItemDict]:
-        hooks = self._parse_item_list(
+        return self._parse_hooks(
+            deployment_target=deployment_target,
             key=KEY__SHELL_SCRIPT_HOOKS,
-            expected_item=EXPECTED_SHELL_SCRIPT_HOOK_ITEM,
+            template=TEMPLATE__SHELL_SCRIPT_HOOKS,
+            schema=SHELL_SCRIPT_HOOK_ITEM_SCHEMA,
         )
 
-        if deployment_target:
-            key = TEMPLATE__SHELL_SCRIPT_HOOKS.format(
-                deployment_target=deployment_target
-            )
-            deployment_target_hooks = self._parse_item_list(
-                key=key,
-                expected_item=EXPECTED_SHELL_SCRIPT_HOOK_ITEM,
-            )
-
-            for deployment_target_hook in deployment_target_hooks:
-                if deployment_target_hook in hooks:
-                    deployment_target_hook_section = (
-                        TEMPLATE__SHELL_SCRIPT_HOOKS.format(
-                            deployment_target=deployment_target
-                        )
-                    )
-                    raise ParserError(
-                        "Deployment target specific hook section "
-                        f"'{deployment_target_hook_section}' contains an already "
-                        "defined hook item!"
-                    )
-
-            hooks += deployment_target_hooks
-
-        return hooks
-
     def parse_variable_status_hooks(
         self, deployment_target: str
     ) -> List[VariableStatusHookItemDict]:
-        hooks = self._parse_item_list(
+        return self._parse_hooks(
+            deployment_target=deployment_target,
             key=KEY__VARIABLE_STATUS_HOOKS,
-            expected_item=EXPECTED_VARIABLE_STATUS_HOOK_ITEM,
+            template=TEMPLATE__VARIABLE_STATUS_HOOKS,
+            schema=VARIABLE_STATUS_HOOK_ITEM_SCHEMA,
         )
 
+    def _parse_hooks(
+        self, deployment_target: str, key: str, template: str, schema: ItemSchema
+    ) -> List[Any]:
+        deployment_target_value = MISSING
         if deployment_target:
-            key = TEMPLATE__VARIABLE_STATUS_HOOKS.format(
-                deployment_target=deployment_target
-            )
-            deployment_target_hooks = self._parse_item_list(
-                key=key,
-                expected_item=EXPECTED_VARIABLE_STATUS_HOOK_ITEM,
+            deployment_target_value = self._get_section(
+                key=template.format(deployment_target=deployment_target)
             )
+        return self._merge_hooks(
+            value=self._get_section(key=key),
+            deployment_target_value=deployment_target_value,
+            deployment_target=deployment_target,
+            key=key,
+            template=template,
+            schema=schema,
+        )
 
-            for deployment_target_hook in deployment_target_hooks:
-                if deployment_target_hook in hooks:
-                    deployment_target_hook_section = (
-                        TEMPLATE__VARIABLE_STATUS_HOOKS.format(
-                            deployment_target=deployment_target
-                        )
-                    )
-                    raise ParserError(
-                        "Deployment target specific hook section "
-                        f"'{deployment_target_hook_section}' contains an already "
-                        "defined hook item!"
-                    )
+    def _merge_hooks(
+        self,
+        value: Any,
+        deployment_target_value: Any,
+        deployment_target: str,
+        key: str,
+        template: str,
+        schema: ItemSchema,
+    ) -> List[Any]:
+        hooks = self._validate_item_list(
+            key=key,
+            raw_items=value,
+            schema=schema,
+        )
 
+        if deployment_target:
+            deployment_target_key = template.format(deployment_target=deployment_target)
+            deployment_target_hooks = self._validate_item_list(
+                key=deployment_target_key,
+                raw_items=deployment_target_value,
+                schema=schema,
+            )
+
+            self._assert_no_duplicated_items(
+                schema=schema,
+                items=hooks,
+                deployment_target_items=deployment_target_hooks,
+                error_message=(
+                    "Deployment target specific hook section "
+                    f"'{deployment_target_key}' contains an already "
+                    "defined hook item!"
+                ),
+            )
             hooks += deployment_target_hooks
 
         return hooks
 
+    def parse_depends_on(self) -> List[str]:
+        return self._validate_depends_on(value=self._get_section(key=KEY__DEPENDS_ON))
+
+    def _validate_depends_on(self, value: Any) -> List[str]:
+        """
+        The names of the modules whose hooks should be executed before the hooks
+        of this module. It can only be defined globally.
+        """
+        key = KEY__DEPENDS_ON
+        if value is MISSING or value is None:
+            return []
+
+        if not isinstance(value, list) or not all(
+            isinstance(item, str) and item for item in value
+        ):
+            raise ParserError(
+                f"The value for section '{key}' should be a list of module names!"
+            )
+
+        if len(set(value)) != len(value):
+            raise ParserError(f"Section '{key}' contains duplicated module names!")
+
+        return value
+
     def _parse_string(self, key: str, mandatory: bool = True) -> str:
         # TODO: there whould be any mandatory field, so the mandatory flag will
         # be unnecessary.. Remove it!
-        try:
-            value = self.loader.get(key=key)
-        except LoaderError as e:
+        return self._validate_string(
+            key=key, value=self._get_section(key=key), mandatory=mandatory
+        )
+
+    def _validate_string(self, key: str, value: Any, mandatory: bool = False) -> str:
+        if value is MISSING:
             if not mandatory:
                 return ""
-            raise ParserError(f"Mandatory '{key}' section is missing!") from e
+            raise ParserError(f"Mandatory '{key}' section is missing!")
 
         if not value:
             if not mandatory:
@@ -344,76 +648,40 @@ class ConfigParser:
     def _parse_item_list(
         self,
         key: str,
-        expected_item: T,
-    ) -> List[T]:
-        try:
-            raw_items = self.loader.get(key=key)
-        except LoaderError:
-            return []
+        schema: ItemSchema,
+    ) -> List[Any]:
+        return self._validate_item_list(
+            key=key, raw_items=self._get_section(key=key), schema=schema
+        )
 
-        if not raw_items:
+    def _validate_item_list(
+        self,
+        key: str,
+        raw_items: Any,
+        schema: ItemSchema,
+    ) -> List[Any]:
+        if raw_items is MISSING:
             return []
+        try:
+            return schema.validate(key, raw_items)
+        except SchemaError as e:
+            raise ParserError(str(e)) from e
 
-        self._assert_raw_items_type(key=key, raw_items=raw_items)
-
-        items = []
-        for index, raw_item in enumerate(raw_items, start=1):
-            self._assert_for_mandatory_keys(
-                key=key, expected_item=expected_item, index=index, raw_item=raw_item
-            )
-            self._assert_no_additional_keys(
-                key=key, expected_item=expected_item, index=index, raw_item=raw_item
-            )
-            self._assert_value_types(
-                key=key, expected_item=expected_item, index=index, raw_item=raw_item
-            )
-            items.append(raw_item)
-        return items
-
-    def _assert_value_types(
-        self, key: str, expected_item: T, index: int, raw_item: Any
-    ) -> None:
-        for value_key, value in expected_item.items():
-            if not isinstance(raw_item[value_key], type(value)):
-                raise ParserError(
-                    f"The value for field '{value_key}' should be an {type(value).__name__} in section '{key}' item at index {index}!"
-                )
-
-    def _assert_no_additional_keys(
-        self, key: str, expected_item: T, index: int, raw_item: Any
-    ) -> None:
-        additional_keys = list(
-            set(raw_item.keys()).difference(set(expected_item.keys()))
-        )
-        if len(additional_keys) == 1:
-            raise ParserError(
-                f"Unexpected field '{additional_keys[0]}' found for section '{key}' item at index {index}!"
-            )
-        if len(additional_keys) > 1:
-            formatted_keys = ", ".join([f"'{key}'" for key in sorted(additional_keys)])
-            raise ParserError(
-                f"Unexpected fields {formatted_keys} found for section '{key}' item at index {index}!"
-            )
-
-    def _assert_for_mandatory_keys(
-        self, key: str, expected_item: T, index: int, raw_item: Any
+    def _assert_no_duplicated_items(
+        self,
+        schema: ItemSchema,
+        items: List[Any],
+        deployment_target_items: List[Any],
+        error_message: str,
     ) -> None:
         """
-        Assert if every mandatory key exists.
+        Asserts that none of the deployment target specific items were defined
+        in the global section. The items are compared by their hashed keys, so
+        the check is linear in the number of items.
         """
-        for mandatory_key in expected_item.keys():
-            if mandatory_key not in raw_item:
-                raise ParserError(
-                    f"Missing mandatory field '{mandatory_key}' from section '{key}' item at index {index}!"
-                )
-
-    def _assert_raw_items_type(self, key: str, raw_items: Any) -> None:
-        if not isinstance(raw_items, list):
-            raise ParserError(
-                f"Invalid value for '{key}'! It should contain a list of objects!"
-            )
-        else:
-            if not all([isinstance(item, dict) for item in raw_items]):
-                raise ParserError(
-                    f"Invalid value for '{key}'! It should contain a list of objects!"
-                )
+        if not items or not deployment_target_items:
+            return
+        item_keys = {schema.get_item_key(item) for item in items}
+        for deployment_target_item in deployment_target_items:
+            if schema.get_item_key(deployment_target_item) in item_keys:
+                raise ParserError(error_message)
@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+# Validated item list getting a section name and the raw items.
+ItemListValidatorType = Callable[[str, Any], List[Dict[str, Any]]]
+
+
+class SchemaError(Exception):
+    """
+    Error raised by the compiled validators on an invalid item list.
+    """
+
+
+@dataclass(frozen=True)
+class ItemSchema:
+    """
+    Compiled form of an expected item definition. The field names, the field
+    set and the expected types are calculated only once, so the generated
+    validator function doesn't have to rebuild them for every item.
+    """
+
+    field_names: Tuple[str, ...]
+    field_set: FrozenSet[str]
+    field_types: Tuple[Tuple[str, type], ...]
+    field_choices: Tuple[Tuple[str, Tuple[Any, ...]], ...]
+    validate: ItemListValidatorType
+
+    def is_valid_item(self, item: Any) -> bool:
+        """
+        Returns a True value if the given item matches the schema exactly. It
+        is intended for the cheap verification of already validated items.
+        """
+        if not isinstance(item, dict) or item.keys() != self.field_set:
+            return False
+        for field_name, field_type in self.field_types:
+            if not isinstance(item[field_name], field_type):
+                return False
+        for field_name, choices in self.field_choices:
+            if item[field_name] not in choices:
+                return False
+        return True
+
+    def get_item_key(self, item: Mapping[str, Any]) -> Tuple[Hashable, ...]:
+        """
+        Returns a hashable key for an already validated item. Two items have the
+        same key if and only if they are equal.
+        """
+        return tuple(item[field_name] for field_name in self.field_names)
+
+
+def _report_invalid_item(
+    key: str,
+    index: int,
+    raw_item: Dict[str, Any],
+    item: Dict[str, Any],
+    field_names: Tuple[str, ...],
+    field_set: FrozenSet[str],
+    field_types: Tuple[Tuple[str, type], ...],
+    field_choices: Tuple[Tuple[str, Tuple[Any, ...]], ...],
+) -> None:
+    for field_name in field_names:
+        if field_name not in item:
+            raise SchemaError(
+                f"Missing mandatory field '{field_name}' from section '{key}' item at index {index}!"
+            )
+
+    additional_keys = sorted(set(raw_item.keys()).difference(field_set))
+    if len(additional_keys) == 1:
+        raise SchemaError(
+            f"Unexpected field '{additional_keys[0]}' found for section '{key}' item at index {index}!"
+        )
+    if len(additional_keys) > 1:
+        formatted_keys = ", ".join([f"'{key}'" for key in additional_keys])
+        raise SchemaError(
+            f"Unexpected fields {formatted_keys} found for section '{key}' item at index {index}!"
+        )
+
+    for field_name, field_type in field_types:
+        if not isinstance(item[field_name], field_type):
+            raise SchemaError(
+                f"The value for field '{field_name}' should be an {field_type.__name__} in section '{key}' item at index {index}!"
+            )
+
+    for field_name, choices in field_choices:
+        if item[field_name] not in choices:
+            formatted_choices = ", ".join([f"'{choice}'" for choice in choices])
+            raise SchemaError(
+                f"The value for field '{field_name}' should be one of {formatted_choices} in section '{key}' item at index {index}!"
+            )
+
+
+def compile_item_schema(
+    expected_item: Mapping[str, Any],
+    optional_fields: Optional[Mapping[str, Any]] = None,
+    choices: Optional[Mapping[str, Tuple[Any, ...]]] = None,
+) -> ItemSchema:
+    """
+    Compiles the given expected item definition into a specialized item list
+    validator. The type of the values in the expected item definition will
+    determine the expected value types. The optional fields are defined with
+    their default values, the validated items will always contain them. The
+    allowed values of a field can be restricted with the choices mapping. The
+    generated validator reports the errors in the following order:
+
+    1. the raw items should be a list of objects,
+    2. every mandatory field should be present,
+    3. there should be no additional fields,
+    4. every field should have the expected type,
+    5. every restricted field should have an allowed value.
+    """
+    defaults = dict(optional_fields or {})
+    mandatory_field_names = tuple(expected_item.keys())
+    field_names = mandatory_field_names + tuple(defaults.keys())
+    field_set = frozenset(field_names)
+    field_types = tuple(
+        (name, type(value))
+        for name, value in [*expected_item.items(), *defaults.items()]
+    )
+    field_choices = tuple((choices or {}).items())
+
+    def validate(key: str, raw_items: Any) -> List[Dict[str, Any]]:
+        if not raw_items:
+            return []
+
+        if not isinstance(raw_items, list) or not all(
+            isinstance(raw_item, dict) for raw_item in raw_items
+        ):
+            raise SchemaError(
+                f"Invalid value for '{key}'! It should contain a list of objects!"
+            )
+
+        items = []
+        for index, raw_item in enumerate(raw_items, start=1):
+            item = {**defaults, **raw_item} if defaults else raw_item
+            # Fast path: a valid item has exactly the expected fields with the
+            # expected types. The exact error is only searched for if this
+            # check fails.
+            if (
+                item.keys() == field_set
+                and all(
+                    isinstance(item[field_name], field_type)
+                    for field_name, field_type in field_types
+                )
+                and all(
+                    item[field_name] in field_choice_values
+                    for field_name, field_choice_values in field_choices
+                )
+            ):
+                items.append(item)
+                continue
+            _report_invalid_item(
+                key=key,
+                index=index,
+                raw_item=raw_item,
+                item=item,
+                field_names=mandatory_field_names,
+                field_set=field_set,
+                field_types=field_types,
+                field_choices=field_choices,
+            )
+
+        return items
+
+    return ItemSchema(
+        field_names=field_names,
+        field_set=field_set,
+        field_types=field_types,
+        field_choices=field_choices,
+        validate=validate,
+    )
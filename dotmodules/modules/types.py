@@ -2,7 +2,9 @@ from typing import Dict, List
 from typing import OrderedDict as OrderedDictType
 
 from dotmodules.modules.hooks import Hook, VariableStatusHook
+from dotmodules.modules.hooks.graph import HookDependencyGraph
 
 AggregatedVariablesType = Dict[str, List[str]]
 AggregatedHooksType = OrderedDictType[str, List[Hook]]
 AggregatedVariableStatusHooksType = Dict[str, VariableStatusHook]
+AggregatedHookGraphsType = Dict[str, HookDependencyGraph]
@@ -0,0 +1,285 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from dotmodules.modules.discovery import ModuleDiscovery
+from dotmodules.modules.hooks.graph import collect_module_dependencies
+from dotmodules.modules.loader import LoaderError, get_toml_backend
+from dotmodules.modules.modules import Module, ModuleError
+from dotmodules.modules.parser import ModuleSpec
+from dotmodules.settings import Settings
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+@dataclass
+class ModuleValidationResult:
+    """
+    Validation result of a single module configuration file. The module spec is
+    only kept for the cross module checks, it won't be part of the report.
+    """
+
+    config_file_path: Path
+    name: str
+    errors: List[str]
+    parse_time_ms: float
+    check_time_ms: float
+    module_spec: Optional[ModuleSpec] = None
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "type": "module",
+            "path": str(self.config_file_path),
+            "name": self.name,
+            "valid": self.valid,
+            "errors": self.errors,
+            "parse_time_ms": self.parse_time_ms,
+            "check_time_ms": self.check_time_ms,
+        }
+
+
+@dataclass
+class ValidationReport:
+    """
+    Collected validation results of every discovered module and the errors that
+    cannot be attributed to a single module.
+    """
+
+    module_results: List[ModuleValidationResult] = field(default_factory=list)
+    global_errors: List[str] = field(default_factory=list)
+    discovery_time_ms: float = 0.0
+    total_time_ms: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return not self.global_errors and all(
+            result.valid for result in self.module_results
+        )
+
+    @property
+    def invalid_module_count(self) -> int:
+        return len([result for result in self.module_results if not result.valid])
+
+    @property
+    def error_count(self) -> int:
+        return len(self.global_errors) + sum(
+            len(result.errors) for result in self.module_results
+        )
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the report records: a record for every module in path order,
+        a record for every global error and a closing summary record.
+        """
+        for result in self.module_results:
+            yield result.to_record()
+        for error in self.global_errors:
+            yield {"type": "global_error", "error": error}
+        yield {
+            "type": "summary",
+            "valid": self.valid,
+            "module_count": len(self.module_results),
+            "invalid_module_count": self.invalid_module_count,
+            "error_count": self.error_count,
+            "discovery_time_ms": self.discovery_time_ms,
+            "total_time_ms": self.total_time_ms,
+        }
+
+    def write_ndjson(self, stream: TextIO) -> None:
+        for record in self.iter_records():
+            stream.write(json.dumps(record) + "\n")
+
+
+def validate_config_file(
+    path: Path, deployment_target: str, loader_backend: str = ""
+) -> ModuleValidationResult:
+    """
+    Parses the given config file and runs every error check on the defined
+    links and hooks. The errors are collected instead of raised, as this
+    function could be executed in a worker process.
+    """
+    start = time.perf_counter()
+    try:
+        module_spec = Module.parse_config_file(
+            path=path,
+            deployment_target=deployment_target,
+            loader_backend=loader_backend,
+        )
+    except ModuleError as e:
+        return ModuleValidationResult(
+            config_file_path=path,
+            name=path.parent.name,
+            errors=[str(e)],
+            parse_time_ms=_elapsed_ms(start),
+            check_time_ms=0.0,
+        )
+    parse_time_ms = _elapsed_ms(start)
+
+    start = time.perf_counter()
+    errors = Module.report_module_spec_errors(path=path, module_spec=module_spec)
+    return ModuleValidationResult(
+        config_file_path=path,
+        name=module_spec.name or path.parent.name,
+        errors=errors,
+        parse_time_ms=parse_time_ms,
+        check_time_ms=_elapsed_ms(start),
+        module_spec=module_spec,
+    )
+
+
+@dataclass
+class ModulesValidator:
+    """
+    Non-interactive validator that loads and checks every module concurrently.
+    Unlike the normal module loading, it doesn't stop at the first error, it
+    collects every error into the validation report.
+    """
+
+    settings: Settings
+
+    def validate(self) -> ValidationReport:
+        start = time.perf_counter()
+        report = ValidationReport()
+        settings = self.settings
+
+        try:
+            loader_backend = get_toml_backend(name=settings.toml_backend).name
+        except LoaderError as e:
+            report.global_errors.append(f"Configuration loading error: {e}")
+            report.total_time_ms = _elapsed_ms(start)
+            return report
+
+        discovery_start = time.perf_counter()
+        modules_root_path = settings.relative_modules_path
+        discovery = ModuleDiscovery(
+            config_file_name=settings.config_file_name,
+            ignored_directory_names=settings.discovery_ignored_directory_names,
+            use_ignore_files=settings.discovery_use_ignore_files,
+            stop_at_module_roots=settings.discovery_stop_at_module_roots,
+            worker_count=settings.discovery_worker_count,
+        )
+        config_file_paths = discovery.discover(
+            modules_root_path=modules_root_path
+        ).config_file_paths
+        report.discovery_time_ms = _elapsed_ms(discovery_start)
+
+        root_config_file_path = modules_root_path / settings.config_file_name
+        if root_config_file_path in config_file_paths:
+            report.global_errors.append(
+                "You cannot have a config file directly in the main modules directory!"
+            )
+            config_file_paths.remove(root_config_file_path)
+
+        report.module_results = self._validate_config_files(
+            config_file_paths=config_file_paths,
+            deployment_target=settings.deployment_target,
+            loader_backend=loader_backend,
+        )
+        report.global_errors += self._check_variable_status_hooks(
+            module_results=report.module_results
+        )
+        report.global_errors += self._check_module_dependencies(
+            module_results=report.module_results
+        )
+        report.total_time_ms = _elapsed_ms(start)
+        return report
+
+    def _validate_config_files(
+        self, config_file_paths: List[Path], deployment_target: str, loader_backend: str
+    ) -> List[ModuleValidationResult]:
+        config_file_paths = sorted(config_file_paths)
+        worker_count = self.settings.module_loading_worker_count or os.cpu_count() or 1
+        worker_count = min(worker_count, len(config_file_paths))
+        if (
+            worker_count > 1
+            and len(config_file_paths)
+            >= self.settings.module_loading_parallel_threshold
+        ):
+            try:
+                with ProcessPoolExecutor(max_workers=worker_count) as executor:
+                    return list(
+                        executor.map(
+                            validate_config_file,
+                            config_file_paths,
+                            [deployment_target] * len(config_file_paths),
+                            [loader_backend] * len(config_file_paths),
+                            chunksize=max(
+                                1, len(config_file_paths) // (worker_count * 4)
+                            ),
+                        )
+                    )
+            except (OSError, BrokenProcessPool):
+                # Process pools might not be available on every platform, the
+                # serial validation is always a valid fallback.
+                pass
+
+        return [
+            validate_config_file(
+                path=path,
+                deployment_target=deployment_target,
+                loader_backend=loader_backend,
+            )
+            for path in config_file_paths
+        ]
+
+    @staticmethod
+    def _check_variable_status_hooks(
+        module_results: List[ModuleValidationResult],
+    ) -> List[str]:
+        """
+        Reports the variables that have variable status hooks in multiple
+        enabled modules. The normal module loading would fail on these.
+        """
+        modules_by_variable_name: Dict[str, List[str]] = {}
+        for result in module_results:
+            module_spec = result.module_spec
+            if module_spec is None or not module_spec.enabled:
+                continue
+            for hook_item in module_spec.variable_status_hooks:
+                modules_by_variable_name.setdefault(
+                    hook_item["variable_name"], []
+                ).append(str(result.config_file_path))
+
+        errors = []
+        for variable_name, paths in sorted(modules_by_variable_name.items()):
+            if len(paths) > 1:
+                formatted_paths = ", ".join(f"'{path}'" for path in paths)
+                errors.append(
+                    "Multiple varible status hooks were defined for variable "
+                    f"name '{variable_name}' in modules: {formatted_paths}!"
+                )
+        return errors
+
+    @staticmethod
+    def _check_module_dependencies(
+        module_results: List[ModuleValidationResult],
+    ) -> List[str]:
+        """
+        Reports the dependencies on unknown modules and the dependency cycles
+        between the enabled modules. The normal module loading would fail on
+        these. The modules that cannot be parsed are still known modules.
+        """
+        enabled_module_dependencies: Dict[str, List[str]] = {}
+        for result in module_results:
+            module_spec = result.module_spec
+            if module_spec is not None and module_spec.enabled:
+                enabled_module_dependencies.setdefault(result.name, []).extend(
+                    module_spec.depends_on
+                )
+
+        _dependencies, errors = collect_module_dependencies(
+            enabled_module_dependencies=enabled_module_dependencies,
+            module_names={result.name for result in module_results},
+        )
+        return errors
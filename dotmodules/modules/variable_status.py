@@ -1,21 +1,47 @@
+import fcntl
+import heapq
 import json
+import os
+import shutil
+import signal
 import sys
+import threading
+import time
 import uuid
-from collections import defaultdict
-from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum, IntEnum
 from pathlib import Path
+from queue import Empty, SimpleQueue
 
 # Importing and using the subprocess module can be a security issue, but it is
 # necessary in our case.
-from subprocess import Popen  # nosec
-from typing import Dict, List, Optional, TypedDict
+from subprocess import PIPE, Popen  # nosec
+from types import FrameType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
+from dotmodules.modules.cache import hash_content
 from dotmodules.modules.hooks import VariableStatusHook
+from dotmodules.modules.hooks.base import HookError
+from dotmodules.modules.hooks.variable_status_hook import VariableStatusHookMode
 from dotmodules.modules.types import (
     AggregatedVariableStatusHooksType,
     AggregatedVariablesType,
 )
 from dotmodules.settings import Settings
+from dotmodules.shell_adapter import ShellAdapter
 
 
 class ShellResultDict(TypedDict):
@@ -28,25 +54,30 @@ class VariableStatusValue(str, Enum):
     LOADING: str = "loading"
     MISSING: str = "missing"
     NOT_AVAIBLE: str = "not available"
+    FAILED = "failed"
 
 
 class VariableStatus:
     def __init__(
-        self, status: VariableStatusValue, status_string: Optional[str] = None
+        self,
+        status: VariableStatusValue,
+        status_string: Optional[str] = None,
+        stale: bool = False,
     ) -> None:
         self._status = status
         self._status_string = status_string
+        self._stale = stale
 
     @classmethod
     def from_shell_result(
-        cls, variable_processed: bool, details: Optional[str]
+        cls, variable_processed: bool, details: Optional[str], stale: bool = False
     ) -> "VariableStatus":
         status = (
             VariableStatusValue.ADDED
             if variable_processed
             else VariableStatusValue.MISSING
         )
-        return cls(status=status, status_string=details)
+        return cls(status=status, status_string=details, stale=stale)
 
     @property
     def variable_was_added(self) -> bool:
@@ -56,6 +87,14 @@ class VariableStatus:
     def variable_is_loading(self) -> bool:
         return self._status == VariableStatusValue.LOADING
 
+    @property
+    def is_stale(self) -> bool:
+        """
+        A stale status was served from the persistent cache, it might be
+        outdated until the refreshed status arrives.
+        """
+        return self._stale
+
     @property
     def status(self) -> VariableStatusValue:
         return self._status
@@ -71,11 +110,261 @@ class VariableStatus:
 AggregatedShellResultDictType = Dict[str, ShellResultDict]
 AggregatedVariableStatusesType = Dict[str, Dict[str, VariableStatus]]
 
+# Callback that gets a variable value and its result as soon as it was checked.
+ValueCheckedCallbackType = Callable[[str, ShellResultDict], None]
+
+
+@dataclass(frozen=True)
+class VariableStatusProgress:
+    checked: int
+    total: int
+
+    @property
+    def finished(self) -> bool:
+        return self.checked >= self.total
+
+    def __str__(self) -> str:
+        return f"{self.checked}/{self.total} checked"
+
+
+@dataclass(frozen=True)
+class VariableStatusCounts:
+    """
+    Number of values of a variable in each status. The stale count overlaps
+    with the other counts.
+    """
+
+    added: int = 0
+    loading: int = 0
+    missing: int = 0
+    failed: int = 0
+    stale: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.added + self.loading + self.missing + self.failed
+
+
+class VariableStatusStore:
+    """
+    Compact columnar store of the variable statuses. The variable values are
+    interned into integer ids per variable name, the statuses are kept in a
+    byte array indexed by these ids, and only the non-empty status strings are
+    kept in a side table. The status counts are maintained on every update, so
+    they can be queried per variable in constant time.
+
+    A status code is the index of the status in the STATUSES tuple shifted by
+    one, with the lowest bit used as the stale flag.
+    """
+
+    STATUSES = (
+        VariableStatusValue.ADDED,
+        VariableStatusValue.LOADING,
+        VariableStatusValue.MISSING,
+        VariableStatusValue.FAILED,
+    )
+    _STATUS_CODES = {status: index << 1 for index, status in enumerate(STATUSES)}
+    _STALE_BIT = 1
+
+    def __init__(self) -> None:
+        self._value_ids: Dict[str, Dict[str, int]] = {}
+        self._codes = bytearray()
+        self._details: Dict[int, str] = {}
+        # Per variable counters indexed by the status code.
+        self._counts: Dict[str, List[int]] = {}
+
+    @property
+    def variable_names(self) -> Iterable[str]:
+        return self._value_ids.keys()
+
+    def add(self, variable_name: str, variable_values: Iterable[str]) -> None:
+        """
+        Interns the given values with a loading status. Already known values
+        are left untouched.
+        """
+        value_ids = self._value_ids.setdefault(variable_name, {})
+        counts = self._counts.setdefault(variable_name, [0] * (len(self.STATUSES) * 2))
+        loading_code = self._STATUS_CODES[VariableStatusValue.LOADING]
+        for variable_value in variable_values:
+            if variable_value in value_ids:
+                continue
+            value_ids[variable_value] = len(self._codes)
+            self._codes.append(loading_code)
+            counts[loading_code] += 1
+
+    def set(
+        self,
+        variable_name: str,
+        variable_value: str,
+        status: VariableStatusValue,
+        status_string: Optional[str] = None,
+        stale: bool = False,
+    ) -> None:
+        value_ids = self._value_ids.get(variable_name)
+        if value_ids is None or variable_value not in value_ids:
+            self.add(variable_name=variable_name, variable_values=[variable_value])
+            value_ids = self._value_ids[variable_name]
+        value_id = value_ids[variable_value]
+
+        code = self._STATUS_CODES[status] | (self._STALE_BIT if stale else 0)
+        counts = self._counts[variable_name]
+        counts[self._codes[value_id]] -= 1
+        counts[code] += 1
+        self._codes[value_id] = code
+
+        if status_string:
+            self._details[value_id] = status_string
+        else:
+            self._details.pop(value_id, None)
+
+    def set_result(
+        self,
+        variable_name: str,
+        variable_value: str,
+        result: ShellResultDict,
+        stale: bool = False,
+    ) -> None:
+        self.set(
+            variable_name=variable_name,
+            variable_value=variable_value,
+            status=(
+                VariableStatusValue.ADDED
+                if result["variable_processed"]
+                else VariableStatusValue.MISSING
+            ),
+            status_string=result["details"],
+            stale=stale,
+        )
+
+    def get(self, variable_name: str, variable_value: str) -> VariableStatus:
+        try:
+            value_id = self._value_ids[variable_name][variable_value]
+        except KeyError:
+            return VariableStatus(status=VariableStatusValue.NOT_AVAIBLE)
+        code = self._codes[value_id]
+        return VariableStatus(
+            status=self.STATUSES[code >> 1],
+            status_string=self._details.get(value_id),
+            stale=bool(code & self._STALE_BIT),
+        )
+
+    def get_counts(self, variable_name: str) -> VariableStatusCounts:
+        counts = self._counts.get(variable_name)
+        if counts is None:
+            return VariableStatusCounts()
+        by_status = [
+            counts[code] + counts[code | self._STALE_BIT]
+            for code in self._STATUS_CODES.values()
+        ]
+        return VariableStatusCounts(
+            added=by_status[0],
+            loading=by_status[1],
+            missing=by_status[2],
+            failed=by_status[3],
+            stale=sum(counts[self._STALE_BIT :: 2]),
+        )
+
+
+@dataclass(frozen=True)
+class CachedVariableStatuses:
+    checked_at: float
+    results: AggregatedShellResultDictType
+
+
+class VariableStatusCache:
+    """
+    Persistent store of the last known variable status hook results. An entry
+    is kept for every variable name, and it is only served if the fingerprint
+    of the variable status hook matches the stored one. A corrupt entry is
+    treated as a missing one.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_path: Path) -> None:
+        self._cache_path = cache_path
+
+    def _get_entry_path(self, variable_name: str) -> Path:
+        return self._cache_path / f"{hash_content(variable_name.encode())}.json"
+
+    def get(
+        self, variable_name: str, fingerprint: str
+    ) -> Optional[CachedVariableStatuses]:
+        try:
+            with open(self._get_entry_path(variable_name=variable_name)) as f:
+                entry = json.load(f)
+            if (
+                entry["version"] == self.VERSION
+                and entry["variable_name"] == variable_name
+                and entry["fingerprint"] == fingerprint
+                and isinstance(entry["checked_at"], (int, float))
+                and self._is_valid_results(entry["results"])
+            ):
+                return CachedVariableStatuses(
+                    checked_at=float(entry["checked_at"]),
+                    results=entry["results"],
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def set(
+        self,
+        variable_name: str,
+        fingerprint: str,
+        results: AggregatedShellResultDictType,
+        checked_at: float,
+    ) -> None:
+        entry_path = self._get_entry_path(variable_name=variable_name)
+        entry = {
+            "version": self.VERSION,
+            "variable_name": variable_name,
+            "fingerprint": fingerprint,
+            "checked_at": checked_at,
+            "results": results,
+        }
+        try:
+            self._cache_path.mkdir(parents=True, exist_ok=True)
+            temporary_path = entry_path.with_name(
+                f"{entry_path.name}.{os.getpid()}.tmp"
+            )
+            with open(temporary_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(temporary_path, entry_path)
+        except OSError:
+            # The cache is only an optimization, failing to write it should not
+            # prevent the status refresh.
+            pass
+
+    @staticmethod
+    def _is_valid_results(results: Any) -> bool:
+        return isinstance(results, dict) and all(
+            isinstance(value, str)
+            and isinstance(result, dict)
+            and isinstance(result.get("variable_processed"), bool)
+            and isinstance(result.get("details"), str)
+            for value, result in results.items()
+        )
+
+
+class VariableStatusExecutorType(str, Enum):
+    """
+    Available ways to execute the variable status refresh tasks:
+
+    - thread: the tasks are executed by a bounded thread pool inside the dm
+      process, only the hook shell processes are started.
+    - worker: every task is executed by a detached python worker process.
+    """
+
+    THREAD = "thread"
+    WORKER = "worker"
+
 
 class VariableStatusRefreshTask:
     REFRESH_TASK_SCRIPT_PATH = Path.cwd() / "dm_variable_status_worker.py"
     TRANSFER_FILE_NAME = "serialized_task_object.json"
     RESULT_FILE_NAME = "result.json"
+    PREPARED_MARKER_FILE_NAME = ".dm_prepared"
 
     def __init__(
         self,
@@ -84,6 +373,9 @@ class VariableStatusRefreshTask:
         variable_values: List[str],
         variable_status_hook: VariableStatusHook,
         cache_path: Path,
+        on_value_checked: Optional[ValueCheckedCallbackType] = None,
+        prepare_cache_path: Optional[Path] = None,
+        prepare_cache_ttl: int = 0,
     ) -> None:
         # Generating the unique id for the task.
         if not task_id:
@@ -101,7 +393,27 @@ class VariableStatusRefreshTask:
         self._variable_status_hook = variable_status_hook
 
         # Empty result variable.
-        self._result: Optional[AggregatedShellResultDictType]
+        self._result: Optional[AggregatedShellResultDictType] = None
+
+        # Error message of a failed task, and the values that were checked
+        # before the failure.
+        self._error: Optional[str] = None
+        self._checked_values: Set[str] = set()
+
+        # Optional callback to stream the results value by value.
+        self._on_value_checked = on_value_checked
+
+        # Optional shared cache directory for the prepare step artifacts.
+        self._prepare_cache_path = prepare_cache_path
+        self._prepare_cache_ttl = prepare_cache_ttl
+
+        # The running process of the task: the detached worker, or the hook
+        # process if the hooks are executed in the calling thread. The task
+        # can be terminated from another thread or from a signal handler, so it
+        # is guarded by a reentrant lock.
+        self._process: Optional["Popen[bytes]"] = None
+        self._process_lock = threading.RLock()
+        self._terminated = False
 
     @property
     def _transfer_file_path(self) -> Path:
@@ -111,7 +423,7 @@ class VariableStatusRefreshTask:
     def result_file_path(self) -> Path:
         return self._cache_path / self.RESULT_FILE_NAME
 
-    def execute(self) -> None:
+    def execute(self) -> "Popen[bytes]":
         """
         Execution this class would happen in two processes:
 
@@ -121,6 +433,9 @@ class VariableStatusRefreshTask:
         2. The worker script will deserialize the same object from disk, and
         executes the variable status hook inside it, and writes the result to a
         file.
+
+        The standard output of the worker is piped back, the caller can detect
+        the end of the worker by waiting for the end of this pipe.
         """
 
         self._save_to_disk()
@@ -130,7 +445,11 @@ class VariableStatusRefreshTask:
             "--transfer-file-path",
             str(self._transfer_file_path),
         ]
-        Popen(args)
+        # The worker is started in a new process group, so it can be
+        # terminated the same way as the hook processes.
+        process = Popen(args, stdout=PIPE, start_new_session=True)
+        self._track_process(process=process)
+        return process
 
     def _save_to_disk(self) -> None:
         serialized_data = {
@@ -139,6 +458,10 @@ class VariableStatusRefreshTask:
             "variable_values": self._variable_values,
             "cache_path": str(self._cache_path),
             "variable_status_hook": self._variable_status_hook.serialize(),
+            "prepare_cache_path": (
+                str(self._prepare_cache_path) if self._prepare_cache_path else None
+            ),
+            "prepare_cache_ttl": self._prepare_cache_ttl,
         }
 
         with open(self._transfer_file_path, "w+") as f:
@@ -152,12 +475,15 @@ class VariableStatusRefreshTask:
         variable_status_hook = VariableStatusHook.deserialize(
             serialized_data=serialized_data["variable_status_hook"]
         )
+        prepare_cache_path = serialized_data["prepare_cache_path"]
         loaded_object = VariableStatusRefreshTask(
             task_id=serialized_data["task_id"],
             variable_name=serialized_data["variable_name"],
             variable_values=serialized_data["variable_values"],
             cache_path=Path(serialized_data["cache_path"]),
             variable_status_hook=variable_status_hook,
+            prepare_cache_path=Path(prepare_cache_path) if prepare_cache_path else None,
+            prepare_cache_ttl=serialized_data["prepare_cache_ttl"],
         )
 
         return loaded_object
@@ -171,29 +497,146 @@ class VariableStatusRefreshTask:
 
     def _execute_in_worker(self) -> None:
         """
-        This method will be executed in the worker process.
+        This method will be executed in the worker process. The results are
+        streamed to the standard output value by value as JSON lines with a
+        sequence number, the whole result is written to the result file at the
+        end. If the worker is terminated, its running hook process is
+        terminated too, and no result is written.
         """
+        sequence = 0
 
-        result: AggregatedShellResultDictType = {}
+        def terminate_on_signal(signal_number: int, frame: Optional[FrameType]) -> None:
+            self.terminate()
 
-        # Private cache path for the hook to persist artifacts between the
-        # prepare and execute steps.
-        private_cache_path = self._cache_path / "hook_cache"
-        private_cache_path.mkdir(parents=True, exist_ok=True)
+        signal.signal(signal.SIGTERM, terminate_on_signal)
 
-        # Execute prepare step if needed
-        if self._variable_status_hook.prepare_step_necessary:
-            hook_execution_result = self._variable_status_hook.execute_prepare_step(
-                variable_name=self._variable_name,
-                cache_path=private_cache_path,
+        def print_value_result(variable_value: str, result: ShellResultDict) -> None:
+            nonlocal sequence
+            record = {"sequence": sequence, "value": variable_value, "result": result}
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+            sequence += 1
+
+        self._on_value_checked = print_value_result
+        try:
+            result = self.execute_hooks()
+        except HookError:
+            if self._terminated:
+                return
+            raise
+        with open(self.result_file_path, "w+") as f:
+            json.dump(result, f, indent=4)
+
+    def execute_hooks(self) -> AggregatedShellResultDictType:
+        """
+        Executes the prepare step if needed, then the execute step for every
+        variable value, or a single batch step for all values if the hook was
+        configured in batch mode, or a single inventory step if the hook was
+        configured in inventory mode. A built-in checker is executed in-process
+        for all values instead. It can be called from a worker process or from a
+        thread.
+        """
+
+        if self._variable_status_hook.checker:
+            result = self._execute_checker()
+            for variable_value, value_result in result.items():
+                self._report_value_checked(
+                    variable_value=variable_value, result=value_result
+                )
+            return result
+
+        with self._prepared_hook_cache() as hook_cache_path:
+            if self._variable_status_hook.mode == VariableStatusHookMode.BATCH:
+                result = self._execute_batch_step(cache_path=hook_cache_path)
+            elif self._variable_status_hook.mode == VariableStatusHookMode.INVENTORY:
+                result = self._execute_inventory_step(cache_path=hook_cache_path)
+            else:
+                # The single steps report their results one by one.
+                return self._execute_single_steps(cache_path=hook_cache_path)
+
+        for variable_value, value_result in result.items():
+            self._report_value_checked(
+                variable_value=variable_value, result=value_result
             )
+        return result
+
+    @contextmanager
+    def _prepared_hook_cache(self) -> Iterator[Path]:
+        """
+        Provides the cache directory for the hook to persist artifacts between
+        the prepare and execute steps, with the prepare step executed if needed.
+
+        Without a shared prepare cache path the directory is private to the
+        task. The shared directory is reused by the later refreshes and
+        sessions while the prepare step result is younger than the TTL. It is
+        guarded by a file lock: the prepare step runs under an exclusive lock,
+        so concurrent refreshes wait for a single prepare run instead of
+        repeating it, while the prepared artifacts are used under a shared lock
+        by any number of refreshes at the same time.
+        """
+        hook = self._variable_status_hook
+        if not hook.prepare_step_necessary or self._prepare_cache_path is None:
+            private_cache_path = self._cache_path / "hook_cache"
+            private_cache_path.mkdir(parents=True, exist_ok=True)
+            if hook.prepare_step_necessary:
+                hook.execute_prepare_step(
+                    variable_name=self._variable_name,
+                    cache_path=private_cache_path,
+                    on_process_started=self._track_process,
+                )
+            yield private_cache_path
+            return
+
+        shared_cache_path = self._prepare_cache_path
+        shared_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file_path = shared_cache_path.with_name(f"{shared_cache_path.name}.lock")
+        marker_path = shared_cache_path / self.PREPARED_MARKER_FILE_NAME
+        with open(lock_file_path, "w") as lock_file:
+            # The lock is released when the lock file is closed. The artifacts
+            # are used under a shared lock, only the prepare step needs the
+            # exclusive lock.
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            if not self._is_prepared(marker_path=marker_path):
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # Another refresh could have prepared the cache meanwhile.
+                if not self._is_prepared(marker_path=marker_path):
+                    shutil.rmtree(shared_cache_path, ignore_errors=True)
+                    shared_cache_path.mkdir(parents=True, exist_ok=True)
+                    hook_execution_result = hook.execute_prepare_step(
+                        variable_name=self._variable_name,
+                        cache_path=shared_cache_path,
+                        on_process_started=self._track_process,
+                    )
+                    if hook_execution_result.status_code == 0:
+                        marker_path.touch()
+                fcntl.flock(lock_file, fcntl.LOCK_SH)
+            yield shared_cache_path
+
+    def _is_prepared(self, marker_path: Path) -> bool:
+        try:
+            prepared_at = marker_path.stat().st_mtime
+        except OSError:
+            return False
+        return time.time() - prepared_at < self._prepare_cache_ttl
+
+    def _report_value_checked(
+        self, variable_value: str, result: ShellResultDict
+    ) -> None:
+        self._checked_values.add(variable_value)
+        if self._on_value_checked is not None:
+            self._on_value_checked(variable_value, result)
+
+    def _execute_single_steps(self, cache_path: Path) -> AggregatedShellResultDictType:
+        result: AggregatedShellResultDictType = {}
 
         # Execute the processing steps one by one.
         for variable_value in self._variable_values:
+            self._check_terminated()
             hook_execution_result = self._variable_status_hook.execute_execute_step(
                 variable_name=self._variable_name,
                 variable_value=variable_value,
-                cache_path=private_cache_path,
+                cache_path=cache_path,
+                on_process_started=self._track_process,
             )
 
             if hook_execution_result.execution_result:
@@ -207,22 +650,233 @@ class VariableStatusRefreshTask:
                     "variable_processed": variable_processed,
                     "details": details,
                 }
+                self._report_value_checked(
+                    variable_value=variable_value, result=result[variable_value]
+                )
             else:
-                raise ValueError(
+                raise HookError(
                     f"Variable status hook execution failed: '{hook_execution_result}'"
                 )
 
-        with open(self.result_file_path, "w+") as f:
-            json.dump(result, f, indent=4)
+        return result
 
-    @property
-    def has_finished(self) -> bool:
+    def _execute_checker(self) -> AggregatedShellResultDictType:
+        checker_result = self._variable_status_hook.execute_checker(
+            variable_values=self._variable_values
+        )
+        return {
+            variable_value: {"variable_processed": processed, "details": details}
+            for variable_value, (processed, details) in checker_result.items()
+        }
+
+    def _execute_batch_step(self, cache_path: Path) -> AggregatedShellResultDictType:
+        hook_execution_result = self._variable_status_hook.execute_batch_step(
+            variable_name=self._variable_name,
+            variable_values=self._variable_values,
+            cache_path=cache_path,
+            on_process_started=self._track_process,
+        )
+        if not hook_execution_result.execution_result:
+            raise HookError(
+                f"Variable status hook execution failed: '{hook_execution_result}'"
+            )
+        return self.parse_batch_result_lines(
+            lines=hook_execution_result.execution_result.stdout,
+            variable_values=self._variable_values,
+        )
+
+    def _execute_inventory_step(
+        self, cache_path: Path
+    ) -> AggregatedShellResultDictType:
+        hook_execution_result = self._variable_status_hook.execute_inventory_step(
+            variable_name=self._variable_name,
+            cache_path=cache_path,
+            on_process_started=self._track_process,
+        )
+        if not hook_execution_result.execution_result:
+            raise HookError(
+                f"Variable status hook execution failed: '{hook_execution_result}'"
+            )
+        return self.parse_inventory_lines(
+            lines=hook_execution_result.execution_result.stdout,
+            variable_values=self._variable_values,
+        )
+
+    @staticmethod
+    def parse_inventory_lines(
+        lines: List[str], variable_values: List[str]
+    ) -> AggregatedShellResultDictType:
+        """
+        Parses the inventory listed by an inventory mode hook script. Every
+        line names a present value, optionally followed by a tab character and
+        a status string. The variable values are added if they are present in
+        the inventory, missing otherwise.
+        """
+        inventory: Dict[str, str] = {}
+        for line in lines:
+            value, _separator, details = line.partition("\t")
+            if value:
+                inventory[value] = details
+
+        present_values = inventory.keys() & set(variable_values)
+        return {
+            variable_value: {
+                "variable_processed": variable_value in present_values,
+                "details": inventory.get(variable_value, ""),
+            }
+            for variable_value in variable_values
+        }
+
+    @staticmethod
+    def parse_batch_result_lines(
+        lines: List[str], variable_values: List[str]
+    ) -> AggregatedShellResultDictType:
+        """
+        Parses the JSON lines reported by a batch mode hook script. Every line
+        should be an object with the following fields:
+
+        - value: the variable value the line is reported for,
+        - processed: boolean flag whether the value was processed,
+        - details: optional status string.
+
+        Lines that cannot be parsed and values that are not requested are
+        ignored. The values without a reported line are considered missing.
+        """
+        result: AggregatedShellResultDictType = {
+            variable_value: {"variable_processed": False, "details": ""}
+            for variable_value in variable_values
+        }
+        for line in lines:
+            try:
+                record = json.loads(line)
+                variable_value = record["value"]
+                variable_processed = record["processed"]
+                details = record.get("details", "")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+            if (
+                variable_value not in result
+                or not isinstance(variable_processed, bool)
+                or not isinstance(details, str)
+            ):
+                continue
+            result[variable_value] = {
+                "variable_processed": variable_processed,
+                "details": details,
+            }
+        return result
+
+    def run(self, executor_type: VariableStatusExecutorType) -> None:
+        """
+        Executes the task and waits for its result. With the worker executor
+        the hooks are executed in a worker process, otherwise in the calling
+        thread. The built-in checkers are always executed in the calling
+        thread, as they don't start any process. A failed task results an empty
+        result, and the values that weren't checked before the failure are
+        reported as failed values.
+        """
         try:
-            with open(self.result_file_path) as f:
-                self._result = json.load(f)
-                return True
-        except (FileNotFoundError, ValueError):
-            return False
+            self._check_terminated()
+            if (
+                executor_type == VariableStatusExecutorType.WORKER
+                and not self._variable_status_hook.checker
+            ):
+                process = self.execute()
+                self._read_streamed_results(process=process)
+                process.wait()
+                with open(self.result_file_path) as f:
+                    self._result = json.load(f)
+            else:
+                self._result = self.execute_hooks()
+        except (OSError, json.JSONDecodeError, HookError) as e:
+            self.fail(error=e)
+
+    def fail(self, error: Exception) -> None:
+        """
+        Records the error of the task with an empty result, so the values that
+        weren't checked are reported as failed values.
+        """
+        self._result = {}
+        self._error = str(error) or type(error).__name__
+
+    def _read_streamed_results(self, process: "Popen[bytes]") -> None:
+        """
+        Reads the value results streamed by the worker process until it exits.
+        A record with an unexpected sequence number is ignored.
+        """
+        if process.stdout is None:
+            return
+        expected_sequence = 0
+        for line in process.stdout:
+            try:
+                record = json.loads(line)
+                if record["sequence"] != expected_sequence:
+                    continue
+                variable_value = record["value"]
+                result = record["result"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            expected_sequence += 1
+            self._report_value_checked(variable_value=variable_value, result=result)
+
+    def terminate(self) -> None:
+        """
+        Terminates the running worker or hook process of the task, and prevents
+        the task from starting new ones. A built-in checker cannot be
+        interrupted, as it is executed in-process.
+        """
+        with self._process_lock:
+            self._terminated = True
+            process = self._process
+        if process is not None:
+            ShellAdapter.terminate_process_group(process=process)
+
+    def _track_process(self, process: "Popen[bytes]") -> None:
+        """
+        Registers the started worker or hook process, so the task can terminate
+        it from another thread. A process started after the termination is
+        terminated right away.
+        """
+        with self._process_lock:
+            self._process = process
+            terminated = self._terminated
+        if terminated:
+            ShellAdapter.terminate_process_group(process=process)
+
+    def _check_terminated(self) -> None:
+        if self._terminated:
+            raise HookError("Variable status refresh was terminated!")
+
+    @property
+    def variable_name(self) -> str:
+        return self._variable_name
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    @property
+    def failed_values(self) -> List[str]:
+        """
+        Values of a failed task that didn't get a result before the failure.
+        """
+        if self._error is None:
+            return []
+        return [
+            variable_value
+            for variable_value in self._variable_values
+            if variable_value not in self._checked_values
+        ]
+
+    @property
+    def shell_results(self) -> AggregatedShellResultDictType:
+        """
+        Raw results of the finished task, an empty dictionary if the hook
+        execution failed.
+        """
+        if self._result is None:
+            raise SystemError("Results call happened on the unfinished status hook!")
+        return self._result
 
     @property
     def result(self) -> AggregatedVariableStatusesType:
@@ -246,9 +900,185 @@ class VariableStatusRefreshTask:
             raise SystemError("Results call happened on the unfinished status hook!")
 
 
+class VariableStatusRefreshPriority(IntEnum):
+    """
+    Priority classes of the variable status refreshes, the lower value is
+    scheduled earlier.
+    """
+
+    VISIBLE = 0
+    CHANGED = 1
+    BACKGROUND = 2
+
+
+class VariableStatusRefreshScheduler:
+    """
+    Bounded priority scheduler for the variable status refresh tasks. At most
+    the given number of tasks are running at once, the rest is waiting in a
+    priority queue. A refresh request for a variable that is already waiting is
+    coalesced into the waiting one, and a variable is never refreshed by two
+    tasks at once.
+
+    The tasks are created only when they are started, so they always use the
+    current variable values. The finished tasks are passed to the given
+    callback from the scheduler threads.
+    """
+
+    def __init__(
+        self,
+        worker_count: int,
+        executor_type: VariableStatusExecutorType,
+        create_task: Callable[[str], VariableStatusRefreshTask],
+        on_finished: Callable[[VariableStatusRefreshTask], None],
+    ) -> None:
+        self._worker_count = max(1, worker_count)
+        self._executor_type = executor_type
+        self._create_task = create_task
+        self._on_finished = on_finished
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._queue: List[Tuple[int, int, str]] = []
+        self._sequence = 0
+        self._running: Dict[str, VariableStatusRefreshTask] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+    @property
+    def is_busy(self) -> bool:
+        with self._lock:
+            return bool(self._pending or self._running)
+
+    @property
+    def pending_variable_names(self) -> List[str]:
+        """
+        Returns the waiting variable names in scheduling order.
+        """
+        with self._lock:
+            return [
+                name
+                for priority, sequence, name in sorted(self._queue)
+                if self._pending.get(name) == (priority, sequence)
+            ]
+
+    def request(
+        self,
+        variable_name: str,
+        priority: VariableStatusRefreshPriority = VariableStatusRefreshPriority.BACKGROUND,
+    ) -> None:
+        """
+        Requests a refresh for the given variable. If the variable is already
+        waiting, only its priority can be raised.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            current = self._pending.get(variable_name)
+            if current is not None and current[0] <= priority:
+                return
+            self._sequence += 1
+            self._pending[variable_name] = (priority, self._sequence)
+            heapq.heappush(self._queue, (priority, self._sequence, variable_name))
+            self._dispatch()
+
+    def prioritize(self, variable_names: Iterable[str]) -> None:
+        """
+        Moves the given waiting variables to the front of the queue, e.g. the
+        ones that are displayed in the current view.
+        """
+        with self._lock:
+            waiting_variable_names = [
+                name
+                for name in variable_names
+                if name in self._pending
+                and self._pending[name][0] > VariableStatusRefreshPriority.VISIBLE
+            ]
+        for variable_name in waiting_variable_names:
+            self.request(
+                variable_name=variable_name,
+                priority=VariableStatusRefreshPriority.VISIBLE,
+            )
+
+    def shutdown(self) -> None:
+        """
+        Drops the waiting requests, cancels the submitted tasks that haven't
+        started yet, and terminates the worker and hook processes of the running
+        tasks. Only the built-in checkers cannot be interrupted, they finish in
+        the background.
+        """
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._queue.clear()
+            running_tasks = list(self._running.values())
+        for refresh_task in running_tasks:
+            refresh_task.terminate()
+        if self._executor is not None:
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                # The submitted tasks were terminated above, so they return
+                # without starting a process.
+                self._executor.shutdown(wait=False)
+
+    def _dispatch(self) -> None:
+        """
+        Starts the waiting tasks while there is free capacity. It should be
+        called with the lock held.
+        """
+        deferred = []
+        while self._queue and len(self._running) < self._worker_count:
+            priority, sequence, variable_name = heapq.heappop(self._queue)
+            if self._pending.get(variable_name) != (priority, sequence):
+                # Outdated queue entry of a reprioritized request.
+                continue
+            if variable_name in self._running:
+                deferred.append((priority, sequence, variable_name))
+                continue
+            del self._pending[variable_name]
+            refresh_task = self._create_task(variable_name)
+            self._running[variable_name] = refresh_task
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._worker_count,
+                    thread_name_prefix="dm-variable-status",
+                )
+            self._executor.submit(self._run, refresh_task)
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+
+    def _run(self, refresh_task: VariableStatusRefreshTask) -> None:
+        try:
+            refresh_task.run(executor_type=self._executor_type)
+        except Exception as e:
+            # An unexpected error, e.g. an undecodable hook output, should
+            # fail the values instead of leaving them loading.
+            refresh_task.fail(error=e)
+        try:
+            # The task is reported before it is retired, so the scheduler is
+            # busy until the result can be collected.
+            self._on_finished(refresh_task)
+        finally:
+            # An error in the callback should not block the later refreshes.
+            with self._lock:
+                del self._running[refresh_task.variable_name]
+                if not self._closed:
+                    self._dispatch()
+
+
+# A checked value with its result, or None when the refresh task has finished.
+VariableStatusUpdateType = Tuple[
+    VariableStatusRefreshTask, Optional[Tuple[str, ShellResultDict]]
+]
+
+
 class VariableStatusManager:
     """
     Separated manager class that is dedicated to collect and manage the variable statuses.
+
+    If the persistent status cache is enabled, the last known statuses are
+    served as stale statuses until the refreshed ones arrive. The statuses
+    younger than the configured TTL are served as fresh ones without a
+    refresh on startup.
     """
 
     def __init__(
@@ -256,44 +1086,192 @@ class VariableStatusManager:
         aggregated_variables: AggregatedVariablesType,
         aggregated_variable_status_hooks: AggregatedVariableStatusHooksType,
         settings: Settings,
+        on_change: Optional[Callable[[], None]] = None,
     ) -> None:
         self._aggregated_variables = aggregated_variables
         self._aggregated_variable_status_hooks = aggregated_variable_status_hooks
-        self._aggregated_variable_statuses = self._initialize_variable_status_statuses(
-            aggregated_variables=self._aggregated_variables
-        )
         self._settings = settings
-        self._running_refresh_tasks: List[VariableStatusRefreshTask] = []
+        self._on_change = on_change
+
+        # Completion notifications: the scheduler threads put the checked
+        # values and then the finished tasks into the queue, they are merged by
+        # the poll method in order.
+        self._updates: "SimpleQueue[VariableStatusUpdateType]" = SimpleQueue()
+        self._scheduler = VariableStatusRefreshScheduler(
+            worker_count=settings.variable_status_worker_count,
+            executor_type=VariableStatusExecutorType(settings.variable_status_executor),
+            create_task=self._create_refresh_task,
+            on_finished=lambda refresh_task: self._updates.put((refresh_task, None)),
+        )
+
+        self._status_cache: Optional[VariableStatusCache] = None
+        if settings.variable_status_cache_enabled:
+            self._status_cache = VariableStatusCache(
+                cache_path=settings.dm_cache_variable_statuses
+            )
+        self._fingerprints: Dict[str, str] = {}
+        self._refresh_order: Dict[str, Tuple[VariableStatusRefreshPriority, float]] = {}
+        self._fresh_variable_names: Set[str] = set()
+
+        self._statuses = VariableStatusStore()
+        for variable_name, variable_values in self._aggregated_variables.items():
+            self._statuses.add(
+                variable_name=variable_name, variable_values=variable_values
+            )
+        self._load_cached_statuses()
 
-    def _initialize_variable_status_statuses(
-        self, aggregated_variables: AggregatedVariablesType
-    ) -> AggregatedVariableStatusesType:
-        variable_status_dictionary: AggregatedVariableStatusesType = defaultdict(dict)
-        for variable_name, variable_values in aggregated_variables.items():
+    def _load_cached_statuses(self) -> None:
+        """
+        Serves the cached statuses of the variables whose hook didn't change.
+        The refresh order is calculated here too: the variables without usable
+        cached statuses come first, then the cached ones from the oldest.
+        """
+        if self._status_cache is None:
+            return
+
+        now = time.time()
+        ttl = self._settings.variable_status_cache_ttl
+        for variable_name, hook in self._aggregated_variable_status_hooks.items():
+            if variable_name not in self._aggregated_variables:
+                continue
+            fingerprint = hook.get_fingerprint()
+            self._fingerprints[variable_name] = fingerprint
+            cached_statuses = self._status_cache.get(
+                variable_name=variable_name, fingerprint=fingerprint
+            )
+            if cached_statuses is None:
+                self._refresh_order[variable_name] = (
+                    VariableStatusRefreshPriority.CHANGED,
+                    0.0,
+                )
+                continue
+
+            variable_values = self._aggregated_variables[variable_name]
+            fresh = now - cached_statuses.checked_at < ttl
             for variable_value in variable_values:
-                variable_status_dictionary[variable_name][
-                    variable_value
-                ] = VariableStatus(status=VariableStatusValue.LOADING)
-        return dict(variable_status_dictionary)
+                if variable_value in cached_statuses.results:
+                    self._statuses.set_result(
+                        variable_name=variable_name,
+                        variable_value=variable_value,
+                        result=cached_statuses.results[variable_value],
+                        stale=not fresh,
+                    )
+
+            if not set(variable_values).issubset(cached_statuses.results):
+                # New values were added since the last check.
+                self._refresh_order[variable_name] = (
+                    VariableStatusRefreshPriority.CHANGED,
+                    0.0,
+                )
+            elif fresh:
+                self._fresh_variable_names.add(variable_name)
+            else:
+                self._refresh_order[variable_name] = (
+                    VariableStatusRefreshPriority.BACKGROUND,
+                    cached_statuses.checked_at,
+                )
 
     def get(self, variable_name: str, variable_value: str) -> VariableStatus:
         """
         Returns the status of the given variable value defined for a variable
-        name.
+        name. It is a plain lookup, the finished refresh results are merged by
+        the poll method.
         """
-        for refresh_task in self._running_refresh_tasks:
-            if refresh_task.has_finished:
-                self._aggregated_variable_statuses.update(refresh_task.result)
-        try:
-            return self._aggregated_variable_statuses[variable_name][variable_value]
-        except KeyError:
-            return VariableStatus(status=VariableStatusValue.NOT_AVAIBLE)
+        return self._statuses.get(
+            variable_name=variable_name, variable_value=variable_value
+        )
+
+    def get_counts(self, variable_name: str) -> VariableStatusCounts:
+        """
+        Returns the number of values of the given variable in each status in
+        constant time.
+        """
+        return self._statuses.get_counts(variable_name=variable_name)
+
+    @property
+    def is_refreshing(self) -> bool:
+        """
+        Returns True if there is a refresh task that is waiting or hasn't
+        finished yet.
+        """
+        self.poll()
+        return self._scheduler.is_busy
+
+    def poll(self) -> bool:
+        """
+        Merges the results of the refresh tasks that have finished since the
+        last call. Only the finished tasks are touched, every result is merged
+        exactly once, then the task is retired. Returns True if there was a
+        finished task, in this case the change callback is called too.
+        """
+        changed = False
+        while True:
+            try:
+                refresh_task, checked_value = self._updates.get_nowait()
+            except Empty:
+                break
+            changed = True
+            if checked_value is not None:
+                variable_value, result = checked_value
+                self._statuses.set_result(
+                    variable_name=refresh_task.variable_name,
+                    variable_value=variable_value,
+                    result=result,
+                )
+                continue
 
-    def refresh(self, variable_name: str) -> None:
+            # Updating the statuses value by value, so the values checked
+            # before a failure keep their results, the rest are marked failed.
+            for variable_value, result in refresh_task.shell_results.items():
+                self._statuses.set_result(
+                    variable_name=refresh_task.variable_name,
+                    variable_value=variable_value,
+                    result=result,
+                )
+            for variable_value in refresh_task.failed_values:
+                self._statuses.set(
+                    variable_name=refresh_task.variable_name,
+                    variable_value=variable_value,
+                    status=VariableStatusValue.FAILED,
+                )
+            self._store_cached_statuses(refresh_task=refresh_task)
+
+        if changed and self._on_change is not None:
+            self._on_change()
+        return changed
+
+    def _store_cached_statuses(self, refresh_task: "VariableStatusRefreshTask") -> None:
+        variable_name = refresh_task.variable_name
+        shell_results = refresh_task.shell_results
+        if self._status_cache is None or not shell_results:
+            return
+        self._status_cache.set(
+            variable_name=variable_name,
+            fingerprint=self._fingerprints.get(variable_name, ""),
+            results=shell_results,
+            checked_at=time.time(),
+        )
+
+    def refresh(
+        self,
+        variable_name: str,
+        priority: VariableStatusRefreshPriority = VariableStatusRefreshPriority.BACKGROUND,
+    ) -> None:
         if variable_name not in self._aggregated_variable_status_hooks:
             # TODO: report a warning about missing variable status hook
             # print(f"missing varibale status hook for variable '{variable_name}'")
             return
+        self._scheduler.request(variable_name=variable_name, priority=priority)
+
+    def _create_refresh_task(self, variable_name: str) -> VariableStatusRefreshTask:
+        """
+        Creates the refresh task for the given variable when the scheduler
+        starts it. It is called from the scheduler threads.
+        """
+        variable_status_hook = self._aggregated_variable_status_hooks[variable_name]
+        # The hook script might have been changed since the startup.
+        fingerprint = variable_status_hook.get_fingerprint()
+        self._fingerprints[variable_name] = fingerprint
 
         task_id = uuid.uuid4().hex
         task_cache_path = self._settings.dm_cache_variable_status_hooks / task_id
@@ -301,12 +1279,96 @@ class VariableStatusManager:
             task_id=task_id,
             variable_name=variable_name,
             variable_values=self._aggregated_variables[variable_name],
-            variable_status_hook=self._aggregated_variable_status_hooks[variable_name],
+            variable_status_hook=variable_status_hook,
             cache_path=task_cache_path,
+            on_value_checked=lambda variable_value, result: self._updates.put(
+                (refresh_task, (variable_value, result))
+            ),
+            prepare_cache_path=self._settings.dm_cache_prepare_steps / fingerprint,
+            prepare_cache_ttl=self._settings.variable_status_prepare_cache_ttl,
         )
-        refresh_task.execute()
-        self._running_refresh_tasks.append(refresh_task)
+        return refresh_task
 
     def refresh_all(self) -> None:
-        for variable_name in self._aggregated_variables:
-            self.refresh(variable_name=variable_name)
+        """
+        Refreshes the statuses of every variable except the ones that were
+        served from the cache within the TTL. The variables with changed hooks
+        or values are refreshed first, then the cached ones from the oldest.
+        """
+        variable_names = [
+            variable_name
+            for variable_name in self._aggregated_variables
+            if variable_name not in self._fresh_variable_names
+        ]
+        default_order = (VariableStatusRefreshPriority.CHANGED, 0.0)
+        variable_names.sort(
+            key=lambda variable_name: self._refresh_order.get(
+                variable_name, default_order
+            )
+        )
+        for variable_name in variable_names:
+            priority = self._refresh_order.get(variable_name, default_order)[0]
+            self.refresh(variable_name=variable_name, priority=priority)
+        self._fresh_variable_names.clear()
+
+    @property
+    def pending_variable_names(self) -> List[str]:
+        return self._scheduler.pending_variable_names
+
+    def get_progress(
+        self, variable_names: Optional[Iterable[str]] = None
+    ) -> VariableStatusProgress:
+        """
+        Returns how many values of the given variables (or every variable) were
+        checked in the current session. Cached statuses are not counted until
+        they are refreshed, the variables without status hooks are skipped.
+        """
+        if variable_names is None:
+            variable_names = self._statuses.variable_names
+        checked = 0
+        total = 0
+        for variable_name in variable_names:
+            if variable_name not in self._aggregated_variable_status_hooks:
+                continue
+            counts = self._statuses.get_counts(variable_name=variable_name)
+            total += counts.total
+            checked += counts.total - counts.loading - counts.stale
+        return VariableStatusProgress(checked=checked, total=total)
+
+    def prioritize(self, variable_names: Iterable[str]) -> None:
+        """
+        Moves the waiting refreshes of the given variables to the front of the
+        queue. It should be called with the variables of the current view.
+        """
+        self._scheduler.prioritize(variable_names=variable_names)
+
+    def invalidate_prepare_cache(self, variable_name: Optional[str] = None) -> None:
+        """
+        Invalidates the shared prepare step artifacts of the given variable or
+        every variable, the next refresh will execute the prepare step again.
+        """
+        if variable_name is None:
+            variable_names = list(self._aggregated_variable_status_hooks)
+        else:
+            variable_names = [variable_name]
+        for name in variable_names:
+            hook = self._aggregated_variable_status_hooks.get(name)
+            if hook is None or not hook.prepare_step_necessary:
+                continue
+            marker_path = (
+                self._settings.dm_cache_prepare_steps
+                / hook.get_fingerprint()
+                / VariableStatusRefreshTask.PREPARED_MARKER_FILE_NAME
+            )
+            try:
+                marker_path.unlink()
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """
+        Cancels the waiting refreshes and terminates the processes of the
+        running ones, only the built-in checkers finish in the background. It
+        should be called before exiting.
+        """
+        self._scheduler.shutdown()
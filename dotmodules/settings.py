@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -16,11 +16,45 @@ class Settings:
     # The relative modules path has to be set explicitly.
     raw_relative_modules_path: Optional[Path] = None
 
+    # The cache directory defaults to the '.dm_cache' directory in the dm
+    # repository root.
+    raw_dm_cache_root: Optional[Path] = None
+
     # Core settings
     debug: bool = False
     deployment_target: str = ""
     config_file_name: str = "dm.toml"
 
+    # Module discovery settings
+    discovery_ignored_directory_names: Tuple[str, ...] = (".git", "node_modules")
+    discovery_use_ignore_files: bool = True
+    discovery_stop_at_module_roots: bool = False
+    discovery_worker_count: int = 4
+    discovery_force_rescan: bool = False
+
+    # Module loading settings
+    toml_backend: str = ""
+    parsed_config_cache_enabled: bool = True
+    module_loading_worker_count: int = 0
+    module_loading_parallel_threshold: int = 32
+
+    # Link handling settings
+    link_probe_worker_count: int = 8
+    link_deploy_worker_count: int = 8
+    link_engine: str = "native"
+
+    # Variable status settings
+    variable_status_executor: str = "thread"
+    variable_status_worker_count: int = 4
+    variable_status_cache_enabled: bool = True
+    variable_status_cache_ttl: int = 0
+    variable_status_prepare_cache_ttl: int = 300
+
+    # Hook execution settings
+    hook_parallelism: int = 1
+    hook_output_mode: str = "prefixed"
+    hook_scheduling: str = "priority"
+
     # UI settings
     text_wrap_limit: int = 90
     indent: int = 2
@@ -28,6 +62,7 @@ class Settings:
     prompt_template: str = "<<SPACE>><<BOLD>>dm<<RESET>><<SPACE>>#<<SPACE>>"
     hotkey_exit: str = "q|quit|exit"
     hotkey_help: str = "help"
+    hotkey_deploy: str = "d|deploy"
     hotkey_hooks: str = "h|hooks"
     hotkey_modules: str = "m|modules"
     hotkey_variables: str = "v|variables"
@@ -54,8 +89,33 @@ class Settings:
         The current working directory is the dm repository root for the
         following path definitions.
         """
+        if self.raw_dm_cache_root:
+            return self.raw_dm_cache_root.resolve()
         return (Path.cwd() / ".dm_cache").resolve()
 
+    @property
+    def dm_cache_persistent(self) -> Path:
+        """
+        Cache directory that won't be flushed on startup.
+        """
+        return self.dm_cache_root / "persistent"
+
+    @property
+    def dm_cache_discovery_index(self) -> Path:
+        return self.dm_cache_persistent / "discovery_index.json"
+
+    @property
+    def dm_cache_parsed_configs(self) -> Path:
+        return self.dm_cache_persistent / "parsed_configs"
+
+    @property
+    def dm_cache_variable_statuses(self) -> Path:
+        return self.dm_cache_persistent / "variable_statuses"
+
+    @property
+    def dm_cache_prepare_steps(self) -> Path:
+        return self.dm_cache_persistent / "prepare_steps"
+
     @property
     def dm_cache_variables(self) -> Path:
         return self.dm_cache_root / "variables"
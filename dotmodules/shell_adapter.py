@@ -1,7 +1,12 @@
+import os
+import signal
 import subprocess  # nosec B404
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
+
+# Callback that receives a started process.
+ProcessStartedCallbackType = Callable[["subprocess.Popen[bytes]"], None]
 
 
 class ShellAdapterError(Exception):
@@ -35,17 +40,31 @@ class ShellAdapter:
 
     @classmethod
     def execute_and_capture(
-        cls, command: List[str], cwd: Optional[Path] = None
+        cls,
+        command: List[str],
+        cwd: Optional[Path] = None,
+        stdin: Optional[bytes] = None,
+        on_start: Optional[ProcessStartedCallbackType] = None,
     ) -> ShellResult:
+        """
+        Executes the command and captures its output. If a start callback is
+        given, the command is started in a new process group, and the started
+        process is passed to the callback, so the caller can terminate the
+        command with its child processes from another thread.
+        """
         cls.validate_command(command=command)
         process = subprocess.Popen(
             command,
+            stdin=subprocess.PIPE if stdin is not None else None,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             cwd=cwd,
             shell=False,  # nosec B603
+            start_new_session=on_start is not None,
         )
-        stdout, stderr = process.communicate()
+        if on_start is not None:
+            on_start(process)
+        stdout, stderr = process.communicate(input=stdin)
         status_code = process.wait()
 
         result = ShellResult(
@@ -64,6 +83,20 @@ class ShellAdapter:
 
         return result
 
+    @staticmethod
+    def terminate_process_group(process: "subprocess.Popen[bytes]") -> None:
+        """
+        Terminates the still running process that was started in a new process
+        group, together with the child processes in its group.
+        """
+        if process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            # The process exited meanwhile.
+            pass
+
     @classmethod
     def execute_interactively(
         cls, command: List[str], cwd: Optional[Path] = None
@@ -76,3 +109,30 @@ class ShellAdapter:
         except subprocess.CalledProcessError as e:
             status_code = e.returncode
         return status_code
+
+    @classmethod
+    def execute_and_stream(
+        cls,
+        command: List[str],
+        on_line: Callable[[str], None],
+        cwd: Optional[Path] = None,
+    ) -> int:
+        """
+        Executes the command with its standard output and standard error merged
+        and passes the output to the given callback line by line as it
+        arrives. The command cannot read from the terminal, as it might be
+        executed next to other commands.
+        """
+        cls.validate_command(command=command)
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=cwd,
+            shell=False,  # nosec B603
+        )
+        if process.stdout is not None:
+            for raw_line in process.stdout:
+                on_line(raw_line.decode(errors="replace").rstrip("\n"))
+        return process.wait()
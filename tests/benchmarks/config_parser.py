@@ -0,0 +1,104 @@
+"""
+Benchmarks the config parser validation on large synthetic module configurations
+with thousands of link items and variable values. The documents are generated
+in memory, so only the parsing and validation is measured, not the decoding.
+
+Usage: python tests/benchmarks/config_parser.py [--items N] [--rounds N]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from dotmodules.modules.loader import ConfigLoader
+from dotmodules.modules.parser import ConfigParser
+
+DEPLOYMENT_TARGET = "benchmark"
+
+
+class InMemoryLoader(ConfigLoader):
+    def __init__(
+        self, config_file_path: Path, content: bytes, backend: str = ""
+    ) -> None:
+        self.data: Dict[str, Any] = {}
+
+    def get(self, key: str) -> Any:
+        return self.data[key]
+
+    def get_all(self) -> Dict[str, Any]:
+        return self.data
+
+
+def generate_document(item_count: int) -> Dict[str, Any]:
+    half = item_count // 2
+    return {
+        "name": "benchmark",
+        "version": "1.0.0",
+        "enabled": True,
+        "variables": {
+            f"VARIABLE_{index}": [f"value_{index}_{i}" for i in range(10)]
+            for index in range(item_count // 10)
+        },
+        "link": [
+            {
+                "name": f"link_{index}",
+                "path_to_target": f"./target_{index}",
+                "path_to_symlink": f"$HOME/.config/link_{index}",
+            }
+            for index in range(half)
+        ],
+        f"link__{DEPLOYMENT_TARGET}": [
+            {
+                "name": f"link_{index}",
+                "path_to_target": f"./target_{index}",
+                "path_to_symlink": f"$HOME/.config/link_{index}",
+            }
+            for index in range(half, item_count)
+        ],
+        "shell_script_hook": [
+            {
+                "name": f"HOOK_{index}",
+                "path_to_script": f"./hook_{index}.sh",
+                "priority": index,
+            }
+            for index in range(half)
+        ],
+        f"shell_script_hook__{DEPLOYMENT_TARGET}": [
+            {
+                "name": f"HOOK_{index}",
+                "path_to_script": f"./hook_{index}.sh",
+                "priority": index,
+            }
+            for index in range(half, item_count)
+        ],
+    }
+
+
+def benchmark(item_count: int, rounds: int) -> None:
+    loader = InMemoryLoader(config_file_path=Path("dm.toml"), content=b"")
+    loader.data = generate_document(item_count=item_count)
+    parser = ConfigParser(loader=loader)
+    print(
+        f"Parsing a config with {item_count} links, {item_count} hooks and "
+        f"{item_count} variable values {rounds} times.."
+    )
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.parse_all(deployment_target=DEPLOYMENT_TARGET)
+    elapsed = time.perf_counter() - start
+    print(f"  parse_all        {elapsed:8.3f}s  {elapsed / rounds * 1000:8.2f}ms/round")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--rounds", type=int, default=10)
+    parsed_args = parser.parse_args()
+
+    for item_count in parsed_args.items:
+        benchmark(item_count=item_count, rounds=parsed_args.rounds)
+
+
+if __name__ == "__main__":
+    main()
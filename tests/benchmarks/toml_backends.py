@@ -0,0 +1,94 @@
+"""
+Benchmarks the available TOML backends by decoding every configuration file of
+a modules directory. If no modules directory is given, a synthetic one will be
+generated.
+
+Usage: python tests/benchmarks/toml_backends.py [--modules-path PATH]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from dotmodules.modules.discovery import ModuleDiscovery
+from dotmodules.modules.loader import get_available_toml_backends, get_toml_backend
+
+SYNTHETIC_CONFIG = """
+name = "module_{index}"
+version = "1.0.{index}"
+enabled = true
+documentation = \"\"\"
+Synthetic module {index} generated for benchmarking.
+\"\"\"
+
+[variables]
+PACKAGES = ["package_{index}_1", "package_{index}_2", "package_{index}_3"]
+
+[[link]]
+name = "config"
+path_to_target = "./config"
+path_to_symlink = "$HOME/.config/module_{index}"
+
+[[shell_script_hook]]
+name = "INSTALL"
+path_to_script = "./install.sh"
+priority = {index}
+"""
+
+
+def generate_synthetic_modules(root: Path, module_count: int) -> None:
+    for index in range(module_count):
+        module_path = root / f"category_{index % 10}" / f"module_{index}"
+        module_path.mkdir(parents=True)
+        (module_path / "dm.toml").write_text(SYNTHETIC_CONFIG.format(index=index))
+
+
+def benchmark(modules_path: Path, config_file_name: str, rounds: int) -> None:
+    discovery = ModuleDiscovery(config_file_name=config_file_name)
+    discovery_result = discovery.discover(modules_root_path=modules_path)
+    contents: List[str] = [
+        path.read_bytes().decode("utf-8") for path in discovery_result.config_file_paths
+    ]
+    print(f"Decoding {len(contents)} config files {rounds} times..")
+
+    for backend_name in get_available_toml_backends():
+        backend = get_toml_backend(name=backend_name)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for content in contents:
+                backend.loads(content)
+        elapsed = time.perf_counter() - start
+        per_file = elapsed / max(len(contents) * rounds, 1) * 1_000_000
+        print(f"  {backend_name:<16} {elapsed:8.3f}s  {per_file:8.1f}us/file")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modules-path", type=Path)
+    parser.add_argument("--config-file-name", default="dm.toml")
+    parser.add_argument("--module-count", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=10)
+    parsed_args = parser.parse_args()
+
+    if parsed_args.modules_path:
+        benchmark(
+            modules_path=parsed_args.modules_path,
+            config_file_name=parsed_args.config_file_name,
+            rounds=parsed_args.rounds,
+        )
+    else:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            modules_path = Path(temporary_directory)
+            generate_synthetic_modules(
+                root=modules_path, module_count=parsed_args.module_count
+            )
+            benchmark(
+                modules_path=modules_path,
+                config_file_name="dm.toml",
+                rounds=parsed_args.rounds,
+            )
+
+
+if __name__ == "__main__":
+    main()
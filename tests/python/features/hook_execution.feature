@@ -0,0 +1,76 @@
+Feature: Hook execution
+
+  As a user of the dotmodules system,
+  I want the independent hooks to be executed at the same time,
+  So that a hook defined in many modules doesn't take minutes to run.
+
+  The hooks with the same priority are executed in parallel, the next priority
+  level is only started after the previous one has finished.
+
+  Background:
+    Given the hook adapter dependencies are available
+    And I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+    And I added a file to "./module_1/install.sh" with content:
+      echo "installing module 1"
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 1
+    And I added a file to "./module_2/install.sh" with content:
+      echo "installing module 2"
+      exit 3
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    And I added a file to "./module_3/install.sh" with content:
+      echo "installing module 3"
+    And I added a config file to "./module_3" with content:
+      name = "Module 3"
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 1
+
+  Scenario: Hooks of the same priority are executed in parallel
+    Given I set the hook parallelism to "4"
+    When I run the dotmodules system
+    And I execute the hooks named "INSTALL"
+    Then the hooks should have been executed in order:
+      Module 2
+      Module 1
+      Module 3
+    And "1" hook should have failed
+    And the hook output should contain the line:
+      [Module 1] installing module 1
+
+  Scenario: Hook outputs can be grouped by hook
+    Given I set the hook parallelism to "4"
+    And I set the hook output mode to "grouped"
+    When I run the dotmodules system
+    And I execute the hooks named "INSTALL"
+    Then "1" hook should have failed
+    And the hook output should contain the line:
+      [Module 3] installing module 3
+
+  Scenario: Hooks can be scheduled by the module dependencies
+    Given I set the hook parallelism to "4"
+    And I set the hook scheduling to "dependencies"
+    And I added a config file to "./module_4" with content:
+      name = "Module 4"
+      depends_on = ["Module 2"]
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "../module_1/install.sh"
+      priority = 0
+    When I run the dotmodules system
+    And I execute the hooks named "INSTALL"
+    Then "1" hook should have failed
+    And "1" hook should have been skipped
+    And the hook output should contain the line:
+      [Module 3] installing module 3
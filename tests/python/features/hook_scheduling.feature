@@ -0,0 +1,94 @@
+Feature: Hook scheduling
+
+  As a user of the dotmodules system,
+  I want the hooks to be started in a predictable order,
+  So that a hook can rely on the hooks it has to wait for.
+
+  The scheduling is verified with stub hooks that only wait for a while, so
+  these scenarios don't need the hook adapter dependencies.
+
+  Background:
+    Given I set the hook parallelism to "4"
+
+  Scenario: Every priority level is a barrier
+    When I execute the stub hooks:
+      Module 1: priority=0 duration=0.2 exit=0
+      Module 2: priority=0 duration=0.05 exit=0
+      Module 3: priority=1 duration=0.05 exit=0
+    Then the hooks should have been executed in order:
+      Module 1
+      Module 2
+      Module 3
+    And the stub hooks of modules "Module 1" and "Module 2" should have been executed at the same time
+    And the stub hook of module "Module 3" should have been started after the stub hook of module "Module 1" finished
+    And "0" hooks should have failed
+
+  Scenario: Hooks are executed one after another without parallelism
+    Given I set the hook parallelism to "1"
+    When I execute the stub hooks:
+      Module 1: priority=0 duration=0.05 exit=0
+      Module 2: priority=0 duration=0.05 exit=0
+    Then the stub hook of module "Module 2" should have been started after the stub hook of module "Module 1" finished
+
+  Scenario: Captured outputs are prefixed by the module names
+    When I execute the stub hooks:
+      Module 1: priority=0 duration=0.2 exit=0
+      Module 2: priority=0 duration=0.05 exit=1
+    Then "1" hook should have failed
+    And the hook output should contain the line:
+      [Module 1] Module 1 finished
+    And the hook output should contain the line:
+      [Module 2] Module 2 started
+
+  Scenario: Captured outputs can be grouped by hook
+    Given I set the hook output mode to "grouped"
+    When I execute the stub hooks:
+      Module 1: priority=0 duration=0.2 exit=0
+      Module 2: priority=0 duration=0.05 exit=0
+    Then the hook output should be:
+      [Module 2] Module 2 started
+      [Module 2] Module 2 finished
+      [Module 1] Module 1 started
+      [Module 1] Module 1 finished
+
+  Scenario: Hooks scheduled by the module dependencies don't wait for the priority levels
+    Given the modules of the stub hooks depend on:
+      Module 3 -> Module 2
+    When I execute the stub hooks by the module dependencies:
+      Module 1: priority=0 duration=0.3 exit=0
+      Module 2: priority=0 duration=0.05 exit=0
+      Module 3: priority=1 duration=0.05 exit=0
+    Then "0" hooks should have failed
+    And the stub hook of module "Module 3" should have been started after the stub hook of module "Module 2" finished
+    And the stub hook of module "Module 3" should have been started before the stub hook of module "Module 1" finished
+
+  Scenario: Hooks depending on a failed hook are skipped
+    Given the modules of the stub hooks depend on:
+      Module 2 -> Module 1
+      Module 3 -> Module 2
+    When I execute the stub hooks by the module dependencies:
+      Module 1: priority=0 duration=0.05 exit=1
+      Module 2: priority=0 duration=0.05 exit=0
+      Module 3: priority=0 duration=0.05 exit=0
+      Module 4: priority=0 duration=0.05 exit=0
+    Then the hooks should have been executed in order:
+      Module 1
+      Module 2
+      Module 3
+      Module 4
+    And "1" hook should have failed
+    And "2" hooks should have been skipped
+    And the stub hooks of modules "Module 1" and "Module 4" should have been executed at the same time
+
+  Scenario: The critical path is the slowest chain of dependent hooks
+    Given the modules of the stub hooks depend on:
+      Module 2 -> Module 1
+      Module 4 -> Module 3
+    When I execute the stub hooks by the module dependencies:
+      Module 1: priority=0 duration=0.05 exit=0
+      Module 2: priority=0 duration=0.05 exit=0
+      Module 3: priority=0 duration=0.2 exit=0
+      Module 4: priority=0 duration=0.05 exit=0
+    Then the critical path of the hook execution should be:
+      Module 3
+      Module 4
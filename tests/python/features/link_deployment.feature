@@ -0,0 +1,83 @@
+Feature: Link deployment
+
+  As a user of the dotmodules system,
+  I want to deploy the links of every module at once,
+  So that bootstrapping a machine doesn't need one hook execution per module.
+
+  The links of every enabled module are collected into a single plan. The
+  creatable links are grouped by their parent directories, and nothing that
+  already exists at a symlink path is overwritten.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+    And my home directory is at "./home"
+    And I added a directory to "./home"
+
+  Scenario: Links of every module are deployed in a single plan
+    Given I added a config file to "./module_1" with content:
+      [[link]]
+      name = "a"
+      path_to_target = "./config_a"
+      path_to_symlink = "$HOME/.config/a"
+
+      [[link]]
+      name = "b"
+      path_to_target = "./config_b"
+      path_to_symlink = "$HOME/.config/b"
+    And I added a config file to "./module_2" with content:
+      [[link]]
+      name = "c"
+      path_to_target = "./config_c"
+      path_to_symlink = "$HOME/c"
+
+      [[link]]
+      name = "a"
+      path_to_target = "../module_1/config_a"
+      path_to_symlink = "$HOME/.config/a"
+    And I added an empty file to "./module_1/config_a"
+    And I added an empty file to "./module_1/config_b"
+    And I added an empty file to "./module_2/config_c"
+    When I run the dotmodules system
+    And I build the link plan
+    Then the link plan should create "3" links in "2" directories
+    When I apply the link plan
+    Then "3" links should have been created
+    And the module at index "1" should have the following link states:
+      matched
+      matched
+    And the module at index "2" should have the following link states:
+      matched
+      matched
+
+  Scenario: Existing paths and conflicting links are not deployed
+    Given I added a config file to "./module_1" with content:
+      [[link]]
+      name = "deployed"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/deployed"
+
+      [[link]]
+      name = "blocked"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/blocked"
+
+      [[link]]
+      name = "conflicting"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/conflicting"
+    And I added a config file to "./module_2" with content:
+      [[link]]
+      name = "conflicting"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/conflicting"
+    And I added an empty file to "./module_1/config"
+    And I added an empty file to "./module_2/config"
+    And I added an empty file to "./home/blocked"
+    And I added a symlink to "./home/deployed" pointing to "./module_1/config"
+    When I run the dotmodules system
+    And I build the link plan
+    Then the link plan should create "0" links in "0" directories
+    And the link plan should have "1" unchanged, "1" blocked and "1" conflicting links
+    When I apply the link plan
+    Then "0" links should have been created
@@ -0,0 +1,124 @@
+Feature: Link hooks
+
+  As a user of the dotmodules system,
+  I want the links to be deployed and cleaned up without forking processes,
+  So that modules with thousands of links can be deployed quickly.
+
+  The native link engine makes the same decisions as the shell adapter
+  scripts: an existing correct symlink is left alone, and everything else at
+  the symlink path needs a user decision.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+    And my home directory is at "./home"
+    And I set the link engine to "native"
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+      [[link]]
+      name = "new"
+      path_to_target = "./config_new"
+      path_to_symlink = "$HOME/.config/new"
+
+      [[link]]
+      name = "existing"
+      path_to_target = "./config_existing"
+      path_to_symlink = "$HOME/existing"
+    And I added an empty file to "./module_1/config_new"
+    And I added an empty file to "./module_1/config_existing"
+
+  Scenario: Missing links are created with their parent directories
+    Given I added a symlink to "./home/existing" pointing to "./module_1/config_existing"
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    And I invalidate the link states
+    Then "0" hooks should have failed
+    And the module at index "1" should have the following link states:
+      matched
+      matched
+
+  Scenario: Existing files can be backed up
+    Given I added a file to "./home/existing" with content:
+      my config
+    And I will answer the prompts with:
+      x
+      b
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    And I invalidate the link states
+    Then "0" hooks should have failed
+    And the module at index "1" should have the following link states:
+      matched
+      matched
+
+  Scenario: Existing files are not touched without user input
+    Given I set the hook parallelism to "2"
+    And I added a file to "./home/existing" with content:
+      my config
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [[link]]
+      name = "other"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/other"
+    And I added an empty file to "./module_2/config"
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    And I invalidate the link states
+    Then "1" hook should have failed
+    And the hook output should contain the line:
+      [Module 1]   │ !! │ Link handling failed: no user input available
+    And there should be a file at "./home/existing" with content:
+      my config
+    And the module at index "2" should have the following link states:
+      matched
+
+  Scenario: Links are removed after confirmation
+    Given I added a symlink to "./home/.config/new" pointing to "./module_1/config_new"
+    And I added a symlink to "./home/existing" pointing to "./module_1/config_existing"
+    And I will answer the prompts with:
+      y
+      n
+    When I run the dotmodules system
+    And I execute the hooks named "CLEAN_UP_LINKS"
+    And I invalidate the link states
+    Then "0" hooks should have failed
+    And the module at index "1" should have the following link states:
+      missing
+      matched
+
+  Scenario: Links are passed to the shell adapters in an argument items file
+    Given the hook adapter dependencies are available
+    And I set the link engine to "shell"
+    And I added a symlink to "./home/existing" pointing to "./module_1/config_existing"
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    And I invalidate the link states
+    Then "0" hooks should have failed
+    And the module at index "1" should have the following link states:
+      matched
+      matched
+
+  Scenario: Links without sufficient privileges are passed to the shell adapters
+    Given I added a symlink to "./home/existing" pointing to "./module_1/config_existing"
+    And creating symlinks in "./home/.config" is not permitted
+    And the shell hook adapter executions are recorded
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    Then "0" hooks should have failed
+    And the shell hook adapters should have handled the links:
+      new
+
+  Scenario: Links without sufficient privileges are passed on before any prompt
+    Given I added a file to "./home/existing" with content:
+      my config
+    And writing to "./home" is not permitted
+    And the shell hook adapter executions are recorded
+    When I run the dotmodules system
+    And I execute the hooks named "DEPLOY_LINKS"
+    Then "0" hooks should have failed
+    And the shell hook adapters should have handled the links:
+      new
+      existing
+    And there should be a file at "./home/existing" with content:
+      my config
@@ -55,3 +55,112 @@ Feature: Module discovery
       ./modules/category_2/module_2
       ./modules/category_3/module_3
     And there should be no module level errors
+
+  Scenario: Ignored directories should not be searched for modules
+    Given I added an empty config file to "./module_1"
+    And I added an empty config file to "./module_1/node_modules/module_2"
+    And I added an empty config file to "./.git/module_3"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the modules should have the following relative roots:
+      ./modules/module_1
+    And the module discovery should have pruned "2" directories
+    And there should be no module level errors
+
+  Scenario: The ignored directory names should be configurable
+    Given I set the ignored directory names to "vendor"
+    And I added an empty config file to "./module_1"
+    And I added an empty config file to "./vendor/module_2"
+    And I added an empty config file to "./node_modules/module_3"
+    When I run the dotmodules system
+    Then there should be "2" loaded modules
+    And the modules should have the following relative roots:
+      ./modules/module_1
+      ./modules/node_modules/module_3
+    And the module discovery should have pruned "1" directory
+    And there should be no module level errors
+
+  Scenario: Directories listed in ignore files should not be searched for modules
+    Given I added a file to "./.dmignore" with content:
+      # Vendored plugin trees
+      vendor_*
+    And I added a file to "./category/.dmignore" with content:
+      plugins/*
+    And I added an empty config file to "./module_1"
+    And I added an empty config file to "./vendor_1/module_2"
+    And I added an empty config file to "./category/module_3"
+    And I added an empty config file to "./category/plugins/plugin_1/module_4"
+    When I run the dotmodules system
+    Then there should be "2" loaded modules
+    And the modules should have the following relative roots:
+      ./modules/module_1
+      ./modules/category/module_3
+    And the module discovery should have pruned "2" directories
+    And there should be no module level errors
+
+  Scenario: Nested modules should be discovered by default
+    Given I added an empty config file to "./module_1"
+    And I added an empty config file to "./module_1/module_2"
+    When I run the dotmodules system
+    Then there should be "2" loaded modules
+    And there should be no module level errors
+
+  Scenario: Discovery can be stopped at the module roots
+    Given I enabled stopping the discovery at the module roots
+    And I added an empty config file to "./module_1"
+    And I added an empty config file to "./module_1/module_2"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the modules should have the following relative roots:
+      ./modules/module_1
+    And there should be no module level errors
+
+  Scenario: Unchanged directories should be served from the discovery index
+    Given I added an empty config file to "./category/module_1"
+    And I added an empty config file to "./category/module_2"
+    And every directory in the modules directory was last modified an hour ago
+    And I ran the dotmodules system
+    And I added an empty config file to "./module_3"
+    When I run the dotmodules system
+    Then there should be "3" loaded modules
+    And the modules should have the following relative roots:
+      ./modules/category/module_1
+      ./modules/category/module_2
+      ./modules/module_3
+    And the module discovery should have reused "3" directories
+    And there should be no module level errors
+
+  Scenario: Removed modules should not be served from the discovery index
+    Given I added an empty config file to "./module_1"
+    And I added an empty config file to "./module_2"
+    And every directory in the modules directory was last modified an hour ago
+    And I ran the dotmodules system
+    And I removed the directory "./module_2"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the modules should have the following relative roots:
+      ./modules/module_1
+    And there should be no module level errors
+
+  Scenario: Changed ignore files should invalidate the discovery index
+    Given I added a file to "./.dmignore" with content:
+      vendor
+    And I added an empty config file to "./module_1"
+    And I added an empty config file to "./vendor/module_2"
+    And every directory in the modules directory was last modified an hour ago
+    And I ran the dotmodules system
+    And I added a file to "./.dmignore" with content:
+      # Nothing is ignored
+    When I run the dotmodules system
+    Then there should be "2" loaded modules
+    And there should be no module level errors
+
+  Scenario: A full rescan can be forced
+    Given I added an empty config file to "./module_1"
+    And every directory in the modules directory was last modified an hour ago
+    And I ran the dotmodules system
+    And I forced a full module rescan
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module discovery should have reused "0" directories
+    And there should be no module level errors
@@ -0,0 +1,157 @@
+Feature: Module loading
+
+  As a user of the dotmodules system,
+  I want my modules to be loaded quickly,
+  So that I can start working with them without waiting.
+
+  The validated configuration of a module is cached between the sessions. The
+  cached result is only used if the configuration file content and the
+  deployment target are the same as they were at the time of caching.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+
+  Scenario: Unchanged configurations should be served from the cache
+    Given I added a config file to "./module_1" with content:
+      name = "My module"
+    And I ran the dotmodules system
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module at index "1" should have its name set to "My module"
+    And the parsed config cache should have served "1" module
+    And there should be no module level errors
+
+  Scenario: Changed configurations should be parsed again
+    Given I added a config file to "./module_1" with content:
+      name = "My module"
+    And I ran the dotmodules system
+    And I added a config file to "./module_1" with content:
+      name = "My_module"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module at index "1" should have its name set to "My_module"
+    And the parsed config cache should have served "0" modules
+    And there should be no module level errors
+
+  Scenario: Cached configurations should be separated by deployment target
+    Given I added a config file to "./module_1" with content:
+      [enabled]
+      default = true
+      other = false
+    And I am using the "other" deployment target
+    And I ran the dotmodules system
+    And I am using the default deployment target
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module at index "1" should be enabled
+    And the parsed config cache should have served "0" modules
+    And there should be no module level errors
+
+  Scenario: Corrupted cache entries should be ignored
+    Given I added a config file to "./module_1" with content:
+      name = "My module"
+    And I ran the dotmodules system
+    And I corrupted the parsed config cache
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module at index "1" should have its name set to "My module"
+    And the parsed config cache should have served "0" modules
+    And there should be no module level errors
+
+  Scenario: Cache entries of removed configurations should be pruned
+    Given I added a config file to "./module_1" with content:
+      name = "Module 1"
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+    And I ran the dotmodules system
+    And I removed the directory "./module_2"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the parsed config cache should have served "1" module
+    And the parsed config cache should have pruned "1" entry
+    And there should be no module level errors
+
+  Scenario: Invalid configurations should not be cached
+    Given I added a config file to "./module_1" with content:
+      name = 42
+    And I ran the dotmodules system
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Value for section 'name' should be a string, got int!
+
+  Scenario: Sections of other deployment targets should not be validated
+    Given I added a config file to "./module_1" with content:
+      name = "My module"
+      unknown_section = 42
+      variables__other = 42
+      variables__my__target = { VAR = "value" }
+    And I am using the "my__target" deployment target
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the module at index "1" should have the following variables:
+      {"VAR": ["value"]}
+    And there should be no module level errors
+
+  Scenario: Modules should be loadable in parallel
+    Given I am loading the modules in parallel with "2" workers
+    And I added a config file to "./category_2/module_2" with content:
+      name = "Module 2"
+    And I added a config file to "./category_1/module_1" with content:
+      name = "Module 1"
+    And I added a config file to "./category_1/module_3" with content:
+      name = "Module 3"
+    When I run the dotmodules system
+    Then there should be "3" loaded modules
+    And the modules should have the following relative roots in order:
+      ./modules/category_1/module_1
+      ./modules/category_1/module_3
+      ./modules/category_2/module_2
+    And the module at index "3" should have its name set to "Module 2"
+    And there should be no module level errors
+
+  Scenario: Parallel loading should report the first failing path in order
+    Given I am loading the modules in parallel with "2" workers
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+    And I added a config file to "./module_3" with content:
+      name = 3
+    And I added a config file to "./module_2" with content:
+      version = 2
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      module_2/dm.toml': Configuration syntax error: Value for section 'version' should be a string, got int!
+
+  Scenario: The standard library TOML backend should be selectable
+    Given I am using the "tomllib" TOML backend
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+      name = "Module 2"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Toml loading error: Cannot overwrite a value
+
+  Scenario: Unknown TOML backends should be reported
+    Given I set the TOML backend to "unknown"
+    And I added an empty config file to "./module_1"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Configuration loading error: Unknown TOML backend 'unknown'
+
+  Scenario: Module statuses should be memoized until the modules are invalidated
+    Given I added a config file to "./module_1" with content:
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    When I run the dotmodules system
+    Then the module at index "1" should have the status "error"
+    When I add an empty file to "./module_1/install.sh"
+    Then the module at index "1" should have the status "error"
+    When I invalidate the module states
+    Then the module at index "1" should have the status "deployed"
+    And there should be no module level errors
@@ -0,0 +1,91 @@
+Feature: Module dependencies
+
+  As a user of the dotmodules system,
+  I want to declare which modules a module depends on,
+  So that the hooks of independent modules don't have to wait for each other.
+
+  A hook depends on the hooks with the same name of every module its module
+  depends on directly or indirectly, and on the lower priority hooks of its own
+  module.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+
+  Scenario: Hooks should depend on the hooks of the depended modules
+    Given I added a config file to "./module_2" with content:
+      name = "Module 2"
+      depends_on = ["Module 1"]
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    And I added a config file to "./module_3" with content:
+      name = "Module 3"
+      depends_on = ["Module 2"]
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    And I added a config file to "./module_4" with content:
+      name = "Module 4"
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    When I run the dotmodules system
+    Then the "INSTALL" hook of module "Module 1" should not depend on any hooks
+    And the "INSTALL" hook of module "Module 4" should not depend on any hooks
+    And the "INSTALL" hook of module "Module 3" should depend on the hooks of modules:
+      Module 1
+      Module 2
+
+  Scenario: Dependencies on disabled modules should be ignored
+    Given I added a config file to "./module_2" with content:
+      name = "Module 2"
+      enabled = false
+    And I added a config file to "./module_3" with content:
+      name = "Module 3"
+      depends_on = ["Module 2"]
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./install.sh"
+      priority = 0
+    When I run the dotmodules system
+    Then the "INSTALL" hook of module "Module 3" should not depend on any hooks
+
+  Scenario: Module dependencies should be a list of module names
+    Given I added a config file to "./module_2" with content:
+      name = "Module 2"
+      depends_on = "Module 1"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      The value for section 'depends_on' should be a list of module names!
+
+  Scenario: Depending on an unknown module is an error
+    Given I added a config file to "./module_2" with content:
+      name = "Module 2"
+      depends_on = ["Module 42"]
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Module 'Module 2' depends on unknown module 'Module 42'!
+
+  Scenario: Module dependency cycles are detected
+    Given I added a config file to "./module_2" with content:
+      name = "Module 2"
+      depends_on = ["Module 3"]
+    And I added a config file to "./module_3" with content:
+      name = "Module 3"
+      depends_on = ["Module 2"]
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Module dependency cycle detected: Module 2 -> Module 3 -> Module 2!
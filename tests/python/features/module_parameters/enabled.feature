@@ -34,9 +34,19 @@ Feature: Module enabled flag
     And there should be no module level errors
 
   Scenario: Invalid boolean values should raise an error
-    Given I added a config file to "./category/module" with content:
+    Given I am using the "toml" TOML backend
+    And I added a config file to "./category/module" with content:
+      enabled = False
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Only all lowercase booleans allowed
+
+  Scenario: Invalid boolean values should raise an error with the standard library backend
+    Given I am using the "tomllib" TOML backend
+    And I added a config file to "./category/module" with content:
       enabled = False
     When I run the dotmodules system
     Then there should be no modules loaded
     And a global error should have been raised:
-      Only all lowercase booleans allowed
\ No newline at end of file
+      Invalid value (at line 1, column 11)
\ No newline at end of file
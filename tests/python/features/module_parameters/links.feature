@@ -50,4 +50,113 @@ Feature: Module links
     Then there should be "1" loaded module
     And the module at index "1" should have "1" link registered
     And there should be a module level error for module at index "1":
-      Link[My link]: path_to_target 'my/path/to/target' does not name a file or directory!
\ No newline at end of file
+      Link[My link]: path_to_target 'my/path/to/target' does not name a file or directory!
+
+  Scenario: Deployment target specific links should not redefine global links
+    Given I added a config file to "./module" with content:
+      [[link]]
+      name = "My link"
+      path_to_target = "./config"
+      path_to_symlink = "my/path/to/symlink"
+
+      [[link__my_target]]
+      name = "My other link"
+      path_to_target = "./other_config"
+      path_to_symlink = "my/path/to/other_symlink"
+
+      [[link__my_target]]
+      name = "My link"
+      path_to_target = "./config"
+      path_to_symlink = "my/path/to/symlink"
+    And I am using the "my_target" deployment target
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Deployment target specific link section 'link__my_target' contains an already defined link item!
+
+  Scenario: Link items should have every mandatory field with the expected type
+    Given I added a config file to "./module" with content:
+      [[link]]
+      name = "My link"
+      path_to_target = "./config"
+      path_to_symlink = "my/path/to/symlink"
+
+      [[link]]
+      name = 42
+      path_to_target = "./config"
+      path_to_symlink = "my/path/to/symlink"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      The value for field 'name' should be an str in section 'link' item at index 2!
+
+  Scenario: Link items should not have unexpected fields
+    Given I added a config file to "./module" with content:
+      [[link]]
+      name = "My link"
+      path_to_target = "./config"
+      path_to_symlink = "my/path/to/symlink"
+      mode = "copy"
+      owner = "me"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Unexpected fields 'mode', 'owner' found for section 'link' item at index 1!
+
+  Scenario: Link states should be probed for every link
+    Given my home directory is at "./home"
+    And I added a config file to "./module" with content:
+      [[link]]
+      name = "matched"
+      path_to_target = "./config_a"
+      path_to_symlink = "$HOME/a"
+
+      [[link]]
+      name = "missing"
+      path_to_target = "./config_b"
+      path_to_symlink = "$HOME/b"
+
+      [[link]]
+      name = "mismatch"
+      path_to_target = "./config_c"
+      path_to_symlink = "$HOME/c"
+
+      [[link]]
+      name = "dangling"
+      path_to_target = "./config_d"
+      path_to_symlink = "$HOME/d"
+    And I added an empty file to "./module/config_a"
+    And I added an empty file to "./module/config_b"
+    And I added an empty file to "./module/config_c"
+    And I added an empty file to "./module/config_d"
+    And I added a symlink to "./home/a" pointing to "./module/config_a"
+    And I added a symlink to "./home/c" pointing to "./module/config_a"
+    And I added a symlink to "./home/d" pointing to "./module/non_existent"
+    When I run the dotmodules system
+    Then the module at index "1" should have the following link states:
+      matched
+      missing
+      mismatch
+      dangling
+    And the module at index "1" should have the status "incomplete"
+    And there should be no module level errors
+
+  Scenario: Link states should be kept until a link hook runs
+    Given my home directory is at "./home"
+    And I added a config file to "./module" with content:
+      [[link]]
+      name = "My link"
+      path_to_target = "./config"
+      path_to_symlink = "$HOME/config"
+    And I added an empty file to "./module/config"
+    When I run the dotmodules system
+    Then the module at index "1" should have the following link states:
+      missing
+    When I add a symlink to "./home/config" pointing to "./module/config"
+    And I invalidate the module states
+    Then the module at index "1" should have the following link states:
+      missing
+    When I invalidate the link states
+    Then the module at index "1" should have the following link states:
+      matched
+    And the module at index "1" should have the status "deployed"
@@ -0,0 +1,189 @@
+Feature: Module variable status hooks
+
+  As a user of the dotmodules system,
+  I want to define scripts that report the status of my variable values,
+  So that I can see which values were already processed on my machine.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+
+  Scenario: Variable status hooks are executed for every value by default
+    Given I added a config file to "./module" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the variable status hook for "PACKAGES" should be in "single" mode with "newline" delimiter
+
+  Scenario: Variable status hooks can process every value in a single batch
+    Given I added a config file to "./module" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+      mode = "batch"
+      delimiter = "nul"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the variable status hook for "PACKAGES" should be in "batch" mode with "nul" delimiter
+
+  Scenario: Variable status hooks can list the present values as an inventory
+    Given I added a config file to "./module" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+      mode = "inventory"
+    When I run the dotmodules system
+    Then there should be "1" loaded module
+    And the variable status hook for "PACKAGES" should be in "inventory" mode with "newline" delimiter
+
+  Scenario: Variable status hook modes are restricted
+    Given I added a config file to "./module" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+      mode = "parallel"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      The value for field 'mode' should be one of 'single', 'batch', 'inventory' in section 'variable_status_hook' item at index 1!
+
+  Scenario: Variable statuses checked within the TTL are not refreshed on startup
+    Given I set the variable status cache TTL to "3600" seconds
+    And I added an executable file to "./module/status.sh" with content:
+      #!/bin/sh
+      exit 0
+    And I added a config file to "./module" with content:
+      [variables]
+      PACKAGES = ["package"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    And I run the dotmodules system again
+    Then the variable "PACKAGES" should have been served from the cache
+
+  Scenario: Only the values of variables with status hooks are counted as checked
+    Given I added an executable file to "./module/status.sh" with content:
+      #!/bin/sh
+      exit 0
+    And I added a config file to "./module" with content:
+      [variables]
+      PACKAGES = ["package_1", "package_2"]
+      FONTS = ["font"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable status progress should be "2/2 checked"
+
+  Scenario: Built-in checker can check lines in a file
+    Given I added a file to "./module/installed.txt" with content:
+      package_1
+    And I added a config file to "./module" with content:
+      [variables]
+      PACKAGES = ["package_1", "package_2"]
+      [[variable_status_hook]]
+      checker = "file_line"
+      checker_argument = "./installed.txt"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then there should be no module level errors
+    And the variable "PACKAGES" should have the following value statuses:
+      package_1: added
+      package_2: missing
+    And the variable "PACKAGES" should have "1" added and "1" missing value
+
+  Scenario: Built-in checkers can check directories and symlinks
+    Given my home directory is at "./home"
+    And I added a directory to "./home/.config/nvim"
+    And I added a symlink to "./home/.vimrc" pointing to "./home/.config/nvim"
+    And I added a config file to "./module" with content:
+      [variables]
+      DIRECTORIES = [".config/nvim", ".config/tmux"]
+      SYMLINKS = ["$HOME/.vimrc", "$HOME/.config/nvim"]
+      [[variable_status_hook]]
+      checker = "directory"
+      checker_argument = "$HOME"
+      variable_name = "DIRECTORIES"
+      prepare_step_necessary = false
+      [[variable_status_hook]]
+      checker = "symlink"
+      variable_name = "SYMLINKS"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "DIRECTORIES" should have the following value statuses:
+      .config/nvim: added
+      .config/tmux: missing
+    And the variable "SYMLINKS" should have the following value statuses:
+      $HOME/.config/nvim: missing
+    And the value "$HOME/.vimrc" of variable "SYMLINKS" should have been added
+
+  Scenario: Built-in checker can look up executables on the PATH
+    Given I added a config file to "./module" with content:
+      [variables]
+      TOOLS = ["sh", "surely-not-an-installed-tool"]
+      [[variable_status_hook]]
+      checker = "executable"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      surely-not-an-installed-tool: missing
+    And the value "sh" of variable "TOOLS" should have been added
+
+  Scenario: Built-in checkers are restricted
+    Given I added a config file to "./module" with content:
+      [[variable_status_hook]]
+      checker = "package"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      The value for field 'checker' should be one of '', 'executable', 'file_line', 'directory', 'symlink' in section 'variable_status_hook' item at index 1!
+
+  Scenario: Values of a failed status check are reported as failed
+    Given I added a config file to "./module" with content:
+      [variables]
+      TOOLS = ["sh", "surely-not-an-installed-tool"]
+      [[variable_status_hook]]
+      checker = "executable"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+    And the built-in variable status checkers are failing
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      sh: failed
+      surely-not-an-installed-tool: failed
+    And the variable status progress should be "2/2 checked"
+
+  Scenario: Values of a crashed status check are reported as failed
+    Given I added a config file to "./module" with content:
+      [variables]
+      TOOLS = ["sh", "surely-not-an-installed-tool"]
+      [[variable_status_hook]]
+      checker = "executable"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+    And the built-in variable status checkers are crashing
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      sh: failed
+      surely-not-an-installed-tool: failed
+    And the variable status progress should be "2/2 checked"
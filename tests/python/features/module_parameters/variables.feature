@@ -47,7 +47,8 @@ Feature: Module variables
     And there should be no module level errors
 
   Scenario: Variables can have multiple values
-    Given I added a config file to "./category/module" with content:
+    Given I am using the "toml" TOML backend
+    And I added a config file to "./category/module" with content:
       [variables]
       VARIABLE = "value_1"
       VARIABLE = "value_2"
@@ -55,3 +56,14 @@ Feature: Module variables
     Then there should be no modules loaded
     And a global error should have been raised:
       Duplicate keys!
+
+  Scenario: Variables can have multiple values with the standard library backend
+    Given I am using the "tomllib" TOML backend
+    And I added a config file to "./category/module" with content:
+      [variables]
+      VARIABLE = "value_1"
+      VARIABLE = "value_2"
+    When I run the dotmodules system
+    Then there should be no modules loaded
+    And a global error should have been raised:
+      Cannot overwrite a value
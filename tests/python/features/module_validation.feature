@@ -0,0 +1,133 @@
+Feature: Module validation
+
+  As a maintainer of a large module repository,
+  I want to validate every module in a single run,
+  So that I can fix all configuration errors at once in my CI pipeline.
+
+  The validation doesn't stop at the first failing module, it collects the
+  errors of every module into a machine-readable report.
+
+  Background:
+    Given I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+
+  Scenario: Valid modules should result a valid report
+    Given I added a config file to "./module_1" with content:
+      name = "Module 1"
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+    When I validate the modules
+    Then the validation report should contain "2" modules
+    And the validation report should be valid
+
+  Scenario: Every invalid module should be reported
+    Given I added a config file to "./module_1" with content:
+      name = 1
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+    And I added a config file to "./module_3" with content:
+      version = 3
+    When I validate the modules
+    Then the validation report should contain "3" modules
+    And the validation report should contain "2" invalid modules
+    And the validation report for module "./module_1" should contain the error:
+      Configuration syntax error: Value for section 'name' should be a string, got int!
+    And the validation report for module "./module_3" should contain the error:
+      Configuration syntax error: Value for section 'version' should be a string, got int!
+
+  Scenario: Every error check should be executed for the links and hooks
+    Given I added a config file to "./module_1" with content:
+      [[link]]
+      name = "My link"
+      path_to_target = "./missing_target"
+      path_to_symlink = "my/path/to/symlink"
+
+      [[shell_script_hook]]
+      name = "INSTALL"
+      path_to_script = "./missing_install.sh"
+      priority = 0
+
+      [[variable_status_hook]]
+      path_to_script = "./missing_status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    When I validate the modules
+    Then the validation report should contain "1" invalid module
+    And the validation report for module "./module_1" should contain the error:
+      Link[My link]: path_to_target './missing_target' does not name a file or directory!
+    And the validation report for module "./module_1" should contain the error:
+      ShellScriptHook[INSTALL]: path_to_script './missing_install.sh' does not name a file!
+    And the validation report for module "./module_1" should contain the error:
+      VariableStatusHook[PACKAGES]: path_to_script './missing_status.sh' does not name a file!
+
+  Scenario: Built-in variable status checkers should be checked
+    Given I added a config file to "./module_1" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      checker = "file_line"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+
+      [[variable_status_hook]]
+      variable_name = "FONTS"
+      prepare_step_necessary = false
+    When I validate the modules
+    Then the validation report should contain "1" invalid module
+    And the validation report for module "./module_1" should contain the error:
+      VariableStatusHook[PACKAGES]: path_to_script and checker 'file_line' cannot be used together!
+    And the validation report for module "./module_1" should contain the error:
+      VariableStatusHook[PACKAGES]: checker 'file_line' requires a checker_argument!
+    And the validation report for module "./module_1" should contain the error:
+      VariableStatusHook[FONTS]: either path_to_script or checker should be defined!
+
+  Scenario: Conflicting variable status hooks should be reported globally
+    Given I added a config file to "./module_1" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    And I added an empty file to "./module_1/status.sh"
+    And I added a config file to "./module_2" with content:
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+    And I added an empty file to "./module_2/status.sh"
+    When I validate the modules
+    Then the validation report should contain "0" invalid modules
+    And the validation report should contain the global error:
+      Multiple varible status hooks were defined for variable name 'PACKAGES'
+
+  Scenario: Modules should be validated in parallel
+    Given I am loading the modules in parallel with "2" workers
+    And I added a config file to "./module_2" with content:
+      name = 2
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+    When I validate the modules
+    Then the validation report should contain "2" modules
+    And the validation report should contain "1" invalid module
+    And the validation report should be written as "3" NDJSON records
+
+  Scenario: Unknown module dependencies should be reported globally
+    Given I added a config file to "./module_1" with content:
+      name = "Module 1"
+      depends_on = ["Module 2", "Module 3"]
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+    When I validate the modules
+    Then the validation report should contain "0" invalid modules
+    And the validation report should contain the global error:
+      Module 'Module 1' depends on unknown module 'Module 3'!
+
+  Scenario: Module dependency cycles should be reported globally
+    Given I added a config file to "./module_1" with content:
+      name = "Module 1"
+      depends_on = ["Module 2"]
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      depends_on = ["Module 1"]
+    When I validate the modules
+    Then the validation report should contain "0" invalid modules
+    And the validation report should contain the global error:
+      Module dependency cycle detected: Module 1 -> Module 2 -> Module 1!
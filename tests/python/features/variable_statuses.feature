@@ -0,0 +1,166 @@
+Feature: Variable statuses
+
+  As a user of the dotmodules system,
+  I want to see whether the consumed variable values were processed,
+  So that I know which values were deployed on my machine.
+
+  The variable status hooks are executed in the background, by default from a
+  bounded thread pool inside the dm process.
+
+  Background:
+    Given the hook adapter dependencies are available
+    And I have the main modules directory at "./modules"
+    And I set the dotmodules config file name as "dm.toml"
+    And I added an executable file to "./module_1/status.sh" with content:
+      #!/bin/sh
+      if [ "$3" = "present" ]; then
+        echo "installed"
+        exit 0
+      fi
+      exit 1
+    And I added a config file to "./module_1" with content:
+      name = "Module 1"
+      [variables]
+      PACKAGES = ["present", "absent"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "PACKAGES"
+      prepare_step_necessary = false
+
+  Scenario: Variable statuses are collected by the in-process executor
+    Given I am using the "thread" variable status executor
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "PACKAGES" should have the following value statuses:
+      present: installed
+      absent: missing
+
+  Scenario: Variable statuses are collected by the worker processes
+    Given I am using the "worker" variable status executor
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "PACKAGES" should have the following value statuses:
+      present: installed
+      absent: missing
+
+  Scenario: Variable statuses are collected in a single batch
+    Given I added an executable file to "./module_2/status.sh" with content:
+      #!/bin/sh
+      while read -r value; do
+        if [ "$value" = "present" ]; then
+          echo "{\"value\": \"$value\", \"processed\": true, \"details\": \"installed\"}"
+        fi
+      done
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [variables]
+      TOOLS = ["present", "absent"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+      mode = "batch"
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      present: installed
+      absent: missing
+
+  Scenario: Variable statuses are calculated from an inventory
+    Given I added an executable file to "./module_2/status.sh" with content:
+      #!/bin/sh
+      printf 'present\tinstalled\n'
+      printf 'other\n'
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [variables]
+      TOOLS = ["present", "absent"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+      mode = "inventory"
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      present: installed
+      absent: missing
+
+  Scenario: Variables of the displayed module are refreshed first
+    Given I limit the variable status refreshes to "1" worker
+    And I added an executable file to "./module_2/status.sh" with content:
+      #!/bin/sh
+      sleep 1
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [variables]
+      TOOLS = ["tool"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+    And I added an executable file to "./module_3/status.sh" with content:
+      #!/bin/sh
+      sleep 1
+    And I added a config file to "./module_3" with content:
+      name = "Module 3"
+      [variables]
+      FONTS = ["font"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "FONTS"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I prioritize the variables of the module at index "3"
+    Then the waiting variable status refreshes should be:
+      FONTS
+      TOOLS
+
+  Scenario: Running variable status hooks are terminated on exit
+    Given I added an executable file to "./module_2/status.sh" with content:
+      #!/bin/sh
+      touch "$4/../../../started"
+      sleep 1
+      touch "$4/../../../finished"
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [variables]
+      TOOLS = ["tool"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "TOOLS"
+      prepare_step_necessary = false
+    When I run the dotmodules system
+    And I wait for the file "./started" to be created in the cache directory
+    And I exit the dotmodules system
+    Then the file "./finished" should not be created in the cache directory within "2" seconds
+
+  Scenario: The prepare step artifacts are shared between the refreshes
+    Given I added an executable file to "./module_2/status.sh" with content:
+      #!/bin/sh
+      if [ "$1" = "prepare" ]; then
+        echo "prepared" >> "$4/../../../prepare.log"
+        echo "present" > "$4/inventory"
+        exit 0
+      fi
+      if grep -qx "$3" "$4/inventory"; then
+        echo "installed"
+        exit 0
+      fi
+      exit 1
+    And I added a config file to "./module_2" with content:
+      name = "Module 2"
+      [variables]
+      TOOLS = ["present", "absent"]
+      [[variable_status_hook]]
+      path_to_script = "./status.sh"
+      variable_name = "TOOLS"
+      prepare_step_necessary = true
+    When I run the dotmodules system
+    And I wait for the variable statuses to be collected
+    And I run the dotmodules system again
+    And I wait for the variable statuses to be collected
+    Then the variable "TOOLS" should have the following value statuses:
+      present: installed
+      absent: missing
+    And the file "./prepare.log" in the cache directory should have "1" line
@@ -1,8 +1,12 @@
+from pathlib import Path
+
 import pytest
 
 from dotmodules.settings import Settings
 
 
 @pytest.fixture
-def settings() -> Settings:
-    return Settings()
+def settings(tmp_path: Path) -> Settings:
+    # Every scenario has its own cache directory, so the cached results cannot
+    # leak between the scenarios or into the repository.
+    return Settings(raw_dm_cache_root=tmp_path / ".dm_cache")
@@ -1,13 +1,46 @@
+import io
 import json
 import os
+import shutil
+import time
 from pathlib import Path
+from typing import Any, Dict, List, cast
 
+import pytest
 from pytest_bdd import given, scenarios, then, when
 
+from dotmodules.modules.deployment import LinkApplyResult, LinkApplyStatus, LinkPlan
+from dotmodules.modules.hooks import VariableStatusHook
+from dotmodules.modules.hooks.base import Hook, HookExecutionResult
+from dotmodules.modules.hooks.engine import (
+    HookExecutionEngine,
+    HookOutputMode,
+    HookScheduling,
+)
+from dotmodules.modules.hooks.graph import HookDependencyGraph
+from dotmodules.modules.hooks.link_engine import LinkEngineName
+from dotmodules.modules.hooks.link_handling import LinkHandlingHook
+from dotmodules.modules.loader import get_available_toml_backends
 from dotmodules.modules.modules import Modules
+from dotmodules.modules.validation import (
+    ModulesValidator,
+    ModuleValidationResult,
+    ValidationReport,
+)
 from dotmodules.settings import Settings
 
-from .utils import ExecutionContext, FailedContext, ScenarioError, SucceededContext, p
+from .utils import (
+    ExecutionContext,
+    FailedContext,
+    HookExecutionRecord,
+    ScenarioError,
+    StubHook,
+    SucceededContext,
+    create_stub_hooks,
+    get_hook_dependency_module_names,
+    get_stub_hook,
+    p,
+)
 
 scenarios("../features")
 
@@ -17,6 +50,7 @@ scenarios("../features")
 
 
 @given(p('I added an empty file to "{path:P}"'))
+@when(p('I add an empty file to "{path:P}"'))
 def add_an_empty_file_to_the_main_modules_directory(
     settings: Settings, path: Path
 ) -> None:
@@ -35,6 +69,26 @@ def add_a_file_to_the_main_modules_directory_with_content(
         f.write(raw_lines)
 
 
+@given(p('I added an executable file to "{path:P}" with content:\n{raw_lines:S}'))
+def add_an_executable_file_to_the_main_modules_directory_with_content(
+    settings: Settings, path: Path, raw_lines: str
+) -> None:
+    add_a_file_to_the_main_modules_directory_with_content(
+        settings=settings, path=path, raw_lines=raw_lines
+    )
+    (settings.relative_modules_path / path).chmod(0o755)
+
+
+@given(p('I added a symlink to "{path:P}" pointing to "{target:P}"'))
+@when(p('I add a symlink to "{path:P}" pointing to "{target:P}"'))
+def add_a_symlink_to_the_main_modules_directory(
+    settings: Settings, path: Path, target: Path
+) -> None:
+    absolute_path = settings.relative_modules_path / path
+    absolute_path.parent.mkdir(parents=True, exist_ok=True)
+    absolute_path.symlink_to(settings.relative_modules_path / target)
+
+
 # ============================================================================
 #  GIVEN - SETUP - DIRECTORIES
 # ============================================================================
@@ -48,6 +102,20 @@ def add_a_directory_to_the_main_modules_directory(
     absolute_path.mkdir(parents=True, exist_ok=True)
 
 
+@given(p('I removed the directory "{path:P}"'))
+def remove_a_directory_from_the_main_modules_directory(
+    settings: Settings, path: Path
+) -> None:
+    shutil.rmtree(settings.relative_modules_path / path)
+
+
+@given("every directory in the modules directory was last modified an hour ago")
+def age_the_directories_in_the_main_modules_directory(settings: Settings) -> None:
+    timestamp = time.time() - 3600
+    for root, _directories, _files in os.walk(settings.relative_modules_path):
+        os.utime(root, (timestamp, timestamp))
+
+
 # ============================================================================
 #  GIVEN - SETUP - SETTINGS
 # ============================================================================
@@ -71,11 +139,180 @@ def set_main_modules_directory(
     )
 
 
+@given(p('my home directory is at "{path:P}"'))
+def set_home_directory(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch, path: Path
+) -> None:
+    absolute_path = settings.relative_modules_path / path
+    absolute_path.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setenv("HOME", str(absolute_path))
+
+
 @given(p('I set the dotmodules config file name as "{config_file_name:S}"'))
 def set_config_file_name(settings: Settings, config_file_name: str) -> None:
     settings.config_file_name = config_file_name
 
 
+@given(p('I set the ignored directory names to "{names:S}"'))
+def set_ignored_directory_names(settings: Settings, names: str) -> None:
+    settings.discovery_ignored_directory_names = tuple(names.split("|"))
+
+
+@given("I enabled stopping the discovery at the module roots")
+def enable_stopping_discovery_at_module_roots(settings: Settings) -> None:
+    settings.discovery_stop_at_module_roots = True
+
+
+@given(p('I am loading the modules in parallel with "{worker_count:I}" workers'))
+def set_parallel_module_loading(settings: Settings, worker_count: int) -> None:
+    settings.module_loading_worker_count = worker_count
+    settings.module_loading_parallel_threshold = 0
+
+
+@given(p('I am using the "{backend_name:S}" TOML backend'))
+def set_toml_backend(settings: Settings, backend_name: str) -> None:
+    if backend_name not in get_available_toml_backends():
+        pytest.skip(f"TOML backend '{backend_name}' is not available")
+    settings.toml_backend = backend_name
+
+
+@given(p('I set the TOML backend to "{backend_name:S}"'))
+def set_unchecked_toml_backend(settings: Settings, backend_name: str) -> None:
+    settings.toml_backend = backend_name
+
+
+@given("the hook adapter dependencies are available")
+def assert_hook_adapter_dependencies(settings: Settings) -> None:
+    # The hook adapter scripts depend on the posix-adapter git submodule.
+    if not (Path.cwd() / "dependencies" / "posix-adapter").is_dir():
+        pytest.skip("The posix-adapter submodule is not checked out")
+
+
+@given(p('I am using the "{executor:S}" variable status executor'))
+def set_variable_status_executor(settings: Settings, executor: str) -> None:
+    settings.variable_status_executor = executor
+
+
+@given(p('I limit the variable status refreshes to "{count:I}" worker'))
+@given(p('I limit the variable status refreshes to "{count:I}" workers'))
+def set_variable_status_worker_count(settings: Settings, count: int) -> None:
+    settings.variable_status_worker_count = count
+
+
+@given(p('I set the variable status cache TTL to "{ttl:I}" seconds'))
+def set_variable_status_cache_ttl(settings: Settings, ttl: int) -> None:
+    settings.variable_status_cache_ttl = ttl
+
+
+@given(p('I set the hook parallelism to "{count:I}"'))
+def set_hook_parallelism(settings: Settings, count: int) -> None:
+    settings.hook_parallelism = count
+
+
+@given(p('I set the hook output mode to "{mode:S}"'))
+def set_hook_output_mode(settings: Settings, mode: str) -> None:
+    settings.hook_output_mode = mode
+
+
+@given(p('I set the link engine to "{name:S}"'))
+def set_link_engine(settings: Settings, name: str) -> None:
+    settings.link_engine = name
+
+
+@given(p("I will answer the prompts with:\n{answers:S}"))
+def answer_the_prompts(monkeypatch: pytest.MonkeyPatch, answers: str) -> None:
+    remaining_answers = iter(answers.splitlines())
+    monkeypatch.setattr("builtins.input", lambda _prompt: next(remaining_answers))
+
+
+@given(p('creating symlinks in "{path:P}" is not permitted'))
+def deny_symlink_creation(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch, path: Path
+) -> None:
+    denied_directory = os.path.realpath(settings.relative_modules_path / path)
+    original_symlink = os.symlink
+
+    def symlink(src: str, dst: str) -> None:
+        if os.path.realpath(os.path.dirname(dst)) == denied_directory:
+            raise PermissionError(13, "Permission denied", dst)
+        original_symlink(src, dst)
+
+    monkeypatch.setattr(os, "symlink", symlink)
+
+
+@given(p('writing to "{path:P}" is not permitted'))
+def deny_writing(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch, path: Path
+) -> None:
+    denied_directory = os.path.realpath(settings.relative_modules_path / path)
+    original_access = os.access
+
+    def access(path: str, mode: int, **kwargs: Any) -> bool:
+        if mode & os.W_OK and os.path.realpath(path) == denied_directory:
+            return False
+        return original_access(path, mode, **kwargs)
+
+    monkeypatch.setattr(os, "access", access)
+
+
+@given("the shell hook adapter executions are recorded", target_fixture="shell_hooks")
+def record_shell_hook_adapter_executions(monkeypatch: pytest.MonkeyPatch) -> List[Hook]:
+    shell_hooks: List[Hook] = []
+
+    def execute(hook: Hook, *args: Any, **kwargs: Any) -> HookExecutionResult:
+        shell_hooks.append(hook)
+        return HookExecutionResult(status_code=0)
+
+    monkeypatch.setattr(Hook, "execute", execute)
+    monkeypatch.setattr(Hook, "execute_streamed", execute)
+    return shell_hooks
+
+
+@given("the built-in variable status checkers are failing")
+def break_the_variable_status_checkers(monkeypatch: pytest.MonkeyPatch) -> None:
+    def execute_checker(*args: Any, **kwargs: Any) -> None:
+        raise OSError("checker failed")
+
+    monkeypatch.setattr(VariableStatusHook, "execute_checker", execute_checker)
+
+
+@given("the built-in variable status checkers are crashing")
+def crash_the_variable_status_checkers(monkeypatch: pytest.MonkeyPatch) -> None:
+    def execute_checker(*args: Any, **kwargs: Any) -> None:
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    monkeypatch.setattr(VariableStatusHook, "execute_checker", execute_checker)
+
+
+@given(
+    p("the modules of the stub hooks depend on:\n{lines:S}"),
+    target_fixture="stub_module_dependencies",
+)
+def set_the_stub_module_dependencies(lines: str) -> Dict[str, List[str]]:
+    dependencies: Dict[str, List[str]] = {}
+    for line in lines.splitlines():
+        module_name, _separator, dependency = line.partition("->")
+        dependencies.setdefault(module_name.strip(), []).append(dependency.strip())
+    return dependencies
+
+
+@given(p('I set the hook scheduling to "{scheduling:S}"'))
+def set_hook_scheduling(settings: Settings, scheduling: str) -> None:
+    settings.hook_scheduling = scheduling
+
+
+@given("I corrupted the parsed config cache")
+def corrupt_parsed_config_cache(settings: Settings) -> None:
+    for path in settings.dm_cache_parsed_configs.iterdir():
+        with open(path, "w") as f:
+            f.write('{"version": ')
+
+
+@given("I forced a full module rescan")
+def force_full_module_rescan(settings: Settings) -> None:
+    settings.discovery_force_rescan = True
+
+
 @given(p('I am using the "{deployment_target_name:S}" deployment target'))
 def set_deployment_target(settings: Settings, deployment_target_name: str) -> None:
     settings.deployment_target = deployment_target_name
@@ -177,11 +414,141 @@ def assert_module_disabled_at_index(context: ExecutionContext, index: int) -> No
     assert module.enabled is False
 
 
+@then(p('the module at index "{index:I}" should have the status "{status:S}"'))
+def assert_module_status_at_index(
+    context: ExecutionContext, index: int, status: str
+) -> None:
+    modules = context.modules
+    module = modules[index - 1]
+    assert module.status.value == status
+
+
 # ============================================================================
 #  THEN - MODULE PARAMETERS - LINKS
 # ============================================================================
 
 
+@then(
+    p(
+        'the module at index "{index:I}" should have the following link states:\n{states:S}'
+    )
+)
+def assert_module_link_states(
+    context: ExecutionContext, index: int, states: str
+) -> None:
+    modules = context.modules
+    module = modules[index - 1]
+    link_states = [link_state.value for _link, link_state in module.link_states]
+    assert link_states == states.splitlines()
+
+
+@then(
+    p('the variable "{name:S}" should have the following value statuses:\n{statuses:S}')
+)
+def assert_variable_value_statuses(
+    context: ExecutionContext, name: str, statuses: str
+) -> None:
+    variable_statuses = context.modules.variable_statuses
+    for line in statuses.splitlines():
+        value, expected_status_string = [item.strip() for item in line.split(":")]
+        variable_status = variable_statuses.get(
+            variable_name=name, variable_value=value
+        )
+        assert variable_status.status_string == expected_status_string
+
+
+@then(p('the value "{value:S}" of variable "{name:S}" should have been added'))
+def assert_variable_value_added(
+    context: ExecutionContext, name: str, value: str
+) -> None:
+    variable_status = context.modules.variable_statuses.get(
+        variable_name=name, variable_value=value
+    )
+    assert variable_status.variable_was_added
+
+
+@then(
+    p(
+        'the variable "{name:S}" should have "{added:I}" added and "{missing:I}" missing value'
+    )
+)
+@then(
+    p(
+        'the variable "{name:S}" should have "{added:I}" added and "{missing:I}" missing values'
+    )
+)
+def assert_variable_status_counts(
+    context: ExecutionContext, name: str, added: int, missing: int
+) -> None:
+    counts = context.modules.variable_statuses.get_counts(variable_name=name)
+    assert counts.added == added
+    assert counts.missing == missing
+    assert counts.loading == 0
+
+
+@then(p('the variable status progress should be "{progress:S}"'))
+def assert_variable_status_progress(context: ExecutionContext, progress: str) -> None:
+    assert str(context.modules.variable_statuses.get_progress()) == progress
+
+
+@then(p("the waiting variable status refreshes should be:\n{names:S}"))
+def assert_waiting_variable_status_refreshes(
+    context: ExecutionContext, names: str
+) -> None:
+    pending_variable_names = context.modules.variable_statuses.pending_variable_names
+    assert pending_variable_names == names.splitlines()
+
+
+@then(p('the variable "{name:S}" should have been served from the cache'))
+def assert_variable_statuses_served_from_the_cache(
+    context: ExecutionContext, name: str
+) -> None:
+    variable_statuses = context.modules.variable_statuses
+    assert not variable_statuses.is_refreshing
+    for value in context.modules.aggregated_variables[name]:
+        variable_status = variable_statuses.get(
+            variable_name=name, variable_value=value
+        )
+        assert not variable_status.variable_is_loading
+        assert not variable_status.is_stale
+
+
+@then(p('the file "{path:P}" in the cache directory should have "{count:I}" line'))
+@then(p('the file "{path:P}" in the cache directory should have "{count:I}" lines'))
+def assert_cache_file_line_count(settings: Settings, path: Path, count: int) -> None:
+    with open(settings.dm_cache_root / path) as f:
+        assert len(f.read().splitlines()) == count
+
+
+@then(
+    p(
+        'the file "{path:P}" should not be created in the cache directory within "{seconds:I}" seconds'
+    )
+)
+def assert_cache_file_not_created(settings: Settings, path: Path, seconds: int) -> None:
+    time.sleep(seconds)
+    assert not (settings.dm_cache_root / path).exists()
+
+
+@then(
+    p(
+        'the variable status hook for "{name:S}" should be in "{mode:S}" mode with "{delimiter:S}" delimiter'
+    )
+)
+def assert_variable_status_hook_mode(
+    context: ExecutionContext, name: str, mode: str, delimiter: str
+) -> None:
+    hooks = [
+        hook
+        for module in context.modules
+        for hook in module.variable_status_hooks
+        if hook.variable_name == name
+    ]
+    assert len(hooks) == 1
+    assert hooks[0].mode == mode
+    assert hooks[0].delimiter == delimiter
+
+
 @then(p('the module at index "{index:I}" should have "{count:I}" link registered'))
 @then(p('the module at index "{index:I}" should have "{count:I}" links registered'))
 def assert_module_has_link_count(
@@ -262,6 +629,38 @@ def count_loaded_modules(context: ExecutionContext, count: int) -> None:
     assert len(modules) == count
 
 
+#  MODULE DISCOVERY
+@then(p('the module discovery should have pruned "{count:I}" directory'))
+@then(p('the module discovery should have pruned "{count:I}" directories'))
+def assert_pruned_directory_count(context: ExecutionContext, count: int) -> None:
+    modules = context.modules
+    assert len(modules.discovery_result.pruned_directories) == count
+
+
+@then(p('the module discovery should have reused "{count:I}" directory'))
+@then(p('the module discovery should have reused "{count:I}" directories'))
+def assert_reused_directory_count(context: ExecutionContext, count: int) -> None:
+    modules = context.modules
+    assert modules.discovery_result.reused_directories == count
+
+
+#  PARSED CONFIG CACHE
+@then(p('the parsed config cache should have served "{count:I}" module'))
+@then(p('the parsed config cache should have served "{count:I}" modules'))
+def assert_parsed_config_cache_hits(context: ExecutionContext, count: int) -> None:
+    config_cache = context.modules.config_cache
+    assert config_cache is not None
+    assert config_cache.hits == count
+
+
+@then(p('the parsed config cache should have pruned "{count:I}" entry'))
+@then(p('the parsed config cache should have pruned "{count:I}" entries'))
+def assert_parsed_config_cache_pruning(context: ExecutionContext, count: int) -> None:
+    config_cache = context.modules.config_cache
+    assert config_cache is not None
+    assert config_cache.pruned == count
+
+
 #  MODULE ROOTS
 @then(p("the modules should have the following relative roots:\n{roots:S}"))
 def assert_module_roots(context: ExecutionContext, roots: str, tmp_path: Path) -> None:
@@ -376,11 +775,95 @@ def assert_module_level_warnings_for_module_at_index(
         assert error in module.warnings
 
 
+# ============================================================================
+#  THEN - MODULE VALIDATION
+# ============================================================================
+
+
+def get_module_validation_result(
+    settings: Settings, validation_report: ValidationReport, module_path: Path
+) -> ModuleValidationResult:
+    module_root = settings.relative_modules_path / module_path
+    for result in validation_report.module_results:
+        if result.config_file_path.parent == module_root:
+            return result
+    raise ScenarioError(f"No validation result found for module '{module_path}'!")
+
+
+@then(p('the validation report should contain "{count:I}" module'))
+@then(p('the validation report should contain "{count:I}" modules'))
+def assert_validated_module_count(
+    validation_report: ValidationReport, count: int
+) -> None:
+    assert len(validation_report.module_results) == count
+
+
+@then(p('the validation report should contain "{count:I}" invalid module'))
+@then(p('the validation report should contain "{count:I}" invalid modules'))
+def assert_invalid_module_count(
+    validation_report: ValidationReport, count: int
+) -> None:
+    assert validation_report.invalid_module_count == count
+
+
+@then("the validation report should be valid")
+def assert_validation_report_valid(validation_report: ValidationReport) -> None:
+    assert validation_report.valid, list(validation_report.iter_records())
+
+
+@then(
+    p(
+        'the validation report for module "{module_path:P}" should contain the error:\n{error_message:S}'
+    )
+)
+def assert_module_validation_error(
+    settings: Settings,
+    validation_report: ValidationReport,
+    module_path: Path,
+    error_message: str,
+) -> None:
+    result = get_module_validation_result(
+        settings=settings,
+        validation_report=validation_report,
+        module_path=module_path,
+    )
+    assert any(error_message in error for error in result.errors), result.errors
+
+
+@then(p("the validation report should contain the global error:\n{error_message:S}"))
+def assert_global_validation_error(
+    validation_report: ValidationReport, error_message: str
+) -> None:
+    errors = validation_report.global_errors
+    assert any(error_message in error for error in errors), errors
+
+
+@then(p('the validation report should be written as "{count:I}" NDJSON records'))
+def assert_validation_report_ndjson(
+    validation_report: ValidationReport, count: int
+) -> None:
+    stream = io.StringIO()
+    validation_report.write_ndjson(stream=stream)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == count
+    assert records[-1]["type"] == "summary"
+    assert records[-1]["module_count"] == len(validation_report.module_results)
+
+
 # ============================================================================
 # WHEN - EXWCUTION - SYSTEM LOADING
 # ============================================================================
 
 
+@given("I ran the dotmodules system")
+def preload_the_dotmodules_system(settings: Settings) -> None:
+    try:
+        Modules(settings=settings)
+    except Exception:
+        # Errors will be checked in the actual run.
+        pass
+
+
 @when("I run the dotmodules system", target_fixture="context")
 def load_the_dotmodules_system(settings: Settings) -> ExecutionContext:
     try:
@@ -388,3 +871,317 @@ def load_the_dotmodules_system(settings: Settings) -> ExecutionContext:
         return SucceededContext(modules=modules)
     except Exception as e:
         return FailedContext(exception=e)
+
+
+@when(p('I prioritize the variables of the module at index "{index:I}"'))
+def prioritize_the_variables_of_a_module(context: ExecutionContext, index: int) -> None:
+    modules = context.modules
+    modules.variable_statuses.prioritize(
+        variable_names=modules[index - 1].variables.keys()
+    )
+
+
+@when("I run the dotmodules system again", target_fixture="context")
+def reload_the_dotmodules_system(
+    context: ExecutionContext, settings: Settings
+) -> ExecutionContext:
+    # The step decorator hides the return type of the step function.
+    return cast(ExecutionContext, load_the_dotmodules_system(settings=settings))
+
+
+@when("I wait for the variable statuses to be collected")
+def wait_for_the_variable_statuses(context: ExecutionContext) -> None:
+    deadline = time.monotonic() + 10
+    while context.modules.variable_statuses.is_refreshing:
+        if time.monotonic() > deadline:
+            raise ScenarioError("Variable statuses were not collected in time!")
+        time.sleep(0.05)
+
+
+@when(p('I wait for the file "{path:P}" to be created in the cache directory'))
+def wait_for_a_cache_file(settings: Settings, path: Path) -> None:
+    deadline = time.monotonic() + 10
+    while not (settings.dm_cache_root / path).exists():
+        if time.monotonic() > deadline:
+            raise ScenarioError(f"File '{path}' was not created in time!")
+        time.sleep(0.05)
+
+
+@when("I exit the dotmodules system")
+def exit_the_dotmodules_system(context: ExecutionContext) -> None:
+    context.modules.variable_statuses.shutdown()
+
+
+@when(p('I execute the hooks named "{name:S}"'), target_fixture="hook_execution")
+def execute_the_hooks(
+    context: ExecutionContext, settings: Settings, name: str
+) -> HookExecutionRecord:
+    record = HookExecutionRecord()
+    engine = HookExecutionEngine(
+        parallelism=settings.hook_parallelism,
+        output_mode=HookOutputMode(settings.hook_output_mode),
+        write_output=record.output.append,
+    )
+    if HookScheduling(settings.hook_scheduling) == HookScheduling.DEPENDENCIES:
+        graph = context.modules.aggregated_hook_graphs[name]
+        record.results = engine.run_graph(graph=graph)
+    else:
+        record.results = engine.run(hooks=context.modules.aggregated_hooks[name])
+    return record
+
+
+@when(
+    p("I execute the stub hooks:\n{lines:S}"),
+    target_fixture="hook_execution",
+)
+def execute_the_stub_hooks(settings: Settings, lines: str) -> HookExecutionRecord:
+    record = HookExecutionRecord()
+    engine = HookExecutionEngine(
+        parallelism=settings.hook_parallelism,
+        output_mode=HookOutputMode(settings.hook_output_mode),
+        write_output=record.output.append,
+    )
+    record.results = engine.run(hooks=create_stub_hooks(lines=lines))
+    return record
+
+
+@when(
+    p("I execute the stub hooks by the module dependencies:\n{lines:S}"),
+    target_fixture="hook_execution",
+)
+def execute_the_stub_hooks_by_the_module_dependencies(
+    settings: Settings,
+    stub_module_dependencies: Dict[str, List[str]],
+    lines: str,
+) -> HookExecutionRecord:
+    record = HookExecutionRecord()
+    engine = HookExecutionEngine(
+        parallelism=settings.hook_parallelism,
+        output_mode=HookOutputMode(settings.hook_output_mode),
+        write_output=record.output.append,
+    )
+    record.graph = HookDependencyGraph.build(
+        hooks=create_stub_hooks(lines=lines),
+        module_dependencies=stub_module_dependencies,
+    )
+    record.results = engine.run_graph(graph=record.graph)
+    return record
+
+
+@when("I build the link plan", target_fixture="link_plan")
+def build_the_link_plan(context: ExecutionContext) -> LinkPlan:
+    modules = context.modules
+    return LinkPlan.build(modules=modules, link_states=modules.link_states)
+
+
+@when("I apply the link plan", target_fixture="link_apply_results")
+def apply_the_link_plan(
+    context: ExecutionContext, settings: Settings, link_plan: LinkPlan
+) -> List[LinkApplyResult]:
+    results = link_plan.apply(worker_count=settings.link_deploy_worker_count)
+    context.modules.invalidate(link_states=True)
+    return results
+
+
+@when("I invalidate the module states")
+def invalidate_the_module_states(context: ExecutionContext) -> None:
+    context.modules.invalidate()
+
+
+@when("I invalidate the link states")
+def invalidate_the_link_states(context: ExecutionContext) -> None:
+    context.modules.invalidate(link_states=True)
+
+
+@when("I validate the modules", target_fixture="validation_report")
+def validate_the_modules(settings: Settings) -> ValidationReport:
+    return ModulesValidator(settings=settings).validate()
+
+
+# ============================================================================
+#  THEN - HOOK EXECUTION
+# ============================================================================
+
+
+@then(p("the hooks should have been executed in order:\n{lines:S}"))
+def assert_hook_execution_order(
+    hook_execution: HookExecutionRecord, lines: str
+) -> None:
+    module_names = [
+        result.hook.execution_context.module_name for result in hook_execution.results
+    ]
+    assert module_names == lines.splitlines()
+
+
+@then(p('"{count:I}" hook should have failed'))
+@then(p('"{count:I}" hooks should have failed'))
+def assert_failed_hook_count(hook_execution: HookExecutionRecord, count: int) -> None:
+    failed_results = [
+        result
+        for result in hook_execution.results
+        if not result.skipped and not result.succeeded
+    ]
+    assert len(failed_results) == count
+
+
+@then(p('"{count:I}" hook should have been skipped'))
+@then(p('"{count:I}" hooks should have been skipped'))
+def assert_skipped_hook_count(hook_execution: HookExecutionRecord, count: int) -> None:
+    assert len([r for r in hook_execution.results if r.skipped]) == count
+
+
+@then(
+    p(
+        'the "{hook_name:S}" hook of module "{module_name:S}" should depend on '
+        "the hooks of modules:\n{lines:S}"
+    )
+)
+def assert_hook_dependencies(
+    context: ExecutionContext, hook_name: str, module_name: str, lines: str
+) -> None:
+    assert sorted(
+        get_hook_dependency_module_names(
+            modules=context.modules, hook_name=hook_name, module_name=module_name
+        )
+    ) == sorted(lines.splitlines())
+
+
+@then(
+    p(
+        'the "{hook_name:S}" hook of module "{module_name:S}" should not depend on '
+        "any hooks"
+    )
+)
+def assert_no_hook_dependencies(
+    context: ExecutionContext, hook_name: str, module_name: str
+) -> None:
+    assert not get_hook_dependency_module_names(
+        modules=context.modules, hook_name=hook_name, module_name=module_name
+    )
+
+
+@then(
+    p(
+        'the stub hook of module "{later:S}" should have been started after the '
+        'stub hook of module "{earlier:S}" finished'
+    )
+)
+def assert_stub_hooks_executed_after_each_other(
+    hook_execution: HookExecutionRecord, later: str, earlier: str
+) -> None:
+    hooks = [cast(StubHook, result.hook) for result in hook_execution.results]
+    later_hook = get_stub_hook(hooks=hooks, module_name=later)
+    earlier_hook = get_stub_hook(hooks=hooks, module_name=earlier)
+    assert later_hook.started_at >= earlier_hook.finished_at
+
+
+@then(
+    p(
+        'the stub hooks of modules "{first:S}" and "{second:S}" should have been '
+        "executed at the same time"
+    )
+)
+def assert_stub_hooks_executed_at_the_same_time(
+    hook_execution: HookExecutionRecord, first: str, second: str
+) -> None:
+    hooks = [cast(StubHook, result.hook) for result in hook_execution.results]
+    first_hook = get_stub_hook(hooks=hooks, module_name=first)
+    second_hook = get_stub_hook(hooks=hooks, module_name=second)
+    assert first_hook.started_at < second_hook.finished_at
+    assert second_hook.started_at < first_hook.finished_at
+
+
+@then(
+    p(
+        'the stub hook of module "{earlier:S}" should have been started before the '
+        'stub hook of module "{later:S}" finished'
+    )
+)
+def assert_stub_hook_started_before_another_finished(
+    hook_execution: HookExecutionRecord, earlier: str, later: str
+) -> None:
+    hooks = [cast(StubHook, result.hook) for result in hook_execution.results]
+    earlier_hook = get_stub_hook(hooks=hooks, module_name=earlier)
+    later_hook = get_stub_hook(hooks=hooks, module_name=later)
+    assert earlier_hook.started_at < later_hook.finished_at
+
+
+@then(p("the critical path of the hook execution should be:\n{lines:S}"))
+def assert_critical_path(hook_execution: HookExecutionRecord, lines: str) -> None:
+    graph = hook_execution.graph
+    if graph is None:
+        raise ScenarioError("The hooks were not executed by the module dependencies!")
+    path = graph.get_critical_path(
+        durations=[result.duration for result in hook_execution.results]
+    )
+    module_names = [graph.hooks[index].execution_context.module_name for index in path]
+    assert module_names == lines.splitlines()
+
+
+@then(p("the hook output should be:\n{lines:S}"))
+def assert_hook_output(hook_execution: HookExecutionRecord, lines: str) -> None:
+    assert hook_execution.output == lines.splitlines()
+
+
+@then(p("the hook output should contain the line:\n{line:S}"))
+def assert_hook_output_line(hook_execution: HookExecutionRecord, line: str) -> None:
+    assert line in hook_execution.output
+
+
+# ============================================================================
+#  THEN - LINK DEPLOYMENT
+# ============================================================================
+
+
+@then(p("the shell hook adapters should have handled the links:\n{names:S}"))
+def assert_shell_hook_adapter_links(shell_hooks: List[Hook], names: str) -> None:
+    handled_names = []
+    for hook in shell_hooks:
+        assert isinstance(hook, LinkHandlingHook)
+        assert hook.execution_context.link_engine == LinkEngineName.SHELL
+        handled_names += [link.name for link in hook.links]
+    assert handled_names == names.splitlines()
+
+
+@then(
+    p(
+        'the link plan should create "{count:I}" links in "{directory_count:I}" '
+        "directories"
+    )
+)
+def assert_link_plan_creatable_links(
+    link_plan: LinkPlan, count: int, directory_count: int
+) -> None:
+    assert len(link_plan.creatable) == count
+    assert len(link_plan.groups) == directory_count
+
+
+@then(
+    p(
+        'the link plan should have "{unchanged:I}" unchanged, "{blocked:I}" blocked '
+        'and "{conflicting:I}" conflicting links'
+    )
+)
+def assert_link_plan_skipped_links(
+    link_plan: LinkPlan, unchanged: int, blocked: int, conflicting: int
+) -> None:
+    assert len(link_plan.unchanged) == unchanged
+    assert len(link_plan.blocked) == blocked
+    assert len(link_plan.conflicts) == conflicting
+
+
+@then(p('"{count:I}" link should have been created'))
+@then(p('"{count:I}" links should have been created'))
+def assert_created_link_count(
+    link_apply_results: List[LinkApplyResult], count: int
+) -> None:
+    assert [result.status for result in link_apply_results] == [
+        LinkApplyStatus.CREATED
+    ] * count
+
+
+@then(p('there should be a file at "{path:P}" with content:\n{raw_lines:S}'))
+def assert_file_content(settings: Settings, path: Path, raw_lines: str) -> None:
+    absolute_path = settings.relative_modules_path / path
+    assert not absolute_path.is_symlink()
+    assert absolute_path.read_text() == raw_lines
@@ -1,10 +1,24 @@
+import time
 from abc import ABC, abstractmethod, abstractproperty
+from dataclasses import dataclass, field
 from functools import partial
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
 
 from pytest_bdd import parsers
 
+from dotmodules.modules.hooks.base import (
+    Hook,
+    HookAdapterScript,
+    HookExecutionContext,
+    HookExecutionResult,
+    HookExecutionType,
+)
+from dotmodules.modules.hooks.engine import HookRunResult
+from dotmodules.modules.hooks.graph import HookDependencyGraph
 from dotmodules.modules.modules import Modules
+from dotmodules.modules.path import PathManager
+from dotmodules.shell_adapter import ProcessStartedCallbackType
 
 # ============================================================================
 #  EXECUTION CONTEXT HANDLING
@@ -82,3 +96,133 @@ class FailedContext(ExecutionContext):
     def match_global_error_message(self, error_message: str) -> None:
         assert self._exception is not None
         assert error_message in str(self._exception)
+
+
+# ============================================================================
+#  HOOK EXECUTION RECORD
+# ============================================================================
+
+
+@dataclass
+class HookExecutionRecord:
+    results: List[HookRunResult] = field(default_factory=list)
+    output: List[str] = field(default_factory=list)
+    graph: Optional[HookDependencyGraph] = None
+
+
+@dataclass
+class StubHook(Hook):
+    """
+    Hook that sleeps for the given duration instead of executing an adapter
+    script, and records when it was started and finished. It writes two output
+    lines, one at the start and one at the end of its execution.
+    """
+
+    module_name: str
+    priority: int
+    duration: float
+    status_code: int
+    started_at: float = field(default=0.0, init=False)
+    finished_at: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        self.execution_context = HookExecutionContext(
+            module_name=self.module_name,
+            module_root="",
+            dm_cache_root="",
+            dm_cache_variables="",
+            indent="",
+            text_wrap_limit="",
+            link_engine="",
+        )
+
+    @property
+    def hook_name(self) -> str:
+        return "STUB"
+
+    @property
+    def hook_priority(self) -> int:
+        return self.priority
+
+    @property
+    def hook_execution_type(self) -> HookExecutionType:
+        return HookExecutionType.INTERACTIVE
+
+    @property
+    def hook_description(self) -> str:
+        return "Stub hook"
+
+    @property
+    def hook_adapter_script(self) -> HookAdapterScript:
+        return HookAdapterScript.SHELL_SCRIPT
+
+    def get_additional_hook_arguments(
+        self,
+        path_manager: PathManager,
+        extra_arguments: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        return []
+
+    def report_errors(self, path_manager: PathManager) -> List[str]:
+        return []
+
+    def execute(
+        self,
+        extra_arguments: Optional[Dict[str, str]] = None,
+        stdin: Optional[bytes] = None,
+        on_process_started: Optional[ProcessStartedCallbackType] = None,
+    ) -> HookExecutionResult:
+        return self.execute_streamed(on_output_line=print)
+
+    def execute_streamed(
+        self,
+        on_output_line: Callable[[str], None],
+        extra_arguments: Optional[Dict[str, str]] = None,
+    ) -> HookExecutionResult:
+        self.started_at = time.perf_counter()
+        on_output_line(f"{self.module_name} started")
+        time.sleep(self.duration)
+        on_output_line(f"{self.module_name} finished")
+        self.finished_at = time.perf_counter()
+        return HookExecutionResult(status_code=self.status_code)
+
+
+def create_stub_hooks(lines: str) -> List[StubHook]:
+    """
+    Creates the stub hooks from lines like 'Module 1: priority=0 duration=0.1
+    exit=0', the duration is in seconds.
+    """
+    hooks = []
+    for line in lines.splitlines():
+        module_name, _separator, raw_parameters = line.partition(":")
+        parameters = dict(item.split("=") for item in raw_parameters.split())
+        hooks.append(
+            StubHook(
+                module_name=module_name.strip(),
+                priority=int(parameters["priority"]),
+                duration=float(parameters["duration"]),
+                status_code=int(parameters["exit"]),
+            )
+        )
+    return hooks
+
+
+def get_stub_hook(hooks: List[StubHook], module_name: str) -> StubHook:
+    for hook in hooks:
+        if hook.module_name == module_name:
+            return hook
+    raise ScenarioError(f"No stub hook found for module '{module_name}'!")
+
+
+def get_hook_dependency_module_names(
+    modules: Modules, hook_name: str, module_name: str
+) -> List[str]:
+    """Returns the module names of the hooks the given hook depends on"""
+    graph = modules.aggregated_hook_graphs[hook_name]
+    for index, hook in enumerate(graph.hooks):
+        if hook.execution_context.module_name == module_name:
+            return [
+                graph.hooks[dependency].execution_context.module_name
+                for dependency in graph.dependencies[index]
+            ]
+    raise ScenarioError(f"No '{hook_name}' hook found for module '{module_name}'!")
@@ -43,32 +43,39 @@ shift
 # NOTE: The common script parses 8 arguments. The next argument to be parsed is
 # the 9th that is intended to be parsed by the hook adapter script.
 
+# Argument 9 - Path to the NUL delimited argument items file that contains the
+# links as alternating target and symlink path items. The links are not passed
+# as arguments, as the command line would exceed the system limit for modules
+# with large link trees.
+dm__config__argument_items_file="$1"
+shift
+
 #==============================================================================
 # ENTRY POINT
 #==============================================================================
 
 dm__logger__header
 
-___first_item_processed='0'
-
-while [ $# -gt 0 ]
-do
+# The items are read from a pipe, so the original standard input is preserved on
+# file descriptor 3 for the user prompts.
+exec 3<&0
 
-  path_to_target="$1"
-  path_to_symlink="$2"
-  shift
-  shift
+tr '\000' '\n' < "$dm__config__argument_items_file" | {
+  ___first_item_processed='0'
 
-  if [ "$___first_item_processed" = '0' ]
-  then
-    ___first_item_processed='1'
-  else
-    dm__logger__double_separator
-  fi
+  while IFS= read -r path_to_target && IFS= read -r path_to_symlink
+  do
 
-  dm__create_symlink "$path_to_target" "$path_to_symlink"
+    if [ "$___first_item_processed" = '0' ]
+    then
+      ___first_item_processed='1'
+    else
+      dm__logger__double_separator
+    fi
 
-done
+    dm__create_symlink "$path_to_target" "$path_to_symlink" <&3
 
+  done
+}
 
 dm__logger__footer
\ No newline at end of file